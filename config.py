@@ -14,11 +14,31 @@ class Config:
     
     # Database
     DATABASE_URL = os.getenv('DATABASE_URL', 'sqlite:///social_media_dashboard.db')
+    STORAGE_ENABLED = os.getenv('STORAGE_ENABLED', 'True').lower() == 'true'
     
     # App Settings
     DEBUG = os.getenv('DEBUG', 'True').lower() == 'true'
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
-    DATA_FETCH_INTERVAL = int(os.getenv('DATA_FETCH_INTERVAL', 3600))
+    # Seconds between scheduled runs of platforms without a SCHEDULE_INTERVALS entry (Reddit)
+    DATA_FETCH_INTERVAL = int(os.getenv('DATA_FETCH_INTERVAL', 2 * 3600))
+    AGGREGATOR_MAX_WORKERS = int(os.getenv('AGGREGATOR_MAX_WORKERS', 4))
+    HN_MAX_WORKERS = int(os.getenv('HN_MAX_WORKERS', 16))
+    # Incremental Hacker News sync: keep fetched items and refetch only new, updated or stale ones
+    HN_INCREMENTAL_SYNC = os.getenv('HN_INCREMENTAL_SYNC', 'True').lower() == 'true'
+    # Refetch stored items at least this often, seconds; keep it several times the hackernews schedule
+    # interval (SCHEDULE_INTERVALS), or every scheduled run finds every item stale
+    HN_ITEM_MAX_AGE = int(os.getenv('HN_ITEM_MAX_AGE', 3600))
+    GLOBAL_KEYWORD_SKETCH_SIZE = int(os.getenv('GLOBAL_KEYWORD_SKETCH_SIZE', 0))  # 0 = exact counts
+    
+    # HTTP Transport
+    HTTP_CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT', 5))
+    HTTP_READ_TIMEOUT = float(os.getenv('HTTP_READ_TIMEOUT', 30))
+    HTTP_MAX_RETRIES = int(os.getenv('HTTP_MAX_RETRIES', 3))
+    HTTP_BACKOFF_FACTOR = float(os.getenv('HTTP_BACKOFF_FACTOR', 0.5))
+    HTTP_BACKOFF_JITTER = float(os.getenv('HTTP_BACKOFF_JITTER', 0.5))
+    HTTP_MAX_RETRY_AFTER = float(os.getenv('HTTP_MAX_RETRY_AFTER', 60))  # Longest Retry-After honoured, seconds
+    HTTP_POOL_CONNECTIONS = int(os.getenv('HTTP_POOL_CONNECTIONS', 10))
+    HTTP_POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', 32))
     
     # API URLs
     YOUTUBE_API_BASE = 'https://www.googleapis.com/youtube/v3'
@@ -31,13 +51,108 @@ class Config:
     DATA_DIR = 'data'
     RAW_DATA_DIR = os.path.join(DATA_DIR, 'raw')
     PROCESSED_DATA_DIR = os.path.join(DATA_DIR, 'processed')
+    CACHE_DIR = os.path.join(DATA_DIR, 'cache')
+    COLUMNAR_SNAPSHOTS = os.getenv('COLUMNAR_SNAPSHOTS', 'True').lower() == 'true'
+    # trends_<ts>.json/.npz files kept per kind, newest first (0 = keep all); 288 is a day of 5-minute runs
+    RESULTS_RETENTION = int(os.getenv('RESULTS_RETENTION', 288))
+    
+    # HTTP Response Cache
+    HTTP_CACHE_ENABLED = os.getenv('HTTP_CACHE_ENABLED', 'True').lower() == 'true'
+    HTTP_CACHE_PATH = os.path.join(CACHE_DIR, 'http_cache.sqlite')
+    HTTP_CACHE_MAX_BYTES = int(os.getenv('HTTP_CACHE_MAX_BYTES', 50 * 1024 * 1024))
+    
+    # Cache TTL in seconds per `host/path` prefix (longest prefix wins, unlisted endpoints are not cached)
+    HTTP_CACHE_TTLS = {
+        'www.reddit.com/': 300,
+        'hacker-news.firebaseio.com/v0/topstories.json': 120,
+        'hacker-news.firebaseio.com/v0/newstories.json': 120,
+        'hacker-news.firebaseio.com/v0/item/': 600,
+        'www.googleapis.com/youtube/v3/videos': 900,
+        'www.googleapis.com/youtube/v3/search': 3600,
+        'serpapi.com/search.json': 6 * 3600,
+    }
+    
+    # Local Hacker News items for HN_INCREMENTAL_SYNC
+    HN_ITEM_STORE_PATH = os.path.join(CACHE_DIR, 'hn_items.sqlite')
+    
+    # Rate Limits and Quotas
+    RATE_LIMIT_ENABLED = os.getenv('RATE_LIMIT_ENABLED', 'True').lower() == 'true'
+    QUOTA_LEDGER_PATH = os.path.join(CACHE_DIR, 'quota_ledger.sqlite')
+    
+    # Platform of each API host, for rate limits and quota accounting
+    API_HOSTS = {
+        'www.googleapis.com': 'youtube',
+        'www.reddit.com': 'reddit',
+        'hacker-news.firebaseio.com': 'hackernews',
+        'serpapi.com': 'serpapi',
+        'api.apify.com': 'apify',
+    }
+    
+    # Token bucket per platform: (requests per second, burst size)
+    RATE_LIMITS = {
+        'youtube': (float(os.getenv('YOUTUBE_RATE_LIMIT', 5)), 10),
+        'reddit': (float(os.getenv('REDDIT_RATE_LIMIT', 10 / 60)), 5),  # Unauthenticated: ~10 requests/minute
+        'hackernews': (float(os.getenv('HACKERNEWS_RATE_LIMIT', 50)), 32),
+        'serpapi': (float(os.getenv('SERPAPI_RATE_LIMIT', 1)), 5),
+        'apify': (float(os.getenv('APIFY_RATE_LIMIT', 20)), 30),
+    }
+    
+    # Quota units per call, by `host/path` prefix (longest prefix wins, unlisted endpoints are free)
+    QUOTA_COSTS = {
+        'www.googleapis.com/youtube/v3/': 1,
+        'www.googleapis.com/youtube/v3/search': 100,
+        'serpapi.com/search.json': 1,
+        'api.apify.com/v2/acts/': 1,  # Starting an actor run
+    }
+    
+    # Units per UTC day before calls are refused (0 = record usage but never refuse)
+    DAILY_QUOTAS = {
+        'youtube': int(os.getenv('YOUTUBE_DAILY_QUOTA', 10000)),
+        'serpapi': int(os.getenv('SERPAPI_DAILY_QUOTA', 0)),
+        'apify': int(os.getenv('APIFY_DAILY_RUNS', 0)),
+    }
+    
+    # YouTube
+    YOUTUBE_PAGE_SIZE = 50  # Most search results per page and video IDs per videos.list call
+    YOUTUBE_NICHE_RESULTS = int(os.getenv('YOUTUBE_NICHE_RESULTS', 50))  # Videos per niche (100 quota units / 50)
+    
+    # Reddit
+    REDDIT_SUBREDDITS = os.getenv('REDDIT_SUBREDDITS', 'all,popular,technology,programming,startups').split(',')
+    REDDIT_PAGE_SIZE = 100  # Reddit serves at most 100 posts per listing page
+    REDDIT_MAX_PAGES = int(os.getenv('REDDIT_MAX_PAGES', 10))  # `after` cursors followed per subreddit at most
+    REDDIT_MAX_WORKERS = int(os.getenv('REDDIT_MAX_WORKERS', 4))  # Subreddits crawled concurrently
+    REDDIT_CRAWL_TIMEOUT = int(os.getenv('REDDIT_CRAWL_TIMEOUT', 300))  # No new pages requested after this, seconds
+    
+    # Apify
+    APIFY_MAX_CONCURRENT_RUNS = int(os.getenv('APIFY_MAX_CONCURRENT_RUNS', 4))
+    APIFY_RUN_TIMEOUT = int(os.getenv('APIFY_RUN_TIMEOUT', 300))  # seconds
+    APIFY_PAGE_SIZE = 1000  # Dataset items per page
+    APIFY_HASHTAG_BATCH_SIZE = int(os.getenv('APIFY_HASHTAG_BATCH_SIZE', 10))  # Hashtags packed into one actor run
+    
+    # Google Trends
+    GOOGLE_TRENDS_BATCH_SIZE = 5  # SerpApi compares at most 5 terms per request
+    GOOGLE_TRENDS_ANCHOR = os.getenv('GOOGLE_TRENDS_ANCHOR') or None  # Shared comparison term, default: first query
+    
+    # Scheduled Collection (python -m src.scheduler): seconds between runs for platforms
+    # whose cadence differs from DATA_FETCH_INTERVAL
+    SCHEDULE_INTERVALS = {
+        'hackernews': 5 * 60,  # Cheap with HN_INCREMENTAL_SYNC, and updates.json only spans a few minutes
+        'youtube': 3 * 3600,
+        'google_trends': 24 * 3600,
+        'youtube_niches': int(os.getenv('YOUTUBE_NICHE_INTERVAL', 6 * 3600)),  # ~600 quota units per run
+    }
+    SCHEDULE_JITTER = int(os.getenv('SCHEDULE_JITTER', 300))  # Max random delay added to each run, seconds
+    SCHEDULE_MAX_JITTER_FRACTION = 0.1  # Jitter never exceeds this fraction of a platform's interval
     
     # Tracked Niches
+    # Keywords and phrases per niche, used to tag collected content (src/niches.py)
     NICHES = {
-        'tech': ['ai', 'saas', 'startup', 'programming', 'tech'],
-        'fitness': ['workout', 'gym', 'health', 'fitness', 'wellness'],
-        'finance': ['crypto', 'stocks', 'trading', 'investing', 'defi'],
-        'marketing': ['seo', 'ads', 'growth', 'marketing', 'content']
+        'tech': ['ai', 'machine learning', 'tech', 'saas', 'startup', 'coding', 'programming'],
+        'fitness': ['fitness', 'workout', 'gym', 'health', 'wellness', 'exercise', 'nutrition'],
+        'finance': ['crypto', 'bitcoin', 'stocks', 'trading', 'investing', 'defi', 'finance'],
+        'marketing': ['marketing', 'seo', 'ads', 'content', 'growth', 'business', 'strategy', 'branding'],
+        'lifestyle': ['travel', 'lifestyle', 'fashion', 'food', 'photography', 'adventure'],
+        'gaming': ['gaming', 'esports', 'twitch', 'gamer', 'game', 'streaming', 'console']
     }
     
     # Platforms
@@ -1,11 +1,12 @@
 import streamlit as st
-import json
 import os
 from datetime import datetime
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from src.aggregator import TrendAggregator
+from src.aggregator import file_version, load_latest_results
+from src.refresh import RefreshManager
+from src import snapshots
 from config import Config
 
 # Page configuration
@@ -64,11 +65,112 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Initialize session state
-if 'data' not in st.session_state:
-    st.session_state.data = None
-if 'last_update' not in st.session_state:
-    st.session_state.last_update = None
+LATEST_RESULTS_PATH = os.path.join(Config.PROCESSED_DATA_DIR, 'latest.json')
+LATEST_SNAPSHOT_PATH = os.path.join(Config.PROCESSED_DATA_DIR, 'latest.npz')
+
+# Everything below is cached per file version and shared by all sessions through
+# st.cache_resource (no per-session copies), so callers must treat it as read-only.
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def load_results(version):
+    """Parse latest.json once per file version"""
+    return load_latest_results() if version is not None else None
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def load_item_table(platform, table, columns, sort_by, version):
+    """Load only the requested columns of one platform table from latest.npz, sorted descending"""
+    if version is None:
+        return None
+    frames = snapshots.load_snapshot(LATEST_SNAPSHOT_PATH, tables=[table], columns=columns, platforms=[platform])
+    frame = frames.get(f'{platform}.{table}')
+    return frame.sort_values(sort_by, ascending=False) if frame is not None else None
+
+@st.cache_resource(show_spinner=False)
+def get_refresh_manager():
+    """Process-wide RefreshManager, so every session joins the same in-flight refresh"""
+    return RefreshManager()
+
+def render_refresh(placeholder, job):
+    """Show a refresh job's per-stage progress in a placeholder"""
+    state = job.snapshot()
+    with placeholder.container():
+        if state['status'] == 'running':
+            st.progress(state['progress'], text=f"Refresh {state['id']}: collecting trends...")
+        elif state['status'] == 'failed':
+            st.error(f"Refresh {state['id']} failed: {state['error']}")
+        else:
+            st.success(f"Refresh {state['id']} finished at {state['finished_at'].strftime('%H:%M:%S')}")
+        
+        icons = {'pending': '⏳', 'done': '✅', 'failed': '❌'}
+        for stage in state['stages'].values():
+            seconds = f" ({stage['seconds']:.1f}s)" if stage['seconds'] is not None else ''
+            st.caption(f"{icons[stage['status']]} {stage['label']}{seconds}")
+
+def follow_refresh(placeholder, job):
+    """Stream a running job's progress as stages finish, then rerun to show the new results"""
+    if job is None or not job.running:
+        return
+    
+    while not job.wait(timeout=0.5):
+        render_refresh(placeholder, job)
+    st.rerun()
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def global_keywords_figure(version):
+    keywords_df = pd.DataFrame(load_results(version)['global_keywords'][:20])
+    fig = px.bar(
+        keywords_df, 
+        x='count', 
+        y='keyword', 
+        orientation='h',
+        title='Top 20 Keywords Across All Platforms',
+        labels={'count': 'Mentions', 'keyword': 'Keyword'},
+        color='count',
+        color_continuous_scale='Viridis'
+    )
+    fig.update_layout(height=600, showlegend=False)
+    return fig
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def youtube_keywords_figure(version):
+    kw_df = pd.DataFrame(load_results(version)['youtube']['top_keywords'][:10])
+    return px.bar(kw_df, x='keyword', y='count', title='YouTube Title Keywords')
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def reddit_keywords_figure(version):
+    kw_df = pd.DataFrame(load_results(version)['reddit']['top_keywords'][:15])
+    return px.treemap(
+        kw_df, 
+        path=['keyword'], 
+        values='count',
+        title='Reddit Keywords Treemap'
+    )
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def google_trends_figure(version):
+    trends_df = pd.DataFrame(load_results(version)['google_trends']['trends'])
+    
+    fig = go.Figure()
+    
+    colors = {'rising': 'green', 'falling': 'red', 'stable': 'gray'}
+    
+    for direction in ['rising', 'falling', 'stable']:
+        filtered = trends_df[trends_df['trend_direction'] == direction]
+        if not filtered.empty:
+            fig.add_trace(go.Bar(
+                x=filtered['query'],
+                y=filtered['interest'],
+                name=direction.capitalize(),
+                marker_color=colors[direction]
+            ))
+    
+    fig.update_layout(
+        title='Search Interest by Query',
+        xaxis_title='Query',
+        yaxis_title='Interest Level',
+        height=400
+    )
+    return fig
 
 # Header
 st.markdown('<h1 class="main-header">🚀 Social Media Trends Dashboard</h1>', unsafe_allow_html=True)
@@ -78,27 +180,22 @@ st.markdown('---')
 with st.sidebar:
     st.header('⚙️ Settings')
     
-    # Refresh button
+    # Refresh button: runs in the background, and clicks while a refresh is
+    # running (from any session) join it instead of starting another
+    refresh_manager = get_refresh_manager()
     if st.button('🔄 Fetch Latest Trends', type='primary', use_container_width=True):
-        with st.spinner('Collecting trends from all platforms...'):
-            try:
-                aggregator = TrendAggregator()
-                st.session_state.data = aggregator.aggregate_all_trends()
-                st.session_state.last_update = datetime.now()
-                st.success('Trends updated successfully!')
-            except Exception as e:
-                st.error(f'Error fetching trends: {e}')
-    
-    # Load latest data button
-    if st.button('💾 Load Saved Data', use_container_width=True):
-        latest_path = os.path.join(Config.PROCESSED_DATA_DIR, 'latest.json')
-        if os.path.exists(latest_path):
-            with open(latest_path, 'r', encoding='utf-8') as f:
-                st.session_state.data = json.load(f)
-                st.session_state.last_update = datetime.fromisoformat(st.session_state.data.get('timestamp', datetime.now().isoformat()))
-            st.success('Data loaded successfully!')
-        else:
-            st.warning('No saved data found. Click "Fetch Latest Trends" to collect new data.')
+        st.session_state.refresh_job_id = refresh_manager.start().id
+    
+    # This session's last refresh, or one another session has in flight
+    refresh_job = refresh_manager.get(st.session_state.get('refresh_job_id'))
+    if refresh_job is None or not refresh_job.running:
+        current = refresh_manager.current()
+        if current is not None and current.running:
+            refresh_job = current
+    
+    refresh_box = st.empty()
+    if refresh_job is not None:
+        render_refresh(refresh_box, refresh_job)
     
     st.markdown('---')
     
@@ -110,18 +207,32 @@ with st.sidebar:
     show_google = st.checkbox('Google Trends', value=True)
     
     st.markdown('---')
-    
+
+# Latest results saved by the button above or the collector daemon (python -m src.scheduler)
+results_version = file_version(LATEST_RESULTS_PATH)
+snapshot_version = file_version(LATEST_SNAPSHOT_PATH)
+data = load_results(results_version)
+
+with st.sidebar:
     # Display last update time
-    if st.session_state.last_update:
-        st.info(f'🕓 Last updated:\n{st.session_state.last_update.strftime("%Y-%m-%d %H:%M:%S")}')
+    if data and data.get('timestamp'):
+        last_update = datetime.fromisoformat(data['timestamp'])
+        st.info(f'🕓 Last updated:\n{last_update.strftime("%Y-%m-%d %H:%M:%S")}')
+    
+    # Per-platform refresh times from scheduled runs
+    updated = (data or {}).get('updated', {})
+    if updated:
+        st.caption('\n\n'.join(
+            f"{platform}: {datetime.fromisoformat(ts).strftime('%Y-%m-%d %H:%M')}"
+            for platform, ts in updated.items()
+        ))
 
 # Main content
-if st.session_state.data is None:
-    st.info('👋 Welcome! Click "Fetch Latest Trends" or "Load Saved Data" to get started.')
+if data is None:
+    st.info('👋 Welcome! Click "Fetch Latest Trends" or start the collector daemon (`python -m src.scheduler`) to get started.')
+    follow_refresh(refresh_box, refresh_job)
     st.stop()
 
-data = st.session_state.data
-
 # Global metrics row
 col1, col2, col3, col4 = st.columns(4)
 
@@ -148,23 +259,10 @@ st.markdown('<h2 class="platform-header">🌍 Global Trending Keywords</h2>', un
 
 if data.get('global_keywords'):
     # Create visualization
-    keywords_df = pd.DataFrame(data['global_keywords'][:20])
-    
     col1, col2 = st.columns([2, 1])
     
     with col1:
-        fig = px.bar(
-            keywords_df, 
-            x='count', 
-            y='keyword', 
-            orientation='h',
-            title='Top 20 Keywords Across All Platforms',
-            labels={'count': 'Mentions', 'keyword': 'Keyword'},
-            color='count',
-            color_continuous_scale='Viridis'
-        )
-        fig.update_layout(height=600, showlegend=False)
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(global_keywords_figure(results_version), use_container_width=True)
     
     with col2:
         st.subheader('Top Keywords')
@@ -207,12 +305,52 @@ if show_youtube and 'youtube' in data and 'videos' in data['youtube']:
                 st.caption(f"👍 {video['likes']:,} | 💬 {video['comments']:,}")
         st.markdown('---')
     
+    all_videos = load_item_table('youtube', 'videos', ('title', 'channel', 'views', 'likes', 'comments'), 'views',
+                                 snapshot_version)
+    if all_videos is not None and not all_videos.empty:
+        with st.expander(f'📋 All {len(all_videos)} collected videos'):
+            st.dataframe(all_videos, use_container_width=True)
+    
     # Keywords
     if yt_data.get('top_keywords'):
         st.subheader('🔑 Most Common Keywords in Titles')
-        kw_df = pd.DataFrame(yt_data['top_keywords'][:10])
-        fig = px.bar(kw_df, x='keyword', y='count', title='YouTube Title Keywords')
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(youtube_keywords_figure(results_version), use_container_width=True)
+
+st.markdown('---')
+
+# Niche Section: YouTube niche searches (own schedule) and niche tags on the collected items
+niche_data = data.get('youtube_niches', {}).get('niches', {})
+niche_counts = {platform: counts for platform, counts in data.get('niche_counts', {}).items() if counts}
+if niche_data or niche_counts:
+    st.markdown('<h2 class="platform-header">🎯 Niches</h2>', unsafe_allow_html=True)
+    
+    if niche_counts:
+        st.subheader('🏷️ Collected Items per Niche')
+        counts_df = pd.DataFrame(niche_counts).fillna(0).astype(int)
+        st.dataframe(counts_df, use_container_width=True)
+    
+    if show_youtube and niche_data:
+        st.subheader('📺 Most Viewed YouTube Videos per Niche')
+        if data.get('updated', {}).get('youtube_niches'):
+            searched = datetime.fromisoformat(data['updated']['youtube_niches'])
+            st.caption(f"Searched {searched.strftime('%Y-%m-%d %H:%M')}, videos from the last week")
+        
+        for tab, (niche, niche_yt) in zip(st.tabs(list(niche_data)), niche_data.items()):
+            with tab:
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.metric('Videos Found', niche_yt.get('total_videos', 0))
+                with col2:
+                    st.metric('Total Views', f"{niche_yt.get('total_views', 0):,}")
+                
+                col1, col2 = st.columns([2, 1])
+                with col1:
+                    for i, video in enumerate(niche_yt.get('videos', [])[:5], 1):
+                        st.markdown(f"**{i}. {video['title']}**")
+                        st.caption(f"🎥 {video['channel']} • 👁️ {video['views']:,} views")
+                with col2:
+                    for kw in niche_yt.get('top_keywords', [])[:10]:
+                        st.markdown(f"**{kw['keyword']}** - {kw['count']}")
 
 st.markdown('---')
 
@@ -247,17 +385,16 @@ if show_reddit and 'reddit' in data and 'posts' in data['reddit']:
                     st.metric('⬆️ Score', post['score'])
                     st.caption(f"💬 {post['comments']} comments")
             st.markdown('---')
+        
+        all_posts = load_item_table('reddit', 'posts', ('title', 'subreddit', 'author', 'score', 'comments'), 'score',
+                                    snapshot_version)
+        if all_posts is not None and not all_posts.empty:
+            with st.expander(f'📋 All {len(all_posts)} collected posts'):
+                st.dataframe(all_posts, use_container_width=True)
     
     with tab2:
         if reddit_data.get('top_keywords'):
-            kw_df = pd.DataFrame(reddit_data['top_keywords'][:15])
-            fig = px.treemap(
-                kw_df, 
-                path=['keyword'], 
-                values='count',
-                title='Reddit Keywords Treemap'
-            )
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(reddit_keywords_figure(results_version), use_container_width=True)
     
     with tab3:
         if reddit_data.get('top_hashtags'):
@@ -298,6 +435,12 @@ if show_hackernews and 'hackernews' in data and 'stories' in data['hackernews']:
                 if story.get('url'):
                     st.caption(f"🔗 [{story['url']}]({story['url']})")
             st.markdown('---')
+        
+        all_stories = load_item_table('hackernews', 'stories', ('title', 'author', 'score', 'comments'), 'score',
+                                      snapshot_version)
+        if all_stories is not None and not all_stories.empty:
+            with st.expander(f'📋 All {len(all_stories)} collected stories'):
+                st.dataframe(all_stories, use_container_width=True)
     
     with col2:
         if hn_data.get('top_keywords'):
@@ -314,31 +457,8 @@ if show_google and 'google_trends' in data and 'trends' in data['google_trends']
     gt_data = data['google_trends']
     
     if gt_data.get('trends'):
-        trends_df = pd.DataFrame(gt_data['trends'])
-        
         # Create visualization
-        fig = go.Figure()
-        
-        colors = {'rising': 'green', 'falling': 'red', 'stable': 'gray'}
-        
-        for direction in ['rising', 'falling', 'stable']:
-            filtered = trends_df[trends_df['trend_direction'] == direction]
-            if not filtered.empty:
-                fig.add_trace(go.Bar(
-                    x=filtered['query'],
-                    y=filtered['interest'],
-                    name=direction.capitalize(),
-                    marker_color=colors[direction]
-                ))
-        
-        fig.update_layout(
-            title='Search Interest by Query',
-            xaxis_title='Query',
-            yaxis_title='Interest Level',
-            height=400
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(google_trends_figure(results_version), use_container_width=True)
         
         # Details table
         st.subheader('Trend Details')
@@ -351,6 +471,8 @@ if show_google and 'google_trends' in data and 'trends' in data['google_trends']
                 st.markdown(f"**{trend['query']}**")
             with col2:
                 st.metric('Interest', trend['interest'])
+                if 'change_percent' in trend:
+                    st.caption(f"{trend['change_percent']:+.1f}% • z-score {trend['zscore']:+.2f} • volatility {trend['volatility']:.1f}")
             with col3:
                 st.markdown(f"{emoji} **{trend['trend_direction'].upper()}**")
             st.markdown('---')
@@ -363,3 +485,6 @@ st.markdown("""
     <p>Data sources: YouTube, Reddit, Hacker News, Google Trends</p>
 </div>
 """, unsafe_allow_html=True)
+
+# Keep the page interactive while a refresh runs, updating its progress until it finishes
+follow_refresh(refresh_box, refresh_job)
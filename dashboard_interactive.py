@@ -8,6 +8,8 @@ import plotly.graph_objects as go
 from collections import Counter
 import re
 from config import Config
+from src.aggregator import file_version, load_latest_results
+from src.timeseries import TimeSeriesStore
 
 # Page configuration
 st.set_page_config(
@@ -155,6 +157,48 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+@st.cache_resource(show_spinner=False)
+def get_timeseries_store():
+    """One TimeSeriesStore (and connection pool) shared by every session"""
+    return TimeSeriesStore()
+
+@st.cache_data(ttl=300, show_spinner=False)
+def interest_figure(keywords, time_range, days):
+    """
+    Search interest chart for a keyword set, or None without stored history
+    
+    Only the aggregator's Google Trends queries have history, so the chart covers
+    the keywords among them. Google Trends history only changes a few times a day,
+    so widget reruns reuse the chart instead of querying the rollups and
+    re-plotting every time.
+    """
+    store = get_timeseries_store()
+    stored = set(store.stored_queries())
+    interest = store.range_summary([keyword for keyword in keywords if keyword in stored], days)
+    if not interest:
+        return None
+    
+    interest_df = pd.DataFrame(interest)
+    return px.bar(
+        interest_df,
+        x='query',
+        y='interest',
+        title=f'Average Google Trends Interest ({time_range})',
+        labels={'query': 'Keyword', 'interest': 'Interest'},
+        color='interest',
+        color_continuous_scale='Viridis'
+    )
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def load_cross_platform_trends(version):
+    """Cross-platform trends from latest.json, parsed once per file version and shared read-only"""
+    return (load_latest_results() or {}).get('cross_platform_trends', []) if version is not None else []
+
+def latest_results_version():
+    return file_version(os.path.join(Config.PROCESSED_DATA_DIR, 'latest.json'))
+
+PLATFORM_EMOJIS = {'youtube': '📺', 'reddit': '👽', 'hackernews': '🔶', 'twitter': '🐦'}
+
 # Initialize session state
 if 'selected_niche' not in st.session_state:
     st.session_state.selected_niche = 'tech'
@@ -163,41 +207,41 @@ if 'data' not in st.session_state:
 if 'cross_platform_trends' not in st.session_state:
     st.session_state.cross_platform_trends = []
 
-# Define niches
+# Define niches (keywords come from Config.NICHES, which also drives content tagging)
 NICHES = {
     'tech': {
         'name': '💻 Technology & AI',
-        'keywords': ['ai', 'machine learning', 'tech', 'saas', 'startup', 'coding', 'programming'],
+        'keywords': Config.NICHES['tech'],
         'emoji': '💻',
         'color': '#667eea'
     },
     'fitness': {
         'name': '💪 Fitness & Health',
-        'keywords': ['fitness', 'workout', 'gym', 'health', 'wellness', 'exercise', 'nutrition'],
+        'keywords': Config.NICHES['fitness'],
         'emoji': '💪',
         'color': '#ee5a6f'
     },
     'finance': {
         'name': '💰 Finance & Crypto',
-        'keywords': ['crypto', 'bitcoin', 'stocks', 'trading', 'investing', 'defi', 'finance'],
+        'keywords': Config.NICHES['finance'],
         'emoji': '💰',
         'color': '#f39c12'
     },
     'marketing': {
         'name': '📊 Marketing & Business',
-        'keywords': ['marketing', 'seo', 'content', 'growth', 'business', 'strategy', 'branding'],
+        'keywords': Config.NICHES['marketing'],
         'emoji': '📊',
         'color': '#26de81'
     },
     'lifestyle': {
         'name': '✨ Lifestyle & Travel',
-        'keywords': ['travel', 'lifestyle', 'fashion', 'food', 'photography', 'adventure'],
+        'keywords': Config.NICHES['lifestyle'],
         'emoji': '✨',
         'color': '#fd79a8'
     },
     'gaming': {
         'name': '🎮 Gaming & Esports',
-        'keywords': ['gaming', 'esports', 'twitch', 'gamer', 'game', 'streaming', 'console'],
+        'keywords': Config.NICHES['gaming'],
         'emoji': '🎮',
         'color': '#a29bfe'
     }
@@ -290,19 +334,20 @@ st.markdown('---')
 st.markdown('### 🌐 Cross-Platform Trending Topics')
 st.markdown('Topics trending across multiple platforms simultaneously')
 
-cross_trends = [
-    {'topic': 'GPT-4 Updates', 'platforms': ['📺', '👽', '🔶', '🐦'], 'score': 9.5},
-    {'topic': 'New iPhone Release', 'platforms': ['📺', '👽', '🐦'], 'score': 8.7},
-    {'topic': 'Startup Funding', 'platforms': ['👽', '🔶', '🐦'], 'score': 7.9},
-]
+# Detected by the aggregator on every run (src/cross_platform.py)
+cross_trends = load_cross_platform_trends(latest_results_version())[:10]
+
+if not cross_trends:
+    st.info('No cross-platform trends yet. Run the aggregator to detect them.')
 
 for trend in cross_trends:
     col1, col2, col3 = st.columns([3, 1, 1])
     with col1:
         st.markdown(f"**{trend['topic']}**")
-        st.caption(' '.join(trend['platforms']) + ' platforms')
+        platform_icons = ' '.join(PLATFORM_EMOJIS.get(p, p) for p in trend['platforms'])
+        st.caption(f"{platform_icons} platforms • {trend['mentions']} mentions • velocity ×{trend['velocity']:.2f}")
     with col2:
-        st.metric('Trend Score', f"{trend['score']}/10")
+        st.metric('Trend Score', f"{trend['score']:.1f}")
     with col3:
         if st.button('View Details', key=f"cross_{trend['topic']}"):
             st.session_state.selected_cross_trend = trend['topic']
@@ -510,6 +555,24 @@ with tab4:
 
 st.markdown('---')
 
+# Search interest for the niche keywords, answered from the stored Google Trends rollups
+st.markdown(f'## 📈 Search Interest ({time_range})')
+
+TIME_RANGE_DAYS = {'Today': 1, 'This Week': 7, 'This Month': 30, 'All Time': 3650}
+fig = interest_figure(tuple(current_niche['keywords']), time_range, TIME_RANGE_DAYS[time_range])
+
+if fig is not None:
+    st.plotly_chart(fig, use_container_width=True)
+else:
+    tracked = get_timeseries_store().stored_queries()
+    if tracked:
+        st.info(f"No Google Trends history is stored for this niche's keywords. "
+                f"History is collected for: {', '.join(tracked)}")
+    else:
+        st.info('No Google Trends history stored yet. Run the aggregator to start collecting it.')
+
+st.markdown('---')
+
 # Keyword Analysis Section
 st.markdown('## 🔑 Keyword Analysis Across All Platforms')
 
@@ -1,44 +1,137 @@
 import json
 import os
-from datetime import datetime
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from collections import Counter
-import re
-from typing import Dict, List, Any
+from typing import Callable, Dict, Iterable, List, Any, Optional, Tuple
 
 from src.collectors.google_trends_collector import GoogleTrendsCollector
 from src.collectors.reddit_collector import RedditCollector
 from src.collectors.hackernews_collector import HackerNewsCollector
 from src.collectors.youtube_collector import YouTubeCollector
+from src.http_client import get_session
+from src import tokenizer
+from src.sketches import SpaceSaving
+from src.storage import TrendStore
+from src.timeseries import TimeSeriesStore, parse_timeline
+from src.trend_stats import trend_stats_for
+from src.cross_platform import detect_cross_platform_trends
+from src.niches import default_classifier
+from src.records import DECODERS, EXPORT_FIELDS, ContentRecord, dedupe
+from src import snapshots
+from src.file_lock import file_lock
 from config import Config
 
+# Serializes read-merge-write of latest.json between runs in one process (e.g. scheduler jobs);
+# latest.lock does the same across processes (the scheduler daemon and dashboard refreshes)
+_latest_lock = threading.Lock()
+LATEST_LOCK_FILE = 'latest.lock'
+# Per-platform keyword counts and item engagement for partial-run merges when
+# COLUMNAR_SNAPSHOTS is off (latest.npz carries them otherwise)
+LATEST_STATE_FILE = 'latest_state.json'
+# Item fields cross-platform detection reads back for platforms a run did not refresh
+CARRIED_ITEM_FIELDS = ['title', 'likes', 'comments', 'score']
+
+
+def load_latest_results() -> Optional[Dict[str, Any]]:
+    """Load the most recently saved results (latest.json), or None if nothing has been saved"""
+    latest_path = os.path.join(Config.PROCESSED_DATA_DIR, 'latest.json')
+    if not os.path.exists(latest_path):
+        return None
+    
+    with open(latest_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def file_version(path: str) -> Optional[Tuple[int, int]]:
+    """(mtime_ns, size) of a file, or None if missing; a cache key that changes whenever the file is rewritten"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
 
 class TrendAggregator:
     """Aggregate and analyze trending content from all platforms"""
     
+    # (result key, display name, stage method) for every platform stage
+    STAGES = [
+        ('youtube', 'YouTube', 'get_youtube_trends'),
+        ('reddit', 'Reddit', 'get_reddit_trends'),
+        ('hackernews', 'Hacker News', 'get_hackernews_trends'),
+        ('google_trends', 'Google Trends', 'get_google_trends'),
+        ('youtube_niches', 'YouTube Niches', 'get_youtube_niche_trends'),
+    ]
+    
+    # Stages that only run when asked for by name, i.e. on their own schedule, never in
+    # a full run (dashboard refreshes included); full runs carry their last results over
+    SCHEDULED_ONLY_STAGES = {'youtube_niches'}
+    
+    # Item fields scanned for niche keywords, per platform
+    NICHE_FIELDS = {
+        'youtube': ('title', 'tags'),
+        'reddit': ('title',),
+        'hackernews': ('title',),
+    }
+    
+    # Niche searches only look at videos published this many days back
+    NICHE_SEARCH_DAYS = 7
+    
+    # Default Google Trends queries
+    TREND_QUERIES = ['ai', 'cryptocurrency', 'climate change', 'technology', 'startup']
+    
     def __init__(self):
         self.google_collector = GoogleTrendsCollector()
         self.reddit_collector = RedditCollector()
         self.hn_collector = HackerNewsCollector()
         self.youtube_collector = YouTubeCollector()
         
+        # SQL storage for every collected item (Config.DATABASE_URL)
+        self.store = TrendStore() if Config.STORAGE_ENABLED else None
+        self.timeseries = TimeSeriesStore() if Config.STORAGE_ENABLED else None
+        
         # Create data directories
         os.makedirs(Config.PROCESSED_DATA_DIR, exist_ok=True)
     
     def extract_hashtags(self, text: str) -> List[str]:
         """Extract hashtags from text"""
-        if not text:
-            return []
-        return re.findall(r'#\w+', text.lower())
+        return tokenizer.extract_hashtags(text)
     
     def extract_keywords(self, text: str, min_length: int = 4) -> List[str]:
         """Extract keywords from text (simple word extraction)"""
-        if not text:
-            return []
-        # Remove special characters and split
-        words = re.findall(r'\b[a-zA-Z]{' + str(min_length) + r',}\b', text.lower())
-        # Filter out common stop words
-        stop_words = {'this', 'that', 'with', 'from', 'have', 'been', 'will', 'your', 'their', 'what', 'when', 'where', 'which', 'about', 'there', 'these', 'those'}
-        return [w for w in words if w not in stop_words]
+        return tokenizer.extract_keywords(text, min_length)
+    
+    def _decode(self, platform: str, payloads: Iterable[Dict[str, Any]]) -> List[ContentRecord]:
+        """
+        Decode raw API payloads into ContentRecords, ready for ranking and storage
+        
+        Repeats of an item (e.g. a post in both r/all and r/popular) are dropped,
+        and every record is tagged with its niches and tokenized once.
+        """
+        decode = DECODERS[platform]
+        classifier = default_classifier()
+        fields = self.NICHE_FIELDS[platform]
+        
+        records = dedupe(decode(payload) for payload in payloads)
+        for record in records:
+            record.niches = tuple(classifier.classify_fields(getattr(record, field) for field in fields))
+            record.keywords, record.hashtags = tokenizer.tokenize(record.title)
+        return records
+    
+    @staticmethod
+    def _count_tokens(records: List[ContentRecord]) -> Tuple[Counter, Counter]:
+        """Keyword and hashtag counts over tokenized records"""
+        keyword_counts = Counter()
+        hashtag_counts = Counter()
+        for record in records:
+            keyword_counts.update(record.keywords)
+            hashtag_counts.update(record.hashtags)
+        return keyword_counts, hashtag_counts
     
     def get_youtube_trends(self, max_results: int = 25) -> Dict[str, Any]:
         """Get trending content from YouTube"""
@@ -49,85 +142,77 @@ class TrendAggregator:
         if not data or 'items' not in data:
             return {'videos': [], 'top_titles': [], 'total_views': 0}
         
-        videos = []
-        all_keywords = []
-        total_views = 0
-        
-        for item in data['items']:
-            snippet = item.get('snippet', {})
-            stats = item.get('statistics', {})
-            
-            title = snippet.get('title', '')
-            views = int(stats.get('viewCount', 0))
-            likes = int(stats.get('likeCount', 0))
-            comments = int(stats.get('commentCount', 0))
-            
-            videos.append({
-                'title': title,
-                'channel': snippet.get('channelTitle', ''),
-                'views': views,
-                'likes': likes,
-                'comments': comments,
-                'published': snippet.get('publishedAt', ''),
-                'tags': snippet.get('tags', [])[:5]  # Top 5 tags
-            })
-            
-            # Extract keywords from title
-            all_keywords.extend(self.extract_keywords(title))
-            total_views += views
+        videos = self._decode('youtube', data['items'])
+        total_views = sum(video.views for video in videos)
         
         # Get most common keywords
-        keyword_counts = Counter(all_keywords)
+        keyword_counts, _ = self._count_tokens(videos)
         top_keywords = [{'keyword': k, 'count': v} for k, v in keyword_counts.most_common(10)]
         
         return {
-            'videos': sorted(videos, key=lambda x: x['views'], reverse=True)[:10],
+            'videos': [video.to_dict() for video in sorted(videos, key=lambda x: x.views, reverse=True)[:10]],
             'top_keywords': top_keywords,
+            'keyword_counts': keyword_counts,
+            'items': videos,
             'total_views': total_views,
             'total_videos': len(videos)
         }
     
+    def get_youtube_niche_trends(self) -> Dict[str, Any]:
+        """
+        Most viewed recent videos for every niche in Config.NICHES, with statistics
+        
+        Each niche is one paged search (100 quota units per 50 results) followed by
+        batched videos.list calls, so its cost does not grow with its keyword count.
+        The videos were found by searching for the niche keywords, so they are kept
+        apart from the trending chart: their counts stay per niche and never enter
+        the YouTube totals, the global keywords or the cross-platform index.
+        """
+        print("\n🎯 Searching YouTube niches...")
+        
+        published_after = datetime.now(timezone.utc) - timedelta(days=self.NICHE_SEARCH_DAYS)
+        niches = {}
+        
+        for niche, keywords in Config.NICHES.items():
+            data = self.youtube_collector.search_niche_videos(
+                keywords, Config.YOUTUBE_NICHE_RESULTS,
+                order='viewCount', publishedAfter=published_after.strftime('%Y-%m-%dT%H:%M:%SZ')
+            )
+            videos = self._decode('youtube', data['items'])
+            keyword_counts, _ = self._count_tokens(videos)
+            
+            niches[niche] = {
+                'videos': [video.to_dict() for video in sorted(videos, key=lambda x: x.views, reverse=True)[:10]],
+                'top_keywords': [{'keyword': k, 'count': v} for k, v in keyword_counts.most_common(10)],
+                'total_views': sum(video.views for video in videos),
+                'total_videos': len(videos)
+            }
+        
+        return {
+            'niches': niches,
+            'published_after': published_after.isoformat()
+        }
+    
     def get_reddit_trends(self, subreddits: List[str] = None, limit: int = 25) -> Dict[str, Any]:
         """Get trending content from Reddit"""
         print("\n👽 Fetching Reddit trends...")
         
         if subreddits is None:
-            subreddits = ['all', 'popular', 'technology', 'programming', 'startups']
+            subreddits = Config.REDDIT_SUBREDDITS
         
-        all_posts = []
-        all_keywords = []
-        hashtags = []
+        # Subreddits are crawled concurrently and decoded as their pages stream in;
+        # r/all and r/popular overlap heavily, and _decode keeps each post once
+        all_posts = self._decode('reddit', self.reddit_collector.crawl(subreddits, 'hot', limit=limit))
         
-        for subreddit in subreddits:
-            posts = self.reddit_collector.get_hot_posts(subreddit, limit=limit)
-            
-            for post in posts:
-                data = post.get('data', {})
-                title = data.get('title', '')
-                score = data.get('score', 0)
-                
-                all_posts.append({
-                    'title': title,
-                    'subreddit': data.get('subreddit', ''),
-                    'score': score,
-                    'comments': data.get('num_comments', 0),
-                    'url': data.get('url', ''),
-                    'author': data.get('author', ''),
-                    'created': data.get('created_utc', 0)
-                })
-                
-                # Extract keywords and hashtags
-                all_keywords.extend(self.extract_keywords(title))
-                hashtags.extend(self.extract_hashtags(title))
-        
-        # Get most common items
-        keyword_counts = Counter(all_keywords)
-        hashtag_counts = Counter(hashtags)
+        # Get most common keywords and hashtags
+        keyword_counts, hashtag_counts = self._count_tokens(all_posts)
         
         return {
-            'posts': sorted(all_posts, key=lambda x: x['score'], reverse=True)[:10],
+            'posts': [post.to_dict() for post in sorted(all_posts, key=lambda x: x.score, reverse=True)[:10]],
             'top_keywords': [{'keyword': k, 'count': v} for k, v in keyword_counts.most_common(10)],
+            'keyword_counts': keyword_counts,
             'top_hashtags': [{'hashtag': k, 'count': v} for k, v in hashtag_counts.most_common(10)],
+            'items': all_posts,
             'total_posts': len(all_posts),
             'subreddits_analyzed': subreddits
         }
@@ -138,28 +223,15 @@ class TrendAggregator:
         
         stories = self.hn_collector.get_top_stories_with_details(limit=limit)
         
-        all_keywords = []
-        
-        for story in stories:
-            title = story.get('title', '')
-            all_keywords.extend(self.extract_keywords(title))
-        
-        keyword_counts = Counter(all_keywords)
+        all_stories = self._decode('hackernews', stories)
+        keyword_counts, _ = self._count_tokens(all_stories)
         
         return {
-            'stories': [
-                {
-                    'title': s.get('title', ''),
-                    'score': s.get('score', 0),
-                    'comments': s.get('descendants', 0),
-                    'url': s.get('url', ''),
-                    'author': s.get('by', ''),
-                    'time': s.get('time', 0)
-                }
-                for s in stories[:10]
-            ],
+            'stories': [story.to_dict() for story in all_stories[:10]],
             'top_keywords': [{'keyword': k, 'count': v} for k, v in keyword_counts.most_common(10)],
-            'total_stories': len(stories)
+            'keyword_counts': keyword_counts,
+            'items': all_stories,
+            'total_stories': len(all_stories)
         }
     
     def get_google_trends(self, queries: List[str] = None) -> Dict[str, Any]:
@@ -168,136 +240,474 @@ class TrendAggregator:
         
         if queries is None:
             # Use some default trending topics
-            queries = ['ai', 'cryptocurrency', 'climate change', 'technology', 'startup']
+            queries = self.TREND_QUERIES
         
         trends_data = []
+        timelines = {}
+        
+        fetched = {}
+        for time_range, window_queries in self._trend_windows(queries).items():
+            fetched.update(self.google_collector.get_interest_over_time_batch(
+                window_queries, anchor=Config.GOOGLE_TRENDS_ANCHOR, time_range=time_range
+            ))
         
         for query in queries:
-            data = self.google_collector.get_interest_over_time(query)
+            timeline = fetched.get(query)
             
-            if data and 'interest_over_time' in data:
-                timeline = data.get('interest_over_time', {}).get('timeline_data', [])
+            if timeline:
+                if self.timeseries:
+                    self.timeseries.append(query, parse_timeline(timeline))
+                    # Weekly rollups span the full stored history, like the 12-month window did
+                    timeline = self.timeseries.timeline(query, 'week') or timeline
                 
-                if timeline:
-                    # Get latest interest value
-                    latest = timeline[-1]
-                    values = latest.get('values', [])
-                    
-                    if values:
-                        trends_data.append({
-                            'query': query,
-                            'interest': values[0].get('extracted_value', 0),
-                            'date': latest.get('date', ''),
-                            'trend_direction': self._calculate_trend_direction(timeline)
-                        })
+                values = [
+                    point['values'][0].get('extracted_value', 0)
+                    for point in timeline if point.get('values')
+                ]
+                
+                if values:
+                    timelines[query] = values
+                    trends_data.append({
+                        'query': query,
+                        'interest': values[-1],
+                        'date': timeline[-1].get('date', '')
+                    })
+        
+        # Direction, slope, change, z-score and volatility for every query in one vectorized pass
+        stats = trend_stats_for(timelines)
+        for trend in trends_data:
+            trend.update(stats[trend['query']])
         
         return {
             'trends': sorted(trends_data, key=lambda x: x['interest'], reverse=True),
             'queries_analyzed': queries
         }
     
-    def _calculate_trend_direction(self, timeline: List[Dict]) -> str:
-        """Calculate if trend is rising, falling, or stable"""
-        if len(timeline) < 2:
-            return 'stable'
-        
-        recent_values = []
-        for point in timeline[-5:]:
-            values = point.get('values', [])
-            if values:
-                recent_values.append(values[0].get('extracted_value', 0))
-        
-        if len(recent_values) < 2:
-            return 'stable'
-        
-        avg_first_half = sum(recent_values[:len(recent_values)//2]) / (len(recent_values)//2)
-        avg_second_half = sum(recent_values[len(recent_values)//2:]) / (len(recent_values) - len(recent_values)//2)
-        
-        diff_percent = ((avg_second_half - avg_first_half) / avg_first_half * 100) if avg_first_half > 0 else 0
-        
-        if diff_percent > 10:
-            return 'rising'
-        elif diff_percent < -10:
-            return 'falling'
-        else:
-            return 'stable'
+    def _trend_windows(self, queries: List[str]) -> Dict[str, List[str]]:
+        """
+        Group queries by the SerpApi window they need
+        
+        Only the window since the last stored point is fetched when history is kept,
+        and queries that need the same window share batched requests.
+        """
+        windows = {}
+        for query in queries:
+            time_range = self.timeseries.fetch_window(query) if self.timeseries else 'today 12-m'
+            windows.setdefault(time_range, []).append(query)
+        return windows
     
-    def aggregate_all_trends(self) -> Dict[str, Any]:
-        """Aggregate trends from all platforms"""
-        print("\n" + "="*60)
-        print("🚀 AGGREGATING TRENDS FROM ALL PLATFORMS")
-        print("="*60)
-        
-        results = {
-            'timestamp': datetime.now().isoformat(),
-            'youtube': {},
-            'reddit': {},
-            'hackernews': {},
-            'google_trends': {},
-            'global_keywords': []
-        }
+    def estimate_run_cost(self, platforms: List[str] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Preflight: quota units a run of these stages would spend, against what is left today
+        
+        This is an upper bound, since calls answered from the HTTP cache cost nothing.
+        Returns QuotaLedger.preflight() output, {platform: {'planned', 'used', 'limit', 'remaining', 'ok'}}.
+        """
+        ledger = get_session().ledger
+        if ledger is None:
+            return {}
+        
+        planned = Counter()
+        
+        if platforms is None or 'youtube' in platforms:
+            platform, _, units = ledger.cost_for('GET', f"{Config.YOUTUBE_API_BASE}/videos")
+            planned[platform] += units
+        
+        # Scheduled-only: never part of a full run
+        if platforms is not None and 'youtube_niches' in platforms:
+            platform, _, units = ledger.cost_for('GET', f"{Config.YOUTUBE_API_BASE}/videos")
+            _, _, search_units = ledger.cost_for('GET', f"{Config.YOUTUBE_API_BASE}/search")
+            pages = -(-Config.YOUTUBE_NICHE_RESULTS // Config.YOUTUBE_PAGE_SIZE)
+            planned[platform] += len(Config.NICHES) * pages * (search_units + units)
+        
+        if platforms is None or 'google_trends' in platforms:
+            platform, _, units = ledger.cost_for('GET', Config.SERPAPI_BASE)
+            batches = sum(
+                self.google_collector.batch_request_count(window_queries, anchor=Config.GOOGLE_TRENDS_ANCHOR)
+                for window_queries in self._trend_windows(self.TREND_QUERIES).values()
+            )
+            planned[platform] += units * batches
+        
+        return ledger.preflight(planned)
+    
+    def merge_keyword_counts(self, keyword_counts: List[Counter], sketch_size: int = None):
+        """
+        Merge per-platform keyword counts into one global ranking
+        
+        Args:
+            keyword_counts: Full keyword Counters returned by the platform stages
+            sketch_size: Track at most this many keywords with a Space-Saving sketch
+                (default: Config.GLOBAL_KEYWORD_SKETCH_SIZE, 0 = exact counts)
+        
+        Returns an object with most_common(n), either a Counter or a SpaceSaving sketch.
+        """
+        sketch_size = Config.GLOBAL_KEYWORD_SKETCH_SIZE if sketch_size is None else sketch_size
+        
+        if sketch_size:
+            merged = SpaceSaving(sketch_size)
+            for counts in keyword_counts:
+                merged.update_counts(counts)
+            return merged
+        
+        merged = Counter()
+        for counts in keyword_counts:
+            merged.update(counts)
+        return merged
+    
+    def _run_stage(self, platform: str, label: str, method_name: str, progress: Callable = None):
+        """Run one platform stage, isolating errors and timing it"""
+        started = time.perf_counter()
         
-        # Collect from each platform
         try:
-            results['youtube'] = self.get_youtube_trends()
+            data = getattr(self, method_name)()
         except Exception as e:
-            print(f"❌ YouTube error: {e}")
-            results['youtube'] = {'error': str(e)}
+            print(f"❌ {label} error: {e}")
+            data = {'error': str(e)}
         
-        try:
-            results['reddit'] = self.get_reddit_trends()
-        except Exception as e:
-            print(f"❌ Reddit error: {e}")
-            results['reddit'] = {'error': str(e)}
+        elapsed = time.perf_counter() - started
+        print(f"⏱️  {label} finished in {elapsed:.2f}s")
         
-        try:
-            results['hackernews'] = self.get_hackernews_trends()
-        except Exception as e:
-            print(f"❌ Hacker News error: {e}")
-            results['hackernews'] = {'error': str(e)}
-        
-        try:
-            results['google_trends'] = self.get_google_trends()
-        except Exception as e:
-            print(f"❌ Google Trends error: {e}")
-            results['google_trends'] = {'error': str(e)}
+        if progress is not None:
+            progress(platform, label, elapsed, data.get('error'))
+        return data, elapsed
+    
+    @classmethod
+    def stages_for(cls, platforms: List[str] = None) -> List[tuple]:
+        """The STAGES a run of these platforms executes (None = a full run)"""
+        if platforms is None:
+            return [stage for stage in cls.STAGES if stage[0] not in cls.SCHEDULED_ONLY_STAGES]
+        return [stage for stage in cls.STAGES if stage[0] in platforms]
+    
+    def run_stages(self, concurrent: bool = True, max_workers: int = None,
+                   platforms: List[str] = None, progress: Callable = None) -> Dict[str, Any]:
+        """
+        Run the platform stages and return {platform: (result, seconds)}
+        
+        Args:
+            concurrent: Run the stages in a bounded thread pool instead of one after another
+            max_workers: Thread pool size (default: Config.AGGREGATOR_MAX_WORKERS)
+            platforms: Only run these stages (default: all of STAGES except SCHEDULED_ONLY_STAGES)
+            progress: Called as progress(platform, label, seconds, error) when each stage
+                finishes, from the stage's thread; error is None on success
+        """
+        stages = self.stages_for(platforms)
+        
+        if not concurrent:
+            return {
+                platform: self._run_stage(platform, label, method_name, progress)
+                for platform, label, method_name in stages
+            }
+        
+        max_workers = max_workers or Config.AGGREGATOR_MAX_WORKERS
+        
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='stage') as executor:
+            futures = {
+                platform: executor.submit(self._run_stage, platform, label, method_name, progress)
+                for platform, label, method_name in stages
+            }
+            # Keep the STAGES order in the result regardless of completion order
+            return {platform: future.result() for platform, future in futures.items()}
+    
+    def aggregate_all_trends(self, concurrent: bool = True, max_workers: int = None,
+                             platforms: List[str] = None, progress: Callable = None) -> Dict[str, Any]:
+        """
+        Aggregate trends from all platforms
+        
+        Args:
+            concurrent: Fetch the platforms in parallel (total time ~ slowest platform)
+            max_workers: Thread pool size for concurrent mode
+            platforms: Only refresh these platforms and merge them into the last saved
+                results, keeping the other platforms as they were (default: all except
+                SCHEDULED_ONLY_STAGES, whose last results are kept)
+            progress: Per-stage completion callback, see run_stages()
+        """
+        print("\n" + "="*60)
+        if platforms is None:
+            print("🚀 AGGREGATING TRENDS FROM ALL PLATFORMS")
+        else:
+            print(f"🚀 AGGREGATING TRENDS FROM: {', '.join(platforms)}")
+        print("="*60)
         
-        # Aggregate global keywords across all platforms
-        all_keywords = []
+        started = time.perf_counter()
         
-        for platform in ['youtube', 'reddit', 'hackernews']:
-            if 'top_keywords' in results[platform]:
-                for kw in results[platform]['top_keywords']:
-                    all_keywords.extend([kw['keyword']] * kw['count'])
+        for platform, estimate in self.estimate_run_cost(platforms).items():
+            if not estimate['ok']:
+                print(f"⚠️  {platform} quota: run needs {estimate['planned']} units, "
+                      f"{estimate['remaining']} of {estimate['limit']} left today")
         
-        if all_keywords:
-            global_keyword_counts = Counter(all_keywords)
+        # Collect from each platform
+        stage_results = self.run_stages(concurrent=concurrent, max_workers=max_workers, platforms=platforms,
+                                        progress=progress)
+        
+        with _latest_lock, file_lock(os.path.join(Config.PROCESSED_DATA_DIR, LATEST_LOCK_FILE)):
+            previous = load_latest_results()
+            results = previous if platforms is not None and previous else {
+                'timestamp': None,
+                'youtube': {},
+                'reddit': {},
+                'hackernews': {},
+                'google_trends': {},
+                'global_keywords': [],
+                'stage_timings': {}
+            }
+            results['timestamp'] = datetime.now().isoformat()
+            results.setdefault('stage_timings', {})
+            # When each platform was last refreshed, since partial runs leave the others as they were
+            results.setdefault('updated', {})
+            # Last error per platform, cleared by its next successful run
+            results.setdefault('errors', {})
+            
+            # Scheduled-only stages keep their last results through full runs
+            if results is not previous:
+                for platform in self.SCHEDULED_ONLY_STAGES:
+                    self._carry_over(results, previous, platform)
+            
+            refreshed = []
+            for platform, (data, elapsed) in stage_results.items():
+                results['stage_timings'][platform] = round(elapsed, 3)
+                
+                if 'error' in data:
+                    # Keep the last good data (the snapshot keeps its rows too) and record the failure
+                    results['errors'][platform] = {'error': data['error'], 'at': results['timestamp']}
+                    if results is not previous:
+                        self._carry_over(results, previous, platform)
+                    continue
+                
+                results[platform] = data
+                results['updated'][platform] = results['timestamp']
+                results['errors'].pop(platform, None)
+                refreshed.append(platform)
+            
+            # Aggregate global keywords across all platforms from the full per-platform counts
+            keyword_counts = {
+                platform: results[platform].pop('keyword_counts')
+                for platform in ['youtube', 'reddit', 'hackernews']
+                if 'keyword_counts' in results[platform]
+            }
+            
+            # Platforms not refreshed in this run contribute their counts from the last save
+            previous_counts = self._snapshot_keyword_counts()
+            all_counts = dict(keyword_counts)
+            if previous is not None:
+                all_counts.update({
+                    platform: counts for platform, counts in previous_counts.items()
+                    if platform not in refreshed
+                })
+            
             results['global_keywords'] = [
-                {'keyword': k, 'count': v} 
-                for k, v in global_keyword_counts.most_common(20)
+                {'keyword': k, 'count': v}
+                for k, v in self.merge_keyword_counts(list(all_counts.values())).most_common(20)
             ]
+            
+            # Full item lists go to the database and the columnar snapshot, not to the JSON summary
+            items = {
+                platform: results[platform].pop('items')
+                for platform in ['youtube', 'reddit', 'hackernews']
+                if 'items' in results[platform]
+            }
+            
+            # Items were tagged with their niches when decoded; count them per platform
+            results.setdefault('niche_counts', {})
+            for platform, platform_items in items.items():
+                results['niche_counts'][platform] = dict(Counter(
+                    niche for item in platform_items for niche in item.niches
+                ))
+            
+            # Keywords trending on several platforms, with velocity against the previous snapshot
+            cross_items = dict(items)
+            if previous is not None:
+                cross_items.update(self._snapshot_items(exclude=refreshed))
+            previous_totals = Counter()
+            for counts in previous_counts.values():
+                previous_totals.update(counts)
+            results['cross_platform_trends'] = detect_cross_platform_trends(cross_items, previous_totals)
+            
+            results['stage_timings']['total'] = round(time.perf_counter() - started, 3)
+            
+            # Cumulative HTTP cache counters, for tuning TTLs against API quota
+            if get_session().cache is not None:
+                results['http_cache'] = get_session().cache.stats()
+            
+            # Quota units spent today per platform
+            if get_session().ledger is not None:
+                results['quota'] = get_session().ledger.usage()
+            
+            # Save to file
+            self._save_results(results, items, keyword_counts, merge_snapshot=previous is not None)
         
-        # Save to file
-        self._save_results(results)
+        self._store_items(items)
         
         print("\n✅ Trend aggregation complete!")
         return results
     
-    def _save_results(self, results: Dict[str, Any]):
-        """Save results to JSON file"""
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    @staticmethod
+    def _carry_over(results: Dict[str, Any], previous: Optional[Dict[str, Any]], platform: str):
+        """Copy a platform's data, refresh time and niche counts from the previous results, if any"""
+        previous = previous or {}
+        results[platform] = previous.get(platform) or {}
+        if platform in previous.get('updated', {}):
+            results['updated'][platform] = previous['updated'][platform]
+        if platform in previous.get('niche_counts', {}):
+            results.setdefault('niche_counts', {})[platform] = previous['niche_counts'][platform]
+    
+    def _snapshot_items(self, exclude: List[str] = ()) -> Dict[str, List[ContentRecord]]:
+        """Titles and engagement of the last saved items as records, per platform, {} if there are none"""
+        if not Config.COLUMNAR_SNAPSHOTS:
+            return {
+                platform: [ContentRecord.from_dict(platform, row) for row in state['items']]
+                for platform, state in self._load_state().items()
+                if platform not in exclude and 'items' in state
+            }
+        
+        snapshot_path = os.path.join(Config.PROCESSED_DATA_DIR, 'latest.npz')
+        if not os.path.exists(snapshot_path):
+            return {}
+        
+        platforms = [platform for platform in snapshots.TABLES if platform not in exclude]
+        frames = snapshots.load_snapshot(snapshot_path, platforms=platforms, columns=CARRIED_ITEM_FIELDS)
+        records = {}
+        for name, frame in frames.items():
+            if name.endswith('.keywords'):
+                continue
+            platform = name.split('.')[0]
+            records[platform] = [ContentRecord.from_dict(platform, row) for row in frame.to_dict('records')]
+        return records
+    
+    def _snapshot_keyword_counts(self) -> Dict[str, Counter]:
+        """Full per-platform keyword counts from the last save, {} if there are none"""
+        if not Config.COLUMNAR_SNAPSHOTS:
+            return {
+                platform: Counter(state['keyword_counts'])
+                for platform, state in self._load_state().items() if 'keyword_counts' in state
+            }
+        
+        snapshot_path = os.path.join(Config.PROCESSED_DATA_DIR, 'latest.npz')
+        if not os.path.exists(snapshot_path):
+            return {}
+        
+        frames = snapshots.load_snapshot(snapshot_path, tables=['keywords'])
+        return {
+            name.split('.')[0]: Counter(dict(zip(frame['keyword'].tolist(), frame['count'].tolist())))
+            for name, frame in frames.items()
+        }
+    
+    @staticmethod
+    def _load_state() -> Dict[str, Dict[str, Any]]:
+        """latest_state.json as {platform: {'keyword_counts': {...}, 'items': [...]}}, {} if there is none"""
+        state_path = os.path.join(Config.PROCESSED_DATA_DIR, LATEST_STATE_FILE)
+        if not os.path.exists(state_path):
+            return {}
+        
+        with open(state_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    def _save_results(self, results: Dict[str, Any], items: Dict[str, List[ContentRecord]] = None,
+                      keyword_counts: Dict[str, Counter] = None, merge_snapshot: bool = False):
+        """
+        Save results to JSON file, plus the per-item tables as a columnar snapshot
+        
+        With merge_snapshot, platforms missing from items are carried over from latest.npz
+        (or from latest_state.json when COLUMNAR_SNAPSHOTS is off).
+        """
+        # Microseconds keep jobs that finish in the same second from overwriting each other's files
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
         filename = f"trends_{timestamp}.json"
         filepath = os.path.join(Config.PROCESSED_DATA_DIR, filename)
         
         with open(filepath, 'w', encoding='utf-8') as f:
             json.dump(results, f, indent=2, ensure_ascii=False)
         
-        # Also save as latest.json for easy access
-        latest_path = os.path.join(Config.PROCESSED_DATA_DIR, 'latest.json')
-        with open(latest_path, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
+        # Also save as latest.json for easy access, swapped in atomically since the
+        # dashboard may read it while a scheduled run is writing
+        self._replace_latest(filepath, os.path.join(Config.PROCESSED_DATA_DIR, 'latest.json'))
         
         print(f"\n💾 Results saved to: {filepath}")
+        self._prune_history('.json')
+        
+        if items is None:
+            return
+        if Config.COLUMNAR_SNAPSHOTS:
+            self._save_snapshot(timestamp, items, keyword_counts or {}, merge=merge_snapshot)
+        else:
+            self._save_state(items, keyword_counts or {}, merge=merge_snapshot)
+    
+    def _save_snapshot(self, timestamp: str, items: Dict[str, List[ContentRecord]],
+                       keyword_counts: Dict[str, Counter], merge: bool = False):
+        """Save per-item tables as trends_<ts>.npz and latest.npz"""
+        filepath = os.path.join(Config.PROCESSED_DATA_DIR, f"trends_{timestamp}.npz")
+        latest_path = os.path.join(Config.PROCESSED_DATA_DIR, 'latest.npz')
+        snapshots.write_snapshot(filepath, items, keyword_counts, base=latest_path if merge else None)
+        
+        # Swap latest.npz atomically so dashboards never read a half-written file
+        self._replace_latest(filepath, latest_path)
+        
+        print(f"📦 Columnar snapshot saved to: {filepath}")
+        self._prune_history('.npz')
+    
+    def _save_state(self, items: Dict[str, List[ContentRecord]], keyword_counts: Dict[str, Counter],
+                    merge: bool = False):
+        """Save per-platform keyword counts and item engagement as latest_state.json"""
+        state_path = os.path.join(Config.PROCESSED_DATA_DIR, LATEST_STATE_FILE)
+        state = self._load_state() if merge else {}
+        
+        for platform, platform_items in items.items():
+            fields = [name for name in CARRIED_ITEM_FIELDS if name in EXPORT_FIELDS[platform]]
+            state.setdefault(platform, {})['items'] = [
+                {name: item.field(name) for name in fields} for item in platform_items
+            ]
+        for platform, counts in keyword_counts.items():
+            state.setdefault(platform, {})['keyword_counts'] = dict(counts)
+        
+        # Written beside latest.json and swapped in, like the other latest.* files
+        fd, tmp_path = tempfile.mkstemp(dir=Config.PROCESSED_DATA_DIR, prefix=f'.{LATEST_STATE_FILE}.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(state, f, ensure_ascii=False)
+            os.replace(tmp_path, state_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    
+    @staticmethod
+    def _prune_history(extension: str):
+        """Delete all but the newest Config.RESULTS_RETENTION trends_<ts> files with this extension"""
+        if Config.RESULTS_RETENTION <= 0:
+            return
+        
+        # The timestamps are fixed-width, so names sort oldest first
+        history = sorted(
+            name for name in os.listdir(Config.PROCESSED_DATA_DIR)
+            if name.startswith('trends_') and name.endswith(extension)
+        )
+        for name in history[:-Config.RESULTS_RETENTION]:
+            try:
+                os.remove(os.path.join(Config.PROCESSED_DATA_DIR, name))
+            except FileNotFoundError:
+                pass  # Already pruned by another process
+    
+    @staticmethod
+    def _replace_latest(source: str, latest_path: str):
+        """Atomically replace latest_path with a copy of source, via a unique temp file in the same directory"""
+        directory, name = os.path.split(latest_path)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f'.{name}.', suffix='.tmp')
+        os.close(fd)
+        try:
+            shutil.copyfile(source, tmp_path)
+            os.replace(tmp_path, latest_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    
+    def _store_items(self, items: Dict[str, List[ContentRecord]]):
+        """Upsert collected items into the SQL store"""
+        if self.store is None:
+            return
+        
+        try:
+            count = self.store.save_items(items)
+            print(f"🗄️  Stored {count} items in {Config.DATABASE_URL}")
+        except Exception as e:
+            print(f"❌ Database error: {e}")
 
 
 if __name__ == '__main__':
@@ -322,3 +732,8 @@ if __name__ == '__main__':
         print("\n🔥 Top 5 Global Keywords:")
         for kw in results['global_keywords'][:5]:
             print(f"   • {kw['keyword']}: {kw['count']} mentions")
+    
+    if results.get('stage_timings'):
+        print("\n⏱️  Stage timings:")
+        for stage, seconds in results['stage_timings'].items():
+            print(f"   • {stage}: {seconds:.2f}s")
@@ -1,5 +1,6 @@
 import requests
 from config import Config
+from src.http_client import get_session
 
 class GoogleTrendsCollector:
     """Collect data from Google Trends via SerpApi"""
@@ -7,6 +8,7 @@ class GoogleTrendsCollector:
     def __init__(self):
         self.api_key = Config.SERPAPI_KEY
         self.base_url = Config.SERPAPI_BASE
+        self.session = get_session()
     
     def get_interest_over_time(self, query, geo='', time_range='today 12-m'):
         """Get search interest over time for a query"""
@@ -14,6 +16,7 @@ class GoogleTrendsCollector:
             'engine': 'google_trends',
             'q': query,
             'data_type': 'TIMESERIES',
+            'date': time_range,  # e.g. 'now 7-d', 'today 1-m', 'today 12-m'
             'api_key': self.api_key
         }
         
@@ -21,13 +24,105 @@ class GoogleTrendsCollector:
             params['geo'] = geo
         
         try:
-            response = requests.get(self.base_url, params=params)
+            response = self.session.get(self.base_url, params=params)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
             print(f"❌ Error fetching Google Trends data: {e}")
             return None
     
+    def get_interest_over_time_batch(self, queries, anchor=None, geo='', time_range='today 12-m'):
+        """
+        Get interest over time for many queries, up to five per SerpApi request
+        
+        Google Trends values are relative within one comparison, so every request
+        carries the same anchor term and each group is rescaled so that its anchor
+        matches the anchor of the first group. Values are then comparable across
+        groups while the number of API calls drops roughly 5x.
+        
+        Args:
+            queries: Search terms (must not contain commas)
+            anchor: Term shared by every group (default: the first query)
+            geo: Region code, '' for worldwide
+            time_range: SerpApi date window, e.g. 'today 12-m'
+        
+        Returns {query: timeline_data}, in the same shape as a single-query response.
+        """
+        anchor, groups = self._batch_groups(queries, anchor)
+        
+        timelines = {}
+        reference_mean = None
+        
+        for group in groups:
+            terms = [anchor] + group
+            data = self.get_interest_over_time(','.join(terms), geo=geo, time_range=time_range)
+            if not data or 'interest_over_time' not in data:
+                continue
+            
+            timeline = data['interest_over_time'].get('timeline_data', [])
+            series = self._split_timeline(timeline, terms)
+            
+            anchor_values = [p['values'][0]['extracted_value'] for p in series[anchor]]
+            anchor_mean = sum(anchor_values) / len(anchor_values) if anchor_values else 0
+            
+            if reference_mean is None:
+                reference_mean = anchor_mean
+            scale = reference_mean / anchor_mean if anchor_mean > 0 and reference_mean > 0 else 1.0
+            
+            for term in terms:
+                if term == anchor and anchor in timelines:
+                    continue
+                timelines[term] = [
+                    {
+                        **point,
+                        'values': [{
+                            'query': term,
+                            'extracted_value': round(point['values'][0]['extracted_value'] * scale, 2)
+                        }]
+                    }
+                    for point in series[term]
+                ]
+        
+        return timelines
+    
+    @staticmethod
+    def _batch_groups(queries, anchor=None):
+        """
+        (anchor, groups) for get_interest_over_time_batch: each group is sent with the anchor
+        
+        The anchor may or may not be one of the queries; either way it is never
+        repeated inside a group. No queries means no groups.
+        """
+        queries = list(dict.fromkeys(queries))
+        if not queries:
+            return anchor, []
+        
+        anchor = anchor or queries[0]
+        others = [q for q in queries if q != anchor]
+        per_group = Config.GOOGLE_TRENDS_BATCH_SIZE - 1
+        return anchor, [others[i:i + per_group] for i in range(0, len(others), per_group)] or [[]]
+    
+    @classmethod
+    def batch_request_count(cls, queries, anchor=None):
+        """Number of SerpApi requests get_interest_over_time_batch makes for these queries and anchor"""
+        return len(cls._batch_groups(queries, anchor)[1])
+    
+    def _split_timeline(self, timeline, terms):
+        """Split a comparison timeline into one single-value timeline per term"""
+        series = {term: [] for term in terms}
+        
+        for point in timeline:
+            values = point.get('values', [])
+            for index, term in enumerate(terms):
+                if index < len(values):
+                    series[term].append({
+                        'date': point.get('date', ''),
+                        'timestamp': point.get('timestamp', ''),
+                        'values': [{'query': term, 'extracted_value': values[index].get('extracted_value', 0)}]
+                    })
+        
+        return series
+    
     def get_related_queries(self, query, geo=''):
         """Get related queries for a search term"""
         params = {
@@ -41,7 +136,7 @@ class GoogleTrendsCollector:
             params['geo'] = geo
         
         try:
-            response = requests.get(self.base_url, params=params)
+            response = self.session.get(self.base_url, params=params)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
@@ -1,18 +1,26 @@
 import requests
+import time
+from concurrent.futures import ThreadPoolExecutor
 from config import Config
+from src.http_client import get_session
+from src.hn_items import HackerNewsItemStore
 
 class HackerNewsCollector:
     """Collect data from Hacker News Firebase API"""
     
     def __init__(self):
         self.base_url = Config.HACKERNEWS_API_BASE
+        self.max_workers = Config.HN_MAX_WORKERS
+        self.session = get_session()
+        # Local item copies for incremental sync (None = refetch every item each run)
+        self.item_store = HackerNewsItemStore() if Config.HN_INCREMENTAL_SYNC else None
     
     def get_top_stories(self, limit=30):
         """Fetch top story IDs"""
         url = f"{self.base_url}/topstories.json"
         
         try:
-            response = requests.get(url)
+            response = self.session.get(url)
             response.raise_for_status()
             story_ids = response.json()
             return story_ids[:limit]
@@ -25,7 +33,7 @@ class HackerNewsCollector:
         url = f"{self.base_url}/newstories.json"
         
         try:
-            response = requests.get(url)
+            response = self.session.get(url)
             response.raise_for_status()
             story_ids = response.json()
             return story_ids[:limit]
@@ -33,29 +41,92 @@ class HackerNewsCollector:
             print(f"❌ Error fetching HN new stories: {e}")
             return []
     
-    def get_item(self, item_id):
-        """Fetch item details by ID"""
+    def get_updates(self):
+        """
+        Fetch the IDs of recently changed items from /v0/updates.json
+        
+        Returns a set of item IDs, or None if the feed could not be read.
+        """
+        url = f"{self.base_url}/updates.json"
+        
+        try:
+            response = self.session.get(url, cache_ttl=0)
+            response.raise_for_status()
+            return set(response.json().get('items', []))
+        except requests.exceptions.RequestException as e:
+            print(f"❌ Error fetching HN updates: {e}")
+            return None
+    
+    def get_item(self, item_id, cache_ttl=None):
+        """Fetch item details by ID (cache_ttl=0 skips the HTTP cache)"""
         url = f"{self.base_url}/item/{item_id}.json"
         
         try:
-            response = requests.get(url)
+            response = self.session.get(url, cache_ttl=cache_ttl)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
             print(f"❌ Error fetching HN item {item_id}: {e}")
             return None
     
-    def get_top_stories_with_details(self, limit=10):
-        """Fetch top stories with full details"""
-        story_ids = self.get_top_stories(limit)
-        stories = []
+    def get_items(self, item_ids, max_workers=None, cache_ttl=None):
+        """
+        Fetch many items concurrently over the pooled session
         
-        for story_id in story_ids:
-            story = self.get_item(story_id)
-            if story:
-                stories.append(story)
+        Args:
+            item_ids: Item IDs to fetch
+            max_workers: Concurrent requests (default: Config.HN_MAX_WORKERS)
+            cache_ttl: Passed to get_item (0 = always fetch from the API)
+        
+        Returns items in the same order as item_ids; failed or deleted items are skipped.
+        """
+        item_ids = list(item_ids)
+        if not item_ids:
+            return []
         
-        return stories
+        max_workers = min(max_workers or self.max_workers, len(item_ids))
+        
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='hn') as executor:
+            items = executor.map(lambda item_id: self.get_item(item_id, cache_ttl=cache_ttl), item_ids)
+            return [item for item in items if item]
+    
+    def sync_items(self, item_ids, max_age=None):
+        """
+        Return items for item_ids from the local store, refetching only what may have changed
+        
+        An item is fetched when it is not stored yet, is listed in /v0/updates.json,
+        or was fetched more than max_age seconds ago (default: Config.HN_ITEM_MAX_AGE),
+        which bounds staleness for changes that fell outside the updates feed.
+        Without the feed every item is refetched. Returns items in item_ids order.
+        """
+        item_ids = list(item_ids)
+        max_age = Config.HN_ITEM_MAX_AGE if max_age is None else max_age
+        
+        stored = self.item_store.get_many(item_ids)
+        changed = self.get_updates() if stored else set()
+        now = time.time()
+        
+        stale_ids = [
+            item_id for item_id in item_ids
+            if item_id not in stored or changed is None or item_id in changed
+            or now - stored[item_id][1] > max_age
+        ]
+        
+        # The store is the cache here, so refetched items must come from the API
+        fetched = self.get_items(stale_ids, cache_ttl=0)
+        self.item_store.put_many(fetched, now)
+        print(f"🔄 HN sync: fetched {len(fetched)} of {len(item_ids)} items")
+        
+        items = {item_id: item for item_id, (item, _) in stored.items()}
+        items.update((item['id'], item) for item in fetched)
+        return [items[item_id] for item_id in item_ids if item_id in items]
+    
+    def get_top_stories_with_details(self, limit=10):
+        """Fetch top stories with full details, incrementally when the item store is enabled"""
+        story_ids = self.get_top_stories(limit)
+        if self.item_store is not None:
+            return self.sync_items(story_ids)
+        return self.get_items(story_ids)
 
 # Test the collector
 if __name__ == '__main__':
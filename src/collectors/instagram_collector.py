@@ -1,14 +1,21 @@
 from apify_client import ApifyClient
 from config import Config
+from src.http_client import call_actor
 
 class InstagramCollector:
     """Collect data from Instagram via Apify"""
     
+    ACTOR_ID = "apify/instagram-scraper"
+    
     def __init__(self):
         self.client = ApifyClient(Config.APIFY_TOKEN)
     
     def scrape_hashtag(self, hashtag, max_posts=50):
         """Scrape posts for a specific hashtag"""
+        return list(self.iter_hashtag(hashtag, max_posts))
+    
+    def iter_hashtag(self, hashtag, max_posts=50):
+        """Scrape posts for a specific hashtag, yielding them as they stream from the dataset"""
         run_input = {
             "directUrls": [f"https://www.instagram.com/explore/tags/{hashtag}/"],
             "resultsType": "posts",
@@ -18,17 +25,62 @@ class InstagramCollector:
         
         try:
             print(f"🔄 Starting Instagram scrape for #{hashtag}...")
-            run = self.client.actor("apify/instagram-scraper").call(run_input=run_input)
-            
-            # Fetch results
-            items = []
-            for item in self.client.dataset(run["defaultDatasetId"]).iterate_items():
-                items.append(item)
+            run = call_actor(self.client, self.ACTOR_ID, run_input)
             
-            return items
+            # Stream results
+            yield from self.client.dataset(run["defaultDatasetId"]).iterate_items()
         except Exception as e:
             print(f"❌ Error scraping Instagram: {e}")
-            return []
+    
+    def scrape_hashtags(self, hashtags, max_posts=50, batch_size=None):
+        """
+        Scrape several hashtags, packing up to batch_size of them into each actor run
+        
+        Args:
+            hashtags: Hashtags to scrape (with or without '#')
+            max_posts: Maximum number of posts per hashtag
+            batch_size: Hashtags per run (default: Config.APIFY_HASHTAG_BATCH_SIZE)
+        
+        Returns {hashtag: [posts]}, keyed by the lowercased hashtag without '#'.
+        """
+        batch_size = batch_size or Config.APIFY_HASHTAG_BATCH_SIZE
+        tags = list(dict.fromkeys(tag.lstrip('#').lower() for tag in hashtags))
+        results = {tag: [] for tag in tags}
+        
+        for start in range(0, len(tags), batch_size):
+            batch = tags[start:start + batch_size]
+            run_input = {
+                "directUrls": [f"https://www.instagram.com/explore/tags/{tag}/" for tag in batch],
+                "resultsType": "posts",
+                "resultsLimit": max_posts,
+                "searchType": "hashtag"
+            }
+            
+            try:
+                print(f"🔄 Starting Instagram scrape for {len(batch)} hashtags: {', '.join('#' + t for t in batch)}...")
+                run = call_actor(self.client, self.ACTOR_ID, run_input)
+                
+                for item in self.client.dataset(run["defaultDatasetId"]).iterate_items():
+                    tag = self._source_hashtag(item, batch)
+                    if tag is not None:
+                        results[tag].append(item)
+            except Exception as e:
+                print(f"❌ Error scraping Instagram: {e}")
+        
+        return results
+    
+    @staticmethod
+    def _source_hashtag(post, batch):
+        """Work out which of the run's hashtags a post was scraped for"""
+        input_url = (post.get('inputUrl') or '').rstrip('/').lower()
+        if '/explore/tags/' in input_url:
+            searched = input_url.rsplit('/', 1)[-1]
+            if searched in batch:
+                return searched
+        
+        # Fall back to the first batch hashtag the post itself is tagged with
+        tagged = {h.lstrip('#').lower() for h in post.get('hashtags') or [] if isinstance(h, str)}
+        return next((tag for tag in batch if tag in tagged), None)
 
 # Test the collector
 if __name__ == '__main__':
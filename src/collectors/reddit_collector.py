@@ -1,5 +1,10 @@
+import queue
+import threading
+import time
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from config import Config
+from src.http_client import get_session
 
 class RedditCollector:
     """Collect data from Reddit JSON API (no authentication needed)"""
@@ -9,55 +14,139 @@ class RedditCollector:
         self.headers = {
             'User-Agent': 'SocialMediaDashboard/1.0'
         }
+        self.session = get_session()
     
-    def get_hot_posts(self, subreddit, limit=25):
-        """Fetch hot posts from a subreddit"""
-        url = f"{self.base_url}/r/{subreddit}/hot.json"
-        params = {'limit': limit}
+    def get_listing_page(self, subreddit, listing='hot', limit=25, after=None, **params):
+        """
+        Fetch one page of a subreddit listing
+        
+        Returns (posts, after), where after is the cursor for the next page or None
+        on the last page. Raises requests.exceptions.RequestException on failure.
+        """
+        url = f"{self.base_url}/r/{subreddit}/{listing}.json"
+        params = dict(params, limit=min(limit, Config.REDDIT_PAGE_SIZE))
+        if after:
+            params['after'] = after
+        
+        response = self.session.get(url, params=params, headers=self.headers)
+        response.raise_for_status()
+        data = response.json().get('data', {})
+        return data.get('children', []), data.get('after')
+    
+    def iter_pages(self, subreddit, listing='hot', limit=25, max_pages=None, **params):
+        """
+        Yield a subreddit listing page by page (lists of posts), following `after` cursors
+        
+        Args:
+            subreddit: Subreddit name
+            listing: hot, new, top, rising or search
+            limit: Total posts wanted (Reddit serves at most 100 per page)
+            max_pages: Pages to read at most (default: Config.REDDIT_MAX_PAGES)
+            **params: Extra listing parameters, e.g. t='day' or q='python'
+        """
+        max_pages = max_pages or Config.REDDIT_MAX_PAGES
+        after = None
+        fetched = 0
+        
+        for _ in range(max_pages):
+            try:
+                posts, after = self.get_listing_page(subreddit, listing, limit - fetched, after, **params)
+            except requests.exceptions.RequestException as e:
+                print(f"❌ Error fetching r/{subreddit}/{listing}: {e}")
+                return
+            
+            posts = posts[:limit - fetched]
+            fetched += len(posts)
+            if posts:
+                yield posts
+            
+            if not after or not posts or fetched >= limit:
+                return
+    
+    def iter_listing(self, subreddit, listing='hot', limit=25, max_pages=None, **params):
+        """Yield posts from a subreddit listing, see iter_pages()"""
+        for page in self.iter_pages(subreddit, listing, limit, max_pages, **params):
+            yield from page
+    
+    def crawl(self, subreddits, listing='hot', limit=25, max_pages=None, max_workers=None, timeout=None, **params):
+        """
+        Crawl many subreddits concurrently, yielding posts as their pages arrive
+        
+        Every request still waits for Reddit's token bucket, so concurrency
+        overlaps network round trips without exceeding the rate limit. The crawl
+        stops requesting pages once `timeout` seconds have passed and returns
+        what it has, so a long subreddit list finishes in a bounded time window.
+        Closing the generator early stops the workers after their current page.
+        
+        Args:
+            subreddits: Subreddit names
+            listing, limit, max_pages, **params: Per subreddit, see iter_pages()
+            max_workers: Subreddits crawled at once (default: Config.REDDIT_MAX_WORKERS)
+            timeout: Seconds before no new pages are requested (default: Config.REDDIT_CRAWL_TIMEOUT)
+        """
+        subreddits = list(subreddits)
+        if not subreddits:
+            return
         
+        max_workers = min(max_workers or Config.REDDIT_MAX_WORKERS, len(subreddits))
+        deadline = time.monotonic() + (timeout or Config.REDDIT_CRAWL_TIMEOUT)
+        pages = queue.Queue(maxsize=max_workers * 2)  # Bounded, so a slow consumer holds back the workers
+        stop = threading.Event()
+        done = object()
+        
+        def crawl_subreddit(subreddit):
+            try:
+                if stop.is_set() or time.monotonic() > deadline:
+                    return
+                for page in self.iter_pages(subreddit, listing, limit, max_pages, **params):
+                    pages.put(page)
+                    if stop.is_set() or time.monotonic() > deadline:
+                        break
+            finally:
+                pages.put(done)
+        
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='reddit')
+        remaining = len(subreddits)
+        futures = {}
         try:
-            response = requests.get(url, params=params, headers=self.headers)
-            response.raise_for_status()
-            data = response.json()
-            return data.get('data', {}).get('children', [])
-        except requests.exceptions.RequestException as e:
-            print(f"❌ Error fetching Reddit data: {e}")
-            return []
+            for subreddit in subreddits:
+                futures[executor.submit(crawl_subreddit, subreddit)] = subreddit
+            
+            while remaining:
+                page = pages.get()
+                if page is done:
+                    remaining -= 1
+                else:
+                    yield from page
+        finally:
+            stop.set()
+            # Drain so workers blocked on a full queue can finish
+            while remaining:
+                try:
+                    if pages.get(timeout=0.1) is done:
+                        remaining -= 1
+                except queue.Empty:
+                    pass
+            executor.shutdown(wait=True)
+            
+            # Request errors are handled per page in iter_pages(); anything else ended a worker early
+            for future, subreddit in futures.items():
+                try:
+                    future.result()
+                except Exception as e:
+                    print(f"❌ Error crawling r/{subreddit}: {e}")
+    
+    def get_hot_posts(self, subreddit, limit=25):
+        """Fetch hot posts from a subreddit (more than 100 follows the `after` cursor)"""
+        return list(self.iter_listing(subreddit, 'hot', limit))
     
     def get_top_posts(self, subreddit, time_filter='day', limit=25):
         """Fetch top posts from a subreddit"""
-        url = f"{self.base_url}/r/{subreddit}/top.json"
-        params = {
-            'limit': limit,
-            't': time_filter  # hour, day, week, month, year, all
-        }
-        
-        try:
-            response = requests.get(url, params=params, headers=self.headers)
-            response.raise_for_status()
-            data = response.json()
-            return data.get('data', {}).get('children', [])
-        except requests.exceptions.RequestException as e:
-            print(f"❌ Error fetching Reddit top posts: {e}")
-            return []
+        return list(self.iter_listing(subreddit, 'top', limit, t=time_filter))  # hour, day, week, month, year, all
     
     def search_posts(self, subreddit, query, limit=25):
         """Search posts in a subreddit"""
-        url = f"{self.base_url}/r/{subreddit}/search.json"
-        params = {
-            'q': query,
-            'limit': limit,
-            'restrict_sr': 'true'
-        }
-        
-        try:
-            response = requests.get(url, params=params, headers=self.headers)
-            response.raise_for_status()
-            data = response.json()
-            return data.get('data', {}).get('children', [])
-        except requests.exceptions.RequestException as e:
-            print(f"❌ Error searching Reddit: {e}")
-            return []
+        return list(self.iter_listing(subreddit, 'search', limit, q=query, restrict_sr='true'))
 
 # Test the collector
 if __name__ == '__main__':
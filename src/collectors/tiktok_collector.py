@@ -1,14 +1,21 @@
 from apify_client import ApifyClient
 from config import Config
+from src.http_client import call_actor
 
 class TikTokCollector:
     """Collect data from TikTok via Apify"""
     
+    ACTOR_ID = "clockworks/tiktok-scraper"
+    
     def __init__(self):
         self.client = ApifyClient(Config.APIFY_TOKEN)
     
     def scrape_hashtag(self, hashtag, max_videos=50):
         """Scrape videos for a specific hashtag"""
+        return list(self.iter_hashtag(hashtag, max_videos))
+    
+    def iter_hashtag(self, hashtag, max_videos=50):
+        """Scrape videos for a specific hashtag, yielding them as they stream from the dataset"""
         run_input = {
             "hashtags": [hashtag],
             "resultsPerPage": max_videos,
@@ -17,17 +24,60 @@ class TikTokCollector:
         
         try:
             print(f"🔄 Starting TikTok scrape for #{hashtag}...")
-            run = self.client.actor("clockworks/tiktok-scraper").call(run_input=run_input)
-            
-            # Fetch results
-            items = []
-            for item in self.client.dataset(run["defaultDatasetId"]).iterate_items():
-                items.append(item)
+            run = call_actor(self.client, self.ACTOR_ID, run_input)
             
-            return items
+            # Stream results
+            yield from self.client.dataset(run["defaultDatasetId"]).iterate_items()
         except Exception as e:
             print(f"❌ Error scraping TikTok: {e}")
-            return []
+    
+    def scrape_hashtags(self, hashtags, max_videos=50, batch_size=None):
+        """
+        Scrape several hashtags, packing up to batch_size of them into each actor run
+        
+        Args:
+            hashtags: Hashtags to scrape (with or without '#')
+            max_videos: Maximum number of videos per hashtag
+            batch_size: Hashtags per run (default: Config.APIFY_HASHTAG_BATCH_SIZE)
+        
+        Returns {hashtag: [videos]}, keyed by the lowercased hashtag without '#'.
+        """
+        batch_size = batch_size or Config.APIFY_HASHTAG_BATCH_SIZE
+        tags = list(dict.fromkeys(tag.lstrip('#').lower() for tag in hashtags))
+        results = {tag: [] for tag in tags}
+        
+        for start in range(0, len(tags), batch_size):
+            batch = tags[start:start + batch_size]
+            run_input = {
+                "hashtags": batch,
+                "resultsPerPage": max_videos,
+                "shouldDownloadVideos": False
+            }
+            
+            try:
+                print(f"🔄 Starting TikTok scrape for {len(batch)} hashtags: {', '.join('#' + t for t in batch)}...")
+                run = call_actor(self.client, self.ACTOR_ID, run_input)
+                
+                for item in self.client.dataset(run["defaultDatasetId"]).iterate_items():
+                    tag = self._source_hashtag(item, batch)
+                    if tag is not None:
+                        results[tag].append(item)
+            except Exception as e:
+                print(f"❌ Error scraping TikTok: {e}")
+        
+        return results
+    
+    @staticmethod
+    def _source_hashtag(video, batch):
+        """Work out which of the run's hashtags a video was scraped for"""
+        searched = (video.get('searchHashtag') or {}).get('name') or video.get('input') or ''
+        searched = searched.lstrip('#').lower()
+        if searched in batch:
+            return searched
+        
+        # Fall back to the first batch hashtag the video itself is tagged with
+        tagged = {(h.get('name') or '').lower() for h in video.get('hashtags') or [] if isinstance(h, dict)}
+        return next((tag for tag in batch if tag in tagged), None)
 
 # Test the collector
 if __name__ == '__main__':
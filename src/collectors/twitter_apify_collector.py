@@ -1,26 +1,49 @@
+import heapq
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from config import Config
+from src.http_client import get_session
+from src import tokenizer
+from src.niches import default_classifier
 import time
 
 class TwitterApifyCollector:
     """Collect data from Twitter/X using Apify API"""
     
+    # Seconds each start/status request may block server-side (Apify allows up to 60)
+    WAIT_FOR_FINISH = 60
+    TERMINAL_STATUSES = ('SUCCEEDED', 'FAILED', 'ABORTED', 'TIMED-OUT')
+    
     def __init__(self):
         self.api_key = Config.APIFY_TOKEN
         self.base_url = Config.APIFY_API_BASE
         self.actor_id = 'apify/twitter-scraper'  # Official Apify Twitter scraper
+        self.session = get_session()
     
-    def search_tweets(self, query, max_tweets=50, sort='Latest'):
-        """Search tweets by query/hashtag"""
-        run_input = {
+    def _search_input(self, query, max_tweets=50, sort='Latest'):
+        """Actor input for a tweet search"""
+        return {
             'searchTerms': [query],
             'maxTweets': max_tweets,
             'sort': sort,  # Latest, Top, Photos, Videos
             'tweetLanguage': 'en',
             'addUserInfo': True
         }
+    
+    def search_tweets(self, query, max_tweets=50, sort='Latest'):
+        """Search tweets by query/hashtag"""
+        return self._run_actor(self._search_input(query, max_tweets, sort))
+    
+    def iter_search_tweets(self, query, max_tweets=50, sort='Latest'):
+        """Search tweets by query/hashtag, yielding them page by page as they download"""
+        dataset_id = self._start_and_wait(self._search_input(query, max_tweets, sort))
+        if dataset_id is None:
+            return
         
-        return self._run_actor(run_input)
+        try:
+            yield from self._iter_dataset(dataset_id)
+        except requests.exceptions.RequestException as e:
+            print(f"❌ Error downloading Twitter results: {e}")
     
     def get_trending_topics(self, location='Worldwide'):
         """Get trending topics (Note: This requires Twitter API access)"""
@@ -30,12 +53,23 @@ class TwitterApifyCollector:
             '#Marketing', '#Startup', '#Programming', '#Design'
         ]
         
+        run_inputs = [
+            self._search_input(hashtag, max_tweets=20, sort='Top')
+            for hashtag in popular_hashtags[:5]  # Limit to avoid rate limits
+        ]
+        
+        # Runs start concurrently, so this takes about as long as the slowest run
         all_tweets = []
-        for hashtag in popular_hashtags[:5]:  # Limit to avoid rate limits
-            tweets = self.search_tweets(hashtag, max_tweets=20, sort='Top')
-            if tweets:
-                all_tweets.extend(tweets)
-            time.sleep(2)  # Rate limiting
+        seen_ids = set()
+        for tweets in self.run_many(run_inputs):
+            for tweet in tweets or []:
+                # A tweet matching several of the hashtags comes back from each search
+                tweet_id = tweet.get('id') or tweet.get('url')
+                if tweet_id:
+                    if tweet_id in seen_ids:
+                        continue
+                    seen_ids.add(tweet_id)
+                all_tweets.append(tweet)
         
         return all_tweets
     
@@ -54,97 +88,154 @@ class TwitterApifyCollector:
         query = ' OR '.join(niche_keywords)
         return self.search_tweets(query, max_tweets=max_tweets, sort='Top')
     
+    def run_many(self, run_inputs, max_concurrency=None):
+        """
+        Run several actor inputs concurrently and return their results in input order
+        
+        Args:
+            run_inputs: Actor inputs to run
+            max_concurrency: Runs in flight at once (default: Config.APIFY_MAX_CONCURRENT_RUNS)
+        """
+        run_inputs = list(run_inputs)
+        if not run_inputs:
+            return []
+        
+        max_concurrency = min(max_concurrency or Config.APIFY_MAX_CONCURRENT_RUNS, len(run_inputs))
+        
+        with ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix='apify') as executor:
+            return list(executor.map(self._run_actor, run_inputs))
+    
     def _run_actor(self, run_input):
         """Run Apify actor and wait for results"""
-        url = f"{self.base_url}/acts/{self.actor_id}/runs"
+        dataset_id = self._start_and_wait(run_input)
+        if dataset_id is None:
+            return None
+        
+        try:
+            return list(self._iter_dataset(dataset_id))
+        except requests.exceptions.RequestException as e:
+            print(f"❌ Error downloading Twitter results: {e}")
+            return None
+    
+    def _start_and_wait(self, run_input):
+        """
+        Start an actor run and long-poll until it finishes
+        
+        Uses Apify's waitForFinish parameter, so each request blocks server-side
+        until the run finishes (or WAIT_FOR_FINISH seconds pass) instead of
+        sleeping and polling on a fixed interval.
+        
+        Returns the run's default dataset ID, or None on failure/timeout.
+        """
+        # Actor IDs use '~' instead of '/' in API paths
+        url = f"{self.base_url}/acts/{self.actor_id.replace('/', '~')}/runs"
         headers = {'Authorization': f'Bearer {self.api_key}'}
+        wait = self.WAIT_FOR_FINISH
+        # Keep the read timeout above the server-side wait
+        timeout = (Config.HTTP_CONNECT_TIMEOUT, wait + Config.HTTP_READ_TIMEOUT)
+        deadline = time.monotonic() + Config.APIFY_RUN_TIMEOUT
         
         try:
             # Start the actor
-            response = requests.post(url, json={'input': run_input}, headers=headers)
+            response = self.session.post(
+                url, json=run_input, headers=headers, params={'waitForFinish': wait}, timeout=timeout
+            )
             response.raise_for_status()
-            run_data = response.json()
-            run_id = run_data['data']['id']
+            run = response.json()['data']
+            status_url = f"{self.base_url}/actor-runs/{run['id']}"
             
             # Wait for completion
-            status_url = f"{self.base_url}/actor-runs/{run_id}"
-            max_wait = 120  # 2 minutes
-            waited = 0
-            
-            while waited < max_wait:
-                time.sleep(5)
-                waited += 5
-                
-                status_response = requests.get(status_url, headers=headers)
-                status_data = status_response.json()
-                status = status_data['data']['status']
-                
-                if status == 'SUCCEEDED':
-                    # Get results
-                    dataset_id = status_data['data']['defaultDatasetId']
-                    results_url = f"{self.base_url}/datasets/{dataset_id}/items"
-                    results_response = requests.get(results_url, headers=headers)
-                    return results_response.json()
-                
-                elif status in ['FAILED', 'ABORTED', 'TIMED-OUT']:
-                    print(f"❌ Actor run failed with status: {status}")
+            while run['status'] not in self.TERMINAL_STATUSES:
+                if time.monotonic() >= deadline:
+                    print("⏰ Timeout waiting for actor results")
                     return None
+                
+                status_response = self.session.get(
+                    status_url, headers=headers, params={'waitForFinish': wait}, timeout=timeout
+                )
+                status_response.raise_for_status()
+                run = status_response.json()['data']
             
-            print("⏰ Timeout waiting for actor results")
-            return None
+            if run['status'] != 'SUCCEEDED':
+                print(f"❌ Actor run failed with status: {run['status']}")
+                return None
             
+            return run['defaultDatasetId']
+        
         except requests.exceptions.RequestException as e:
             print(f"❌ Error running Twitter scraper: {e}")
             return None
     
-    def extract_trending_data(self, tweets):
-        """Extract and structure trending data from tweets"""
-        if not tweets:
-            return {'tweets': [], 'hashtags': [], 'keywords': []}
+    def _iter_dataset(self, dataset_id, page_size=None):
+        """Yield dataset items page by page instead of downloading them in one GET"""
+        url = f"{self.base_url}/datasets/{dataset_id}/items"
+        headers = {'Authorization': f'Bearer {self.api_key}'}
+        page_size = page_size or Config.APIFY_PAGE_SIZE
+        offset = 0
         
-        from collections import Counter
-        import re
-        
-        structured_tweets = []
-        all_hashtags = []
-        all_keywords = []
-        
-        for tweet in tweets:
-            # Extract basic info
-            structured_tweets.append({
-                'text': tweet.get('text', ''),
-                'username': tweet.get('author', {}).get('userName', ''),
-                'name': tweet.get('author', {}).get('name', ''),
-                'likes': tweet.get('likeCount', 0),
-                'retweets': tweet.get('retweetCount', 0),
-                'replies': tweet.get('replyCount', 0),
-                'views': tweet.get('viewCount', 0),
-                'url': tweet.get('url', ''),
-                'created': tweet.get('createdAt', ''),
-                'media': tweet.get('media', [])
-            })
+        while True:
+            response = self.session.get(
+                url, headers=headers, params={'offset': offset, 'limit': page_size, 'clean': 'true', 'format': 'json'}
+            )
+            response.raise_for_status()
+            page = response.json()
             
-            # Extract hashtags
-            text = tweet.get('text', '')
-            hashtags = re.findall(r'#\w+', text)
-            all_hashtags.extend([h.lower() for h in hashtags])
+            yield from page
             
-            # Extract keywords (simple word extraction)
-            words = re.findall(r'\b[a-zA-Z]{4,}\b', text.lower())
-            all_keywords.extend(words)
+            if len(page) < page_size:
+                return
+            offset += page_size
+    
+    def extract_trending_data(self, tweets, top_n=20):
+        """
+        Extract and structure trending data from tweets
+        
+        tweets may be a list or a generator (e.g. iter_search_tweets); it is read
+        once, keeping only the top_n tweets and the running counts in memory.
+        """
+        if not tweets:
+            return {'tweets': [], 'hashtags': [], 'keywords': []}
         
-        # Count frequencies
-        hashtag_counts = Counter(all_hashtags)
-        keyword_counts = Counter(all_keywords)
+        classifier = default_classifier()
+        top_tweets = []  # Min-heap of (engagement, -arrival, tweet)
+        totals = {'engagement': 0}
+        
+        def texts():
+            for arrival, tweet in enumerate(tweets):
+                # Extract basic info
+                structured = {
+                    'text': tweet.get('text', ''),
+                    'username': tweet.get('author', {}).get('userName', ''),
+                    'name': tweet.get('author', {}).get('name', ''),
+                    'likes': tweet.get('likeCount', 0),
+                    'retweets': tweet.get('retweetCount', 0),
+                    'replies': tweet.get('replyCount', 0),
+                    'views': tweet.get('viewCount', 0),
+                    'url': tweet.get('url', ''),
+                    'created': tweet.get('createdAt', ''),
+                    'media': tweet.get('media', [])
+                }
+                structured['niches'] = classifier.classify(structured['text'])
+                totals['engagement'] += structured['likes'] + structured['retweets'] + structured['replies']
+                
+                entry = (structured['likes'] + structured['retweets'], -arrival, structured)
+                if len(top_tweets) < top_n:
+                    heapq.heappush(top_tweets, entry)
+                elif entry[:2] > top_tweets[0][:2]:
+                    heapq.heapreplace(top_tweets, entry)
+                
+                yield structured['text']
+        
+        # Count keyword and hashtag frequencies while streaming through the tweets
+        keyword_counts, hashtag_counts = tokenizer.count_tokens(texts())
         
         return {
-            'tweets': sorted(structured_tweets, key=lambda x: x['likes'] + x['retweets'], reverse=True)[:20],
+            'tweets': [entry[2] for entry in sorted(top_tweets, key=lambda e: e[:2], reverse=True)],
             'top_hashtags': [{'hashtag': k, 'count': v} for k, v in hashtag_counts.most_common(15)],
             'top_keywords': [{'keyword': k, 'count': v} for k, v in keyword_counts.most_common(15)],
-            'total_engagement': sum(t['likes'] + t['retweets'] + t['replies'] for t in structured_tweets)
+            'total_engagement': totals['engagement']
         }
 
-
 if __name__ == '__main__':
     collector = TwitterApifyCollector()
     print("="*60)
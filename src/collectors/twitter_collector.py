@@ -6,10 +6,13 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config import Config
+from src.http_client import call_actor
 
 class TwitterCollector:
     """Collect data from Twitter/X via Apify"""
     
+    ACTOR_ID = "apidojo/tweet-scraper"
+    
     def __init__(self):
         self.client = ApifyClient(Config.APIFY_TOKEN)
     
@@ -17,6 +20,16 @@ class TwitterCollector:
         """
         Search for tweets by query/keywords
         
+        Args:
+            query: Search query (keywords, hashtags, @mentions)
+            max_tweets: Maximum number of tweets to fetch (default: 50)
+        """
+        return list(self.iter_search_tweets(query, max_tweets))
+    
+    def iter_search_tweets(self, query, max_tweets=50):
+        """
+        Search for tweets by query/keywords, yielding them as they stream from the dataset
+        
         Args:
             query: Search query (keywords, hashtags, @mentions)
             max_tweets: Maximum number of tweets to fetch (default: 50)
@@ -30,23 +43,28 @@ class TwitterCollector:
         
         try:
             print(f"🔍 Starting Twitter search for '{query}'...")
-            run = self.client.actor("apidojo/tweet-scraper").call(run_input=run_input)
-            
-            # Fetch results
-            items = []
-            for item in self.client.dataset(run["defaultDatasetId"]).iterate_items():
-                items.append(item)
-            
-            return items
+            run = call_actor(self.client, self.ACTOR_ID, run_input)
             
+            # Stream results
+            yield from self.client.dataset(run["defaultDatasetId"]).iterate_items()
+        
         except Exception as e:
             print(f"❌ Error scraping Twitter: {e}")
-            return []
     
     def get_user_tweets(self, username, max_tweets=50):
         """
         Get tweets from a specific user
         
+        Args:
+            username: Twitter username (without @)
+            max_tweets: Maximum number of tweets to fetch
+        """
+        return list(self.iter_user_tweets(username, max_tweets))
+    
+    def iter_user_tweets(self, username, max_tweets=50):
+        """
+        Get tweets from a specific user, yielding them as they stream from the dataset
+        
         Args:
             username: Twitter username (without @)
             max_tweets: Maximum number of tweets to fetch
@@ -59,17 +77,12 @@ class TwitterCollector:
         
         try:
             print(f"🔍 Fetching tweets from @{username}...")
-            run = self.client.actor("apidojo/tweet-scraper").call(run_input=run_input)
-            
-            items = []
-            for item in self.client.dataset(run["defaultDatasetId"]).iterate_items():
-                items.append(item)
-            
-            return items
+            run = call_actor(self.client, self.ACTOR_ID, run_input)
             
+            yield from self.client.dataset(run["defaultDatasetId"]).iterate_items()
+        
         except Exception as e:
             print(f"❌ Error fetching user tweets: {e}")
-            return []
     
     def get_trending_tweets(self, hashtag, max_tweets=50):
         """
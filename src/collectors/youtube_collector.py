@@ -6,6 +6,7 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 from config import Config
+from src.http_client import get_session
 
 class YouTubeCollector:
     """Collect data from YouTube Data API"""
@@ -13,6 +14,7 @@ class YouTubeCollector:
     def __init__(self):
         self.api_key = Config.YOUTUBE_API_KEY
         self.base_url = Config.YOUTUBE_API_BASE
+        self.session = get_session()
     
     def get_trending_videos(self, region_code='US', max_results=10):
         """Fetch trending videos"""
@@ -26,31 +28,127 @@ class YouTubeCollector:
         }
         
         try:
-            response = requests.get(url, params=params)
+            response = self.session.get(url, params=params)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
             print(f"❌ Error fetching YouTube data: {e}")
             return None
     
-    def search_videos(self, query, max_results=25):
-        """Search videos by keyword"""
+    def _search_pages(self, params, max_results):
+        """
+        Yield search.list pages until max_results items or the last page
+        
+        Raises requests.exceptions.RequestException on failure.
+        """
         url = f"{self.base_url}/search"
+        remaining = max_results
+        page_token = None
+        
+        while remaining > 0:
+            page_params = dict(params, maxResults=min(remaining, Config.YOUTUBE_PAGE_SIZE), key=self.api_key)
+            if page_token:
+                page_params['pageToken'] = page_token
+            
+            response = self.session.get(url, params=page_params)
+            response.raise_for_status()
+            page = response.json()
+            page['items'] = page.get('items', [])[:remaining]
+            yield page
+            
+            remaining -= len(page['items'])
+            page_token = page.get('nextPageToken')
+            if not page_token or not page['items']:
+                return
+    
+    def search_videos(self, query, max_results=25):
+        """Search videos by keyword (more than 50 results follows nextPageToken)"""
         params = {
             'part': 'snippet',
             'q': query,
-            'type': 'video',
-            'maxResults': max_results,
-            'key': self.api_key
+            'type': 'video'
         }
         
         try:
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            return response.json()
+            pages = list(self._search_pages(params, max_results))
         except requests.exceptions.RequestException as e:
             print(f"❌ Error searching YouTube: {e}")
             return None
+        
+        # One response shaped like a single page, with every page's items
+        result = pages[0] if pages else {}  # max_results=0 fetches no page
+        result['items'] = [item for page in pages for item in page['items']]
+        result.pop('nextPageToken', None)
+        return result
+    
+    def search_video_ids(self, query, max_results=50, **params):
+        """
+        Page through search results and return the unique video IDs, in rank order
+        
+        Only the `id` part is requested; snippets come with the statistics from
+        get_videos(). Extra search.list parameters (order, publishedAfter, ...)
+        are passed through.
+        """
+        params = dict(params, part='id', q=query, type='video')
+        video_ids = []
+        
+        try:
+            for page in self._search_pages(params, max_results):
+                video_ids.extend(item['id']['videoId'] for item in page['items'] if 'videoId' in item.get('id', {}))
+        except requests.exceptions.RequestException as e:
+            print(f"❌ Error searching YouTube: {e}")
+        
+        return list(dict.fromkeys(video_ids))
+    
+    def get_videos(self, video_ids, part='snippet,statistics'):
+        """
+        Fetch videos by ID with batched videos.list calls (50 IDs per call, 1 quota unit each)
+        
+        Returns the items in video_ids order; videos that no longer exist are skipped.
+        """
+        url = f"{self.base_url}/videos"
+        video_ids = list(video_ids)
+        found = {}
+        
+        for start in range(0, len(video_ids), Config.YOUTUBE_PAGE_SIZE):
+            params = {
+                'part': part,
+                'id': ','.join(video_ids[start:start + Config.YOUTUBE_PAGE_SIZE]),
+                'key': self.api_key
+            }
+            
+            try:
+                response = self.session.get(url, params=params)
+                response.raise_for_status()
+            except requests.exceptions.RequestException as e:
+                print(f"❌ Error fetching YouTube videos: {e}")
+                continue
+            
+            for item in response.json().get('items', []):
+                found[item['id']] = item
+        
+        return [found[video_id] for video_id in video_ids if video_id in found]
+    
+    def search_videos_with_stats(self, query, max_results=50, **params):
+        """
+        Search, then fetch statistics for every hit in batches
+        
+        A search page costs 100 quota units and a videos.list batch of 50 costs 1,
+        so full statistics add about 1% to the cost of the search itself, instead of
+        one videos call per hit. Returns {'items': [...]} in the videos.list shape
+        of get_trending_videos().
+        """
+        return {'items': self.get_videos(self.search_video_ids(query, max_results, **params))}
+    
+    def search_niche_videos(self, keywords, max_results=50, **params):
+        """
+        Search one niche with a single query that ORs its keywords and phrases
+        
+        One search covers the whole niche, so the quota cost grows with the
+        number of niches rather than the number of keywords.
+        """
+        query = ' | '.join(f'"{keyword}"' if ' ' in keyword else keyword for keyword in keywords)
+        return self.search_videos_with_stats(query, max_results, **params)
 
 # Test the collector
 if __name__ == '__main__':
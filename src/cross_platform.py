@@ -0,0 +1,114 @@
+import heapq
+import math
+from typing import Any, Dict, Iterable, List, Mapping
+
+from src import tokenizer
+from src.records import ContentRecord
+
+# Record fields that add up to a post's engagement, per platform
+ENGAGEMENT_FIELDS = {
+    'youtube': ('likes', 'comments'),
+    'reddit': ('score', 'comments'),
+    'hackernews': ('score', 'comments'),
+}
+
+# Roadmap trending score weights
+VELOCITY_WEIGHT = 3
+VOLUME_WEIGHT = 2
+PLATFORM_WEIGHT = 2
+ENGAGEMENT_WEIGHT = 1
+
+
+def item_engagement(platform: str, item: ContentRecord) -> float:
+    return float(sum(getattr(item, field) or 0 for field in ENGAGEMENT_FIELDS.get(platform, ())))
+
+
+class CrossPlatformIndex:
+    """
+    Inverted index from keyword to per-platform mentions and engagement
+    
+    Every title is tokenized once and each keyword (hashtag bodies included)
+    maps to {platform: [mentions, engagement]}. Engagement is normalized per
+    platform (item engagement / the platform's mean), so a YouTube like and a
+    Hacker News point weigh the same on average. Ranking then makes one pass
+    over the unique keywords instead of comparing platforms pairwise.
+    """
+    
+    def __init__(self):
+        self.index: Dict[str, Dict[str, List[float]]] = {}
+    
+    def __len__(self):
+        return len(self.index)
+    
+    def add_items(self, platform: str, items: Iterable[ContentRecord]):
+        """Index one platform's items"""
+        items = list(items)
+        if not items:
+            return
+        
+        engagements = [item_engagement(platform, item) for item in items]
+        mean = sum(engagements) / len(engagements)
+        
+        for item, engagement in zip(items, engagements):
+            weight = engagement / mean if mean > 0 else 0.0
+            keywords = item.keywords if item.keywords is not None else tokenizer.extract_keywords(item.title)
+            for keyword in keywords:
+                entry = self.index.setdefault(keyword, {}).setdefault(platform, [0, 0.0])
+                entry[0] += 1
+                entry[1] += weight
+    
+    def score(self, keyword: str, previous_mentions: int = 0) -> Dict[str, Any]:
+        """
+        Roadmap trending score for one keyword
+        
+        velocity * 3 + log(volume) * 2 + platform count * 2 + avg engagement, where
+        velocity is mentions now / mentions in the previous run (1.0 when the
+        previous run never saw the keyword).
+        """
+        platforms = self.index[keyword]
+        mentions = sum(entry[0] for entry in platforms.values())
+        engagement = sum(entry[1] for entry in platforms.values()) / mentions
+        velocity = mentions / previous_mentions if previous_mentions else 1.0
+        
+        return {
+            'topic': keyword,
+            'platforms': sorted(platforms),
+            'mentions': mentions,
+            'by_platform': {platform: entry[0] for platform, entry in sorted(platforms.items())},
+            'velocity': round(velocity, 3),
+            'engagement': round(engagement, 3),
+            'score': round(
+                velocity * VELOCITY_WEIGHT
+                + math.log(mentions) * VOLUME_WEIGHT
+                + len(platforms) * PLATFORM_WEIGHT
+                + engagement * ENGAGEMENT_WEIGHT,
+                3
+            )
+        }
+    
+    def top(self, n: int = 20, previous_counts: Mapping[str, int] = None,
+            min_platforms: int = 2) -> List[Dict[str, Any]]:
+        """
+        Top-n keywords seen on at least min_platforms platforms, highest score first
+        
+        Args:
+            n: Number of trends to return
+            previous_counts: {keyword: mentions} from the previous run, for velocity
+            min_platforms: Minimum number of platforms a keyword must appear on
+        """
+        previous_counts = previous_counts or {}
+        candidates = (
+            self.score(keyword, previous_counts.get(keyword, 0))
+            for keyword, platforms in self.index.items()
+            if len(platforms) >= min_platforms
+        )
+        return heapq.nlargest(n, candidates, key=lambda trend: trend['score'])
+
+
+def detect_cross_platform_trends(items: Dict[str, List[ContentRecord]], previous_counts: Mapping[str, int] = None,
+                                 n: int = 20, min_platforms: int = 2) -> List[Dict[str, Any]]:
+    """Convenience wrapper: {platform: [items]} in, top-n cross-platform trends out"""
+    index = CrossPlatformIndex()
+    for platform, platform_items in items.items():
+        index.add_items(platform, platform_items)
+    return index.top(n, previous_counts, min_platforms)
@@ -0,0 +1,71 @@
+import json
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Tuple
+
+from config import Config
+from src import sqlite_db
+from src.storage import chunked
+
+
+class HackerNewsItemStore:
+    """
+    Local copy of Hacker News items for incremental sync, persisted in SQLite
+    
+    Each item is kept as the API returned it, with the time it was fetched.
+    HackerNewsCollector uses it to refetch only items that are new, listed in
+    /v0/updates.json, or older than Config.HN_ITEM_MAX_AGE.
+    """
+    
+    def __init__(self, path=None, retention_days: int = 2):
+        self.path = path or Config.HN_ITEM_STORE_PATH
+        self._lock = threading.Lock()
+        
+        self._conn = sqlite_db.connect(
+            self.path,
+            """
+                CREATE TABLE IF NOT EXISTS hn_items (
+                    id INTEGER PRIMARY KEY,
+                    item TEXT NOT NULL,
+                    fetched_at REAL NOT NULL
+                )
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_hn_items_fetched_at ON hn_items (fetched_at)"
+        )
+        self.prune(retention_days * 86400)
+    
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM hn_items").fetchone()[0]
+    
+    def get_many(self, item_ids: Iterable[int]) -> Dict[int, Tuple[Dict[str, Any], float]]:
+        """{id: (item, fetched_at)} for the stored items among item_ids"""
+        found = {}
+        with self._lock:
+            for chunk in chunked(list(item_ids)):
+                rows = self._conn.execute(
+                    f"SELECT id, item, fetched_at FROM hn_items WHERE id IN ({', '.join('?' * len(chunk))})",
+                    chunk
+                )
+                for item_id, item, fetched_at in rows:
+                    found[item_id] = (json.loads(item), fetched_at)
+        return found
+    
+    def put_many(self, items: List[Dict[str, Any]], fetched_at: float = None):
+        """Insert or replace items fetched at fetched_at (default: now)"""
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO hn_items (id, item, fetched_at) VALUES (?, ?, ?)",
+                [(item['id'], json.dumps(item, ensure_ascii=False), fetched_at) for item in items if 'id' in item]
+            )
+            self._conn.commit()
+    
+    def prune(self, max_age: float) -> int:
+        """Drop items not fetched for max_age seconds (they have left every list we read)"""
+        with self._lock:
+            deleted = self._conn.execute(
+                "DELETE FROM hn_items WHERE fetched_at < ?", (time.time() - max_age,)
+            ).rowcount
+            self._conn.commit()
+        return deleted
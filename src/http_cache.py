@@ -0,0 +1,158 @@
+import hashlib
+import json
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from config import Config
+from src import sqlite_db
+
+
+class ResponseCache:
+    """
+    On-disk (SQLite) cache for GET responses
+    
+    - TTL per endpoint, looked up by the longest matching `host/path` prefix
+      in Config.HTTP_CACHE_TTLS; endpoints without a rule are never cached
+    - Expired entries are revalidated with If-None-Match / If-Modified-Since
+      when the server sent an ETag or Last-Modified header
+    - Expired entries are served stale when the network or the API fails
+    - Least recently used entries are evicted once the cache exceeds max_bytes
+    """
+    
+    # Response headers worth replaying from the cache
+    STORED_HEADERS = ('Content-Type', 'Content-Encoding', 'ETag', 'Last-Modified', 'Date')
+    
+    def __init__(self, path=None, ttls=None, max_bytes=None):
+        self.path = path or Config.HTTP_CACHE_PATH
+        self.ttls = Config.HTTP_CACHE_TTLS if ttls is None else ttls
+        self.max_bytes = max_bytes or Config.HTTP_CACHE_MAX_BYTES
+        self.counters = {'hits': 0, 'misses': 0, 'revalidated': 0, 'stale_served': 0, 'evictions': 0}
+        self._lock = threading.Lock()
+        
+        self._conn = sqlite_db.connect(
+            self.path,
+            """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    endpoint TEXT NOT NULL,
+                    headers TEXT NOT NULL,
+                    body BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    stored_at REAL NOT NULL,
+                    expires_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses (last_access)"
+        )
+    
+    def ttl_for(self, url):
+        """Return the TTL in seconds for a URL, or None if it should not be cached"""
+        parts = urlsplit(url)
+        target = f"{parts.netloc}{parts.path}"
+        
+        best = None
+        for prefix, ttl in self.ttls.items():
+            if target.startswith(prefix) and (best is None or len(prefix) > len(best)):
+                best = prefix
+        
+        return self.ttls[best] if best is not None else None
+    
+    @staticmethod
+    def make_key(url, params=None):
+        """Cache key for a GET request (hashed, so API keys in the query are not stored)"""
+        prepared = requests.Request('GET', url, params=params).prepare()
+        return hashlib.sha256(prepared.url.encode('utf-8')).hexdigest()
+    
+    def get(self, key):
+        """Return the cached entry for key (fresh or expired), or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT headers, body, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            
+            if row is None:
+                return None
+            
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+        
+        headers, body, expires_at = row
+        return {
+            'headers': json.loads(headers),
+            'body': body,
+            'fresh': expires_at > time.time()
+        }
+    
+    def store(self, key, url, response, ttl):
+        """Store a 200 response and evict LRU entries if the cache grew too large"""
+        headers = {h: response.headers[h] for h in self.STORED_HEADERS if h in response.headers}
+        # requests has already decoded the body, so don't replay the transfer encoding
+        headers.pop('Content-Encoding', None)
+        body = response.content
+        now = time.time()
+        parts = urlsplit(url)
+        
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, f"{parts.netloc}{parts.path}", json.dumps(headers), body, len(body), now, now + ttl, now)
+            )
+            self._evict()
+            self._conn.commit()
+    
+    def refresh(self, key, ttl):
+        """Extend an entry's lifetime after a 304 Not Modified"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE responses SET expires_at = ?, last_access = ? WHERE key = ?", (now + ttl, now, key)
+            )
+            self._conn.commit()
+    
+    def _evict(self):
+        """Delete least recently used entries until the cache fits in max_bytes"""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY last_access").fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            self.counters['evictions'] += 1
+    
+    def record(self, counter):
+        with self._lock:
+            self.counters[counter] += 1
+    
+    def stats(self):
+        """Counters since process start plus current cache size"""
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+            stats = dict(self.counters)
+        
+        lookups = stats['hits'] + stats['misses'] + stats['revalidated'] + stats['stale_served']
+        stats['hit_rate'] = round((stats['hits'] + stats['revalidated']) / lookups, 3) if lookups else 0.0
+        stats['entries'] = entries
+        stats['size_bytes'] = size
+        return stats
+    
+    @staticmethod
+    def to_response(url, entry):
+        """Rebuild a requests.Response from a cache entry"""
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = 'OK'
+        response.url = url
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response._content = entry['body']
+        response.from_cache = True
+        return response
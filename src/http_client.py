@@ -0,0 +1,205 @@
+import random
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from config import Config
+from src.http_cache import ResponseCache
+from src.rate_limit import QuotaExceeded, QuotaLedger, RateLimiter
+
+
+class JitteredRetry(Retry):
+    """
+    urllib3 Retry policy that adds random jitter to the exponential backoff
+    
+    Retry-After waits are capped at Config.HTTP_MAX_RETRY_AFTER, so a server asking
+    for an hour-long pause cannot stall a collection run (and its stage thread).
+    
+    With an admit(method, url) callback, each retry is admitted like a first
+    attempt (see TransportSession.admit) once its backoff wait is over, so it
+    is charged to the quota ledger and waits for its token bucket too.
+    """
+    
+    DEFAULT_PORTS = {'http': 80, 'https': 443}
+    
+    def __init__(self, *args, admit=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.admit = admit
+        self.pending = None  # (method, url) of the retry to admit after sleeping
+    
+    def new(self, **kwargs):
+        retry = super().new(**kwargs)
+        retry.admit = self.admit
+        return retry
+    
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        retry = super().increment(method, url, response=response, error=error, _pool=_pool, _stacktrace=_stacktrace)
+        
+        # urllib3 passes the path; rebuild the URL the way requests prepared it
+        if _pool is not None:
+            host = _pool.host
+            if _pool.port not in (None, self.DEFAULT_PORTS.get(_pool.scheme)):
+                host = f"{host}:{_pool.port}"
+            url = f"{_pool.scheme}://{host}{url}"
+        retry.pending = (method, url)
+        return retry
+    
+    def get_backoff_time(self):
+        backoff = super().get_backoff_time()
+        if backoff <= 0:
+            return backoff
+        return backoff + random.uniform(0, Config.HTTP_BACKOFF_JITTER)
+    
+    def parse_retry_after(self, retry_after):
+        return min(super().parse_retry_after(retry_after), Config.HTTP_MAX_RETRY_AFTER)
+    
+    def sleep(self, response=None):
+        super().sleep(response)
+        if self.admit is not None and self.pending is not None:
+            self.admit(*self.pending)
+
+
+class TransportSession(requests.Session):
+    """
+    requests.Session with keep-alive pools, default timeouts and retries
+    
+    - One connection pool per host (pool_maxsize connections each), so TLS
+      handshakes are paid once per connection instead of once per call
+    - Default (connect, read) timeout on every request unless the caller passes one
+    - Retries with exponential backoff + jitter on connection errors, 429 and 5xx,
+      honouring Retry-After headers
+    - gzip/deflate is negotiated by requests' default Accept-Encoding header
+    - GETs to endpoints with a TTL in Config.HTTP_CACHE_TTLS go through the
+      on-disk ResponseCache (pass cache_ttl=0 to bypass it for one call)
+    - Requests that reach the network, and each of their retries, wait for their
+      platform's token bucket and are charged to the QuotaLedger; cache hits cost nothing
+    """
+    
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+    
+    def __init__(self, timeout=None, max_retries=None, pool_maxsize=None, cache=None, limiter=None, ledger=None):
+        super().__init__()
+        self.timeout = timeout or (Config.HTTP_CONNECT_TIMEOUT, Config.HTTP_READ_TIMEOUT)
+        self.cache = cache
+        self.limiter = limiter
+        self.ledger = ledger
+        
+        retry = JitteredRetry(
+            total=Config.HTTP_MAX_RETRIES if max_retries is None else max_retries,
+            backoff_factor=Config.HTTP_BACKOFF_FACTOR,
+            status_forcelist=self.RETRY_STATUSES,
+            respect_retry_after_header=True,
+            raise_on_status=False,  # Hand the last response back so raise_for_status() reports it
+            admit=self.admit
+        )
+        adapter = HTTPAdapter(
+            pool_connections=Config.HTTP_POOL_CONNECTIONS,
+            pool_maxsize=pool_maxsize or Config.HTTP_POOL_MAXSIZE,
+            max_retries=retry
+        )
+        self.mount('https://', adapter)
+        self.mount('http://', adapter)
+    
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        cache_ttl = kwargs.pop('cache_ttl', None)
+        
+        if self.cache is not None and method.upper() == 'GET':
+            ttl = self.cache.ttl_for(url) if cache_ttl is None else cache_ttl
+            if ttl:
+                return self._cached_get(url, ttl, **kwargs)
+        
+        return super().request(method, url, **kwargs)
+    
+    def send(self, request, **kwargs):
+        self.admit(request.method, request.url)
+        try:
+            return super().send(request, **kwargs)
+        except requests.exceptions.ConnectionError as e:
+            # HTTPAdapter wraps a retry refused by admit() as a connection error; raise the refusal itself
+            if e.args and isinstance(e.args[0], QuotaExceeded):
+                raise e.args[0] from None
+            raise
+    
+    def admit(self, method, url):
+        """
+        Charge a request to the QuotaLedger and wait for its platform's token bucket
+        
+        Runs before every attempt, retries included (see JitteredRetry). Raises
+        QuotaExceeded if the call would overrun today's quota. Clients that make
+        their own HTTP calls (ApifyClient) admit their requests here too.
+        """
+        # Charge before waiting so a refused call doesn't hold a rate limit slot
+        if self.ledger is not None:
+            self.ledger.charge_request(method, url)
+        if self.limiter is not None:
+            self.limiter.acquire(url)
+    
+    def _cached_get(self, url, ttl, params=None, headers=None, **kwargs):
+        """GET through the response cache with conditional revalidation"""
+        key = self.cache.make_key(url, params)
+        entry = self.cache.get(key)
+        full_url = requests.Request('GET', url, params=params).prepare().url
+        
+        if entry and entry['fresh']:
+            self.cache.record('hits')
+            return self.cache.to_response(full_url, entry)
+        
+        headers = dict(headers or {})
+        if entry:
+            if 'ETag' in entry['headers']:
+                headers['If-None-Match'] = entry['headers']['ETag']
+            if 'Last-Modified' in entry['headers']:
+                headers['If-Modified-Since'] = entry['headers']['Last-Modified']
+        
+        try:
+            response = super().request('GET', url, params=params, headers=headers, **kwargs)
+        except requests.exceptions.RequestException:
+            if entry:
+                self.cache.record('stale_served')
+                return self.cache.to_response(full_url, entry)
+            raise
+        
+        if response.status_code == 304 and entry:
+            self.cache.refresh(key, ttl)
+            self.cache.record('revalidated')
+            return self.cache.to_response(full_url, entry)
+        
+        if response.status_code == 200:
+            self.cache.store(key, url, response, ttl)
+        elif entry and (response.status_code == 429 or response.status_code >= 500):
+            self.cache.record('stale_served')
+            return self.cache.to_response(full_url, entry)
+        
+        self.cache.record('misses')
+        return response
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Return the process-wide TransportSession shared by all collectors"""
+    global _session
+    
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                cache = ResponseCache() if Config.HTTP_CACHE_ENABLED else None
+                limiter = RateLimiter() if Config.RATE_LIMIT_ENABLED else None
+                _session = TransportSession(cache=cache, limiter=limiter, ledger=QuotaLedger())
+    
+    return _session
+
+
+def call_actor(client, actor_id, run_input):
+    """
+    Start an Apify actor run with an ApifyClient and wait for it to finish
+    
+    ApifyClient talks to Apify outside the shared session, so the run is admitted
+    through it first: charged to the quota ledger and rate limited like any
+    other Apify request.
+    """
+    get_session().admit('POST', f"{Config.APIFY_API_BASE}/acts/{actor_id.replace('/', '~')}/runs")
+    return client.actor(actor_id).call(run_input=run_input)
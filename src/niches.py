@@ -0,0 +1,102 @@
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Mapping
+
+from config import Config
+
+# Words are matched whole, so 'ai' never matches inside 'rain'
+WORD_PATTERN = re.compile(r'\w+')
+
+
+class NicheClassifier:
+    """
+    Tags text with every niche whose keywords or phrases it contains
+    
+    All niche keyword lists are compiled into one Aho-Corasick automaton over
+    words (not characters), so multi-word phrases like "machine learning" match
+    on word boundaries and a text is classified in a single left-to-right pass.
+    The cost per text depends on its length, not on how many niches or
+    keywords there are.
+    """
+    
+    def __init__(self, niches: Mapping[str, Iterable[str]] = None):
+        niches = Config.NICHES if niches is None else niches
+        self.niches = list(niches)
+        
+        # State 0 is the root; each state has word transitions, a failure link
+        # and the set of niches whose patterns end there
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[frozenset] = [frozenset()]
+        
+        for niche, keywords in niches.items():
+            for keyword in keywords:
+                self._add(WORD_PATTERN.findall(keyword.lower()), niche)
+        
+        self._link()
+    
+    def _add(self, words: List[str], niche: str):
+        if not words:
+            return
+        
+        state = 0
+        for word in words:
+            if word not in self._goto[state]:
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(frozenset())
+                self._goto[state][word] = len(self._goto) - 1
+            state = self._goto[state][word]
+        self._out[state] = self._out[state] | {niche}
+    
+    def _link(self):
+        """Breadth-first pass setting failure links and merging outputs along them"""
+        queue = list(self._goto[0].values())  # Depth-1 states fail to the root
+        for state in queue:
+            for word, child in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback and word not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(word, 0)
+                self._out[child] = self._out[child] | self._out[self._fail[child]]
+                queue.append(child)
+    
+    def classify(self, text: str) -> List[str]:
+        """Niches matched anywhere in text, in configuration order"""
+        if not text:
+            return []
+        
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set()
+        state = 0
+        
+        for word in WORD_PATTERN.findall(text.lower()):
+            while state and word not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(word, 0)
+            if out[state]:
+                found |= out[state]
+        
+        return [niche for niche in self.niches if niche in found]
+    
+    def classify_fields(self, values: Iterable[Any]) -> List[str]:
+        """
+        Niches matched by any of several text fields, in configuration order
+        
+        Every value, and every element of list values such as YouTube tags, is
+        scanned on its own so a phrase never spans two of them.
+        """
+        matched = set()
+        for value in values:
+            if isinstance(value, (list, tuple)):
+                for text in value:
+                    matched.update(self.classify(str(text)))
+            elif value:
+                matched.update(self.classify(str(value)))
+        return [niche for niche in self.niches if niche in matched]
+
+
+@lru_cache(maxsize=1)
+def default_classifier() -> NicheClassifier:
+    """Classifier built from Config.NICHES, shared by every caller"""
+    return NicheClassifier()
@@ -0,0 +1,202 @@
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+
+from config import Config
+from src import sqlite_db
+
+
+class QuotaExceeded(requests.exceptions.RequestException):
+    """Raised instead of sending a request that would overrun a platform's daily quota"""
+
+
+def platform_for(url: str) -> Optional[str]:
+    """Platform name for a request URL (Config.API_HOSTS), or None for unknown hosts"""
+    return Config.API_HOSTS.get(urlsplit(url).netloc)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket
+    
+    Holds up to `capacity` tokens and refills at `rate` tokens per second, so
+    bursts of up to `capacity` calls go out at once and sustained traffic is
+    smoothed to `rate` calls per second.
+    """
+    
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+    
+    def acquire(self, tokens: float = 1) -> float:
+        """Block until `tokens` are available and take them; returns the seconds waited"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return waited
+                delay = (tokens - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class RateLimiter:
+    """One TokenBucket per platform, configured by Config.RATE_LIMITS"""
+    
+    def __init__(self, limits: Dict[str, Tuple[float, float]] = None):
+        limits = Config.RATE_LIMITS if limits is None else limits
+        self.buckets = {platform: TokenBucket(rate, burst) for platform, (rate, burst) in limits.items()}
+    
+    def acquire(self, url: str) -> float:
+        """Wait for a slot on the URL's platform (no-op for unlimited hosts)"""
+        bucket = self.buckets.get(platform_for(url))
+        return bucket.acquire() if bucket is not None else 0.0
+
+
+class QuotaLedger:
+    """
+    Daily API quota accounting, persisted in SQLite
+    
+    - Cost units per endpoint are looked up by the longest matching `host/path`
+      prefix in Config.QUOTA_COSTS (YouTube search.list = 100, videos.list = 1,
+      one SerpApi search = 1, one Apify actor run = 1); other endpoints are free
+    - Spent units are summed per UTC day, platform and endpoint
+    - charge() refuses calls that would exceed Config.DAILY_QUOTAS by raising
+      QuotaExceeded; platforms without a quota are recorded but never refused
+    """
+    
+    def __init__(self, path=None, costs=None, quotas=None):
+        self.path = path or Config.QUOTA_LEDGER_PATH
+        self.costs = Config.QUOTA_COSTS if costs is None else costs
+        self.quotas = Config.DAILY_QUOTAS if quotas is None else quotas
+        self._lock = threading.Lock()
+        
+        self._conn = sqlite_db.connect(
+            self.path,
+            """
+                CREATE TABLE IF NOT EXISTS quota_usage (
+                    day TEXT NOT NULL,
+                    platform TEXT NOT NULL,
+                    endpoint TEXT NOT NULL,
+                    calls INTEGER NOT NULL,
+                    units INTEGER NOT NULL,
+                    PRIMARY KEY (day, platform, endpoint)
+                )
+            """
+        )
+    
+    @staticmethod
+    def today() -> str:
+        return datetime.now(timezone.utc).date().isoformat()
+    
+    def cost_for(self, method: str, url: str) -> Tuple[Optional[str], str, int]:
+        """Return (platform, endpoint, units) for a request; units is 0 for free endpoints"""
+        parts = urlsplit(url)
+        target = f"{parts.netloc}{parts.path}"
+        
+        best = None
+        for prefix in self.costs:
+            if target.startswith(prefix) and (best is None or len(prefix) > len(best)):
+                best = prefix
+        
+        # Apify only bills for starting actor runs, not for polling or reading datasets
+        if best is None or (Config.API_HOSTS.get(parts.netloc) == 'apify' and method.upper() != 'POST'):
+            return platform_for(url), target, 0
+        return platform_for(url), best, self.costs[best]
+    
+    def used(self, platform: str, day: str = None) -> int:
+        """Units spent on a platform on a UTC day (default: today)"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COALESCE(SUM(units), 0) FROM quota_usage WHERE day = ? AND platform = ?",
+                (day or self.today(), platform)
+            ).fetchone()[0]
+    
+    def remaining(self, platform: str) -> Optional[int]:
+        """Units left today, or None if the platform has no quota"""
+        limit = self.quotas.get(platform)
+        if not limit:
+            return None
+        return max(limit - self.used(platform), 0)
+    
+    def charge(self, platform: str, endpoint: str, units: int):
+        """Record `units` spent, raising QuotaExceeded if that would overrun today's quota"""
+        if units <= 0 or platform is None:
+            return
+        
+        day = self.today()
+        limit = self.quotas.get(platform)
+        
+        with self._lock:
+            if limit:
+                spent = self._conn.execute(
+                    "SELECT COALESCE(SUM(units), 0) FROM quota_usage WHERE day = ? AND platform = ?",
+                    (day, platform)
+                ).fetchone()[0]
+                if spent + units > limit:
+                    raise QuotaExceeded(
+                        f"{platform} quota exhausted: {spent}/{limit} units used today, {endpoint} costs {units}"
+                    )
+            
+            self._conn.execute("""
+                INSERT INTO quota_usage (day, platform, endpoint, calls, units) VALUES (?, ?, ?, 1, ?)
+                ON CONFLICT (day, platform, endpoint) DO UPDATE
+                SET calls = calls + 1, units = units + excluded.units
+            """, (day, platform, endpoint, units))
+            self._conn.commit()
+    
+    def charge_request(self, method: str, url: str):
+        """Charge the cost of one HTTP request"""
+        self.charge(*self.cost_for(method, url))
+    
+    def usage(self, day: str = None) -> Dict[str, Dict[str, Optional[int]]]:
+        """{platform: {'calls', 'units', 'limit', 'remaining'}} for a UTC day (default: today)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT platform, SUM(calls), SUM(units) FROM quota_usage WHERE day = ? GROUP BY platform",
+                (day or self.today(),)
+            ).fetchall()
+        
+        usage = {}
+        for platform, calls, units in rows:
+            limit = self.quotas.get(platform) or None
+            usage[platform] = {
+                'calls': calls,
+                'units': units,
+                'limit': limit,
+                'remaining': max(limit - units, 0) if limit else None
+            }
+        return usage
+    
+    def preflight(self, planned: Dict[str, int]) -> Dict[str, Dict[str, Optional[int]]]:
+        """
+        Compare a run's planned units per platform with what is left today
+        
+        Returns {platform: {'planned', 'used', 'limit', 'remaining', 'ok'}}.
+        """
+        report = {}
+        for platform, units in planned.items():
+            limit = self.quotas.get(platform) or None
+            used = self.used(platform)
+            report[platform] = {
+                'planned': units,
+                'used': used,
+                'limit': limit,
+                'remaining': max(limit - used, 0) if limit else None,
+                'ok': limit is None or used + units <= limit
+            }
+        return report
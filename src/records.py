@@ -0,0 +1,150 @@
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Sequence
+
+# Names the records are exported under (JSON results, snapshot columns) where
+# they differ per platform: {platform: {exported name: record attribute}}
+FIELD_NAMES = {
+    'youtube': {'channel': 'source'},
+    'reddit': {'subreddit': 'source', 'created': 'published'},
+    'hackernews': {'time': 'published'},
+}
+
+# Exported fields per platform, in the order the results have always listed them
+EXPORT_FIELDS = {
+    'youtube': ['id', 'title', 'channel', 'views', 'likes', 'comments', 'published', 'tags', 'niches'],
+    'reddit': ['id', 'title', 'subreddit', 'score', 'comments', 'url', 'author', 'created', 'niches'],
+    'hackernews': ['id', 'title', 'score', 'comments', 'url', 'author', 'time', 'niches'],
+}
+
+
+class ContentRecord:
+    """
+    One collected post, video or story, in the same shape for every platform
+    
+    Slots instead of a per-item dict keep a record at a fraction of a dict's
+    size, and every stage after decoding (ranking, niche tagging, storage,
+    snapshots) reads plain attributes instead of per-platform .get chains.
+    Counters a platform does not have are None. `source` is the channel or
+    subreddit, and `published` keeps the platform's own timestamp (an ISO
+    8601 string for YouTube, epoch seconds elsewhere). `keywords` and
+    `hashtags` are the title's tokens, None until the record is tokenized.
+    `tags` and `niches` default to the shared empty tuple, so the many records
+    without any cost no list objects of their own.
+    """
+    
+    __slots__ = ('platform', 'id', 'title', 'author', 'url', 'source', 'views', 'likes', 'comments', 'score',
+                 'published', 'tags', 'niches', 'keywords', 'hashtags')
+    
+    def __init__(self, platform: str, id: str, title: str = '', author: str = '', url: str = '',
+                 source: str = '', views: int = None, likes: int = None, comments: int = None,
+                 score: int = None, published: Any = None, tags: Sequence[str] = (), niches: Sequence[str] = ()):
+        self.platform = platform
+        self.id = id
+        self.title = title
+        self.author = author
+        self.url = url
+        self.source = source
+        self.views = views
+        self.likes = likes
+        self.comments = comments
+        self.score = score
+        self.published = published
+        self.tags = tags
+        self.niches = niches
+        self.keywords = None
+        self.hashtags = None
+    
+    def __repr__(self):
+        return f"ContentRecord({self.platform!r}, {self.id!r}, {self.title!r})"
+    
+    def field(self, name: str) -> Any:
+        """Value of an exported field, e.g. 'channel' or 'created'"""
+        return getattr(self, FIELD_NAMES[self.platform].get(name, name))
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """The record as the dict the JSON results list for its platform (tuples as lists, as JSON reads back)"""
+        exported = {}
+        for name in EXPORT_FIELDS[self.platform]:
+            value = self.field(name)
+            exported[name] = list(value) if isinstance(value, tuple) else value
+        return exported
+    
+    @classmethod
+    def from_dict(cls, platform: str, row: Mapping[str, Any]) -> 'ContentRecord':
+        """Rebuild a record from an exported dict or snapshot row (missing fields keep their defaults)"""
+        attributes = {
+            FIELD_NAMES[platform].get(name, name): row[name]
+            for name in EXPORT_FIELDS[platform] if name in row
+        }
+        attributes.setdefault('id', '')
+        return cls(platform, **attributes)
+
+
+def dedupe(records: Iterable[ContentRecord]) -> List[ContentRecord]:
+    """Drop repeats of the same item (platform and ID), keeping the first; records without an ID are kept"""
+    seen = set()
+    unique = []
+    for record in records:
+        if record.id:
+            key = (record.platform, record.id)
+            if key in seen:
+                continue
+            seen.add(key)
+        unique.append(record)
+    return unique
+
+
+def decode_youtube(item: Mapping[str, Any]) -> ContentRecord:
+    """videos.list item (snippet + statistics) to a record"""
+    snippet = item.get('snippet') or {}
+    stats = item.get('statistics') or {}
+    video_id = item.get('id', '')
+    
+    return ContentRecord(
+        'youtube', video_id,
+        title=snippet.get('title', ''),
+        author=snippet.get('channelTitle', ''),
+        url=f"https://www.youtube.com/watch?v={video_id}",
+        source=snippet.get('channelTitle', ''),
+        views=int(stats.get('viewCount', 0)),
+        likes=int(stats.get('likeCount', 0)),
+        comments=int(stats.get('commentCount', 0)),
+        published=snippet.get('publishedAt', ''),
+        tags=tuple((snippet.get('tags') or ())[:5])  # Top 5 tags
+    )
+
+
+def decode_reddit(post: Mapping[str, Any]) -> ContentRecord:
+    """Listing child ({'kind': 't3', 'data': {...}}) to a record"""
+    data = post.get('data') or {}
+    
+    return ContentRecord(
+        'reddit', data.get('id', ''),
+        title=data.get('title', ''),
+        author=data.get('author', ''),
+        url=data.get('url', ''),
+        source=data.get('subreddit', ''),
+        comments=data.get('num_comments', 0),
+        score=data.get('score', 0),
+        published=data.get('created_utc', 0)
+    )
+
+
+def decode_hackernews(story: Mapping[str, Any]) -> ContentRecord:
+    """Firebase item to a record"""
+    return ContentRecord(
+        'hackernews', story.get('id', ''),
+        title=story.get('title', ''),
+        author=story.get('by', ''),
+        url=story.get('url', ''),
+        comments=story.get('descendants', 0),
+        score=story.get('score', 0),
+        published=story.get('time', 0)
+    )
+
+
+# Raw API payload decoder per platform
+DECODERS: Dict[str, Callable[[Mapping[str, Any]], ContentRecord]] = {
+    'youtube': decode_youtube,
+    'reddit': decode_reddit,
+    'hackernews': decode_hackernews,
+}
@@ -0,0 +1,121 @@
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from src.aggregator import TrendAggregator
+
+
+class RefreshJob:
+    """
+    One background aggregation run
+    
+    Stage progress is written by the aggregator's worker threads and read by
+    the dashboard, so all state goes through snapshot() under a lock.
+    """
+    
+    def __init__(self, platforms: List[str] = None):
+        self.id = uuid.uuid4().hex[:8]
+        self.platforms = platforms
+        self.status = 'running'  # running, done, failed
+        self.error = None
+        self.started_at = datetime.now()
+        self.finished_at = None
+        self.stages = {
+            platform: {'label': label, 'status': 'pending', 'seconds': None, 'error': None}
+            for platform, label, _ in TrendAggregator.stages_for(platforms)
+        }
+        self._lock = threading.Lock()
+        self._finished = threading.Event()
+    
+    @property
+    def running(self) -> bool:
+        return not self._finished.is_set()
+    
+    def stage_done(self, platform: str, label: str, seconds: float, error: Optional[str]):
+        """Progress callback for TrendAggregator.aggregate_all_trends"""
+        with self._lock:
+            self.stages[platform] = {
+                'label': label,
+                'status': 'failed' if error else 'done',
+                'seconds': round(seconds, 2),
+                'error': error
+            }
+    
+    def finish(self, error: str = None):
+        with self._lock:
+            self.status = 'failed' if error else 'done'
+            self.error = error
+            self.finished_at = datetime.now()
+        self._finished.set()
+    
+    def wait(self, timeout: float = None) -> bool:
+        """Block until the job finishes (or timeout); returns whether it finished"""
+        return self._finished.wait(timeout)
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Consistent copy of the job's state for display"""
+        with self._lock:
+            done = sum(1 for stage in self.stages.values() if stage['status'] != 'pending')
+            return {
+                'id': self.id,
+                'status': self.status,
+                'error': self.error,
+                'started_at': self.started_at,
+                'finished_at': self.finished_at,
+                'progress': done / len(self.stages) if self.stages else 1.0,
+                'stages': {platform: dict(stage) for platform, stage in self.stages.items()}
+            }
+
+
+class RefreshManager:
+    """
+    Runs aggregations in a background thread, one at a time (single-flight)
+    
+    start() while a run is in flight returns that run's job instead of starting
+    another, so any number of concurrent refresh requests cost one aggregation.
+    Finished jobs are kept (up to `history`) so callers can look them up by ID.
+    """
+    
+    def __init__(self, aggregator_factory: Callable[[], TrendAggregator] = TrendAggregator, history: int = 20):
+        self.aggregator_factory = aggregator_factory
+        self.history = history
+        self.jobs: Dict[str, RefreshJob] = {}
+        self._current: Optional[RefreshJob] = None
+        self._lock = threading.Lock()
+    
+    def start(self, platforms: List[str] = None) -> RefreshJob:
+        """Start a refresh, or join the one already running"""
+        with self._lock:
+            if self._current is not None and self._current.running:
+                return self._current
+            
+            job = RefreshJob(platforms)
+            self._current = job
+            self.jobs[job.id] = job
+            # Drop the oldest finished jobs (dicts keep insertion order)
+            for job_id in list(self.jobs)[:max(len(self.jobs) - self.history, 0)]:
+                del self.jobs[job_id]
+        
+        threading.Thread(target=self._run, args=(job,), name=f'refresh-{job.id}', daemon=True).start()
+        return job
+    
+    def _run(self, job: RefreshJob):
+        started = time.perf_counter()
+        try:
+            aggregator = self.aggregator_factory()
+            aggregator.aggregate_all_trends(platforms=job.platforms, progress=job.stage_done)
+        except Exception as e:
+            print(f"❌ Refresh {job.id} failed: {e}")
+            job.finish(error=str(e))
+        else:
+            print(f"✅ Refresh {job.id} finished in {time.perf_counter() - started:.2f}s")
+            job.finish()
+    
+    def current(self) -> Optional[RefreshJob]:
+        """The running job, or the most recent one"""
+        return self._current
+    
+    def get(self, job_id: str) -> Optional[RefreshJob]:
+        return self.jobs.get(job_id)
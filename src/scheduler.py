@@ -0,0 +1,68 @@
+from datetime import datetime
+
+from apscheduler.events import EVENT_JOB_ERROR
+from apscheduler.schedulers.blocking import BlockingScheduler
+from apscheduler.triggers.interval import IntervalTrigger
+
+from src.aggregator import TrendAggregator
+from config import Config
+
+
+def build_scheduler(aggregator: TrendAggregator = None, run_now: bool = True) -> BlockingScheduler:
+    """
+    Schedule one collection job per platform stage
+    
+    Each job refreshes a single platform and merges it into latest.json, on the
+    platform's own cadence (Config.SCHEDULE_INTERVALS, else DATA_FETCH_INTERVAL; 0 = off)
+    plus up to Config.SCHEDULE_JITTER seconds of random delay, capped at a tenth
+    of the interval so short cadences like Hacker News' stay short. A job never
+    overlaps with itself, and runs missed while the previous one was still going
+    are coalesced into a single run.
+    
+    Args:
+        aggregator: Aggregator shared by all jobs (default: a new one)
+        run_now: Run every job once at startup instead of waiting a full interval
+    """
+    aggregator = aggregator or TrendAggregator()
+    scheduler = BlockingScheduler(job_defaults={
+        'max_instances': 1,
+        'coalesce': True,
+        'misfire_grace_time': None  # Run late rather than skip
+    })
+    
+    for platform, label, _ in TrendAggregator.STAGES:
+        interval = Config.SCHEDULE_INTERVALS.get(platform, Config.DATA_FETCH_INTERVAL)
+        if not interval:
+            continue  # 0 disables the platform's schedule
+        jitter = min(Config.SCHEDULE_JITTER, int(interval * Config.SCHEDULE_MAX_JITTER_FRACTION))
+        job_options = {'next_run_time': datetime.now()} if run_now else {}
+        
+        scheduler.add_job(
+            aggregator.aggregate_all_trends,
+            IntervalTrigger(seconds=interval, jitter=jitter),
+            kwargs={'platforms': [platform]},
+            id=f'collect_{platform}',
+            name=f'{label} collection',
+            **job_options
+        )
+    
+    def on_error(event):
+        print(f"❌ Job {event.job_id} failed: {event.exception}")
+    
+    scheduler.add_listener(on_error, EVENT_JOB_ERROR)
+    return scheduler
+
+
+if __name__ == '__main__':
+    scheduler = build_scheduler()
+    
+    print("=" * 60)
+    print("⏰ Collector daemon started")
+    print("=" * 60)
+    for job in scheduler.get_jobs():
+        print(f"   • {job.name}: every {job.trigger.interval}")
+    
+    try:
+        scheduler.start()
+    except (KeyboardInterrupt, SystemExit):
+        print("\n👋 Collector daemon stopped")
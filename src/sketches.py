@@ -0,0 +1,72 @@
+import heapq
+from typing import Dict, Hashable, List, Mapping, Tuple
+
+
+class SpaceSaving:
+    """
+    Space-Saving heavy-hitters summary (Metwally et al.) with weighted updates
+    
+    Tracks at most `capacity` items. When a new item arrives and the summary is
+    full, the item with the smallest count is replaced and the newcomer inherits
+    that count as its error. Every reported count overestimates the true count
+    by at most its error, and any item whose true count exceeds
+    total / capacity is guaranteed to be tracked.
+    
+    The aggregator feeds it the exact per-platform keyword counts when
+    Config.GLOBAL_KEYWORD_SKETCH_SIZE caps the global ranking's memory.
+    """
+    
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        
+        self.capacity = capacity
+        self.counts: Dict[Hashable, int] = {}
+        self.errors: Dict[Hashable, int] = {}
+        self.total = 0
+        # Min-heap of (count, item); entries go stale when a count changes and are skipped lazily
+        self._heap: List[Tuple[int, Hashable]] = []
+    
+    def __len__(self):
+        return len(self.counts)
+    
+    def update(self, item: Hashable, count: int = 1):
+        """Add `count` occurrences of item"""
+        self.total += count
+        
+        if item in self.counts:
+            self.counts[item] += count
+        elif len(self.counts) < self.capacity:
+            self.counts[item] = count
+            self.errors[item] = 0
+        else:
+            evicted, floor = self._pop_min()
+            del self.counts[evicted]
+            del self.errors[evicted]
+            self.counts[item] = floor + count
+            self.errors[item] = floor
+        
+        self._push(item)
+    
+    def update_counts(self, counts: Mapping[Hashable, int]):
+        """Add a batch of exact counts (e.g. a Counter), heaviest items first"""
+        for item, count in sorted(counts.items(), key=lambda kv: kv[1], reverse=True):
+            self.update(item, count)
+    
+    def most_common(self, n: int = None) -> List[Tuple[Hashable, int]]:
+        """Tracked items with their (over)estimated counts, highest first"""
+        ranked = sorted(self.counts.items(), key=lambda kv: kv[1], reverse=True)
+        return ranked if n is None else ranked[:n]
+    
+    def _push(self, item: Hashable):
+        heapq.heappush(self._heap, (self.counts[item], item))
+        # Rebuild once stale entries dominate so the heap stays O(capacity)
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(count, key) for key, count in self.counts.items()]
+            heapq.heapify(self._heap)
+    
+    def _pop_min(self) -> Tuple[Hashable, int]:
+        while True:
+            count, item = heapq.heappop(self._heap)
+            if self.counts.get(item) == count:
+                return item, count
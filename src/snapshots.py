@@ -0,0 +1,108 @@
+import json
+import os
+from typing import Any, Dict, Iterable, List
+
+import numpy as np
+import pandas as pd
+
+from src.records import FIELD_NAMES, ContentRecord
+
+# Per-item tables written for each platform: {platform: {table: [columns]}}, with
+# columns named as in the JSON results (see records.EXPORT_FIELDS)
+TABLES = {
+    'youtube': {
+        'videos': ['id', 'title', 'channel', 'views', 'likes', 'comments', 'published', 'tags', 'niches'],
+    },
+    'reddit': {
+        'posts': ['id', 'title', 'subreddit', 'score', 'comments', 'url', 'author', 'created', 'niches'],
+    },
+    'hackernews': {
+        'stories': ['id', 'title', 'score', 'comments', 'url', 'author', 'time', 'niches'],
+    },
+}
+
+# Keyword count tables exist for every platform that has keyword_counts
+KEYWORD_COLUMNS = ['keyword', 'count']
+
+
+def _column_array(values: List[Any]) -> np.ndarray:
+    """Pack one column into a typed array (lists and tuples are JSON-encoded strings)"""
+    if values and all(isinstance(v, (int, np.integer)) and not isinstance(v, bool) for v in values):
+        return np.asarray(values, dtype=np.int64)
+    if values and all(isinstance(v, (int, float, np.number)) and not isinstance(v, bool) for v in values):
+        return np.asarray(values, dtype=np.float64)
+    return np.asarray(
+        [json.dumps(v, ensure_ascii=False) if isinstance(v, (list, tuple, dict)) else str(v) for v in values],
+        dtype=np.str_
+    )
+
+
+def write_snapshot(path: str, items: Dict[str, List[ContentRecord]], keyword_counts: Dict[str, Dict[str, int]],
+                   base: str = None):
+    """
+    Write a run's per-item tables as a compressed columnar .npz file
+    
+    Every column is stored as its own array under `<platform>.<table>.<column>`,
+    so readers decompress only the platforms and columns they ask for.
+    
+    Args:
+        path: Target .npz path
+        items: {platform: [ContentRecord]}
+        keyword_counts: {platform: {keyword: count}}
+        base: Earlier snapshot to copy the tables of platforms missing from both
+            items and keyword_counts from (default: write those tables empty)
+    """
+    arrays = {}
+    
+    for platform, tables in TABLES.items():
+        for table, columns in tables.items():
+            rows = items.get(platform, [])
+            for column in columns:
+                attribute = FIELD_NAMES[platform].get(column, column)
+                arrays[f"{platform}.{table}.{column}"] = _column_array([getattr(row, attribute) for row in rows])
+    
+    for platform, counts in keyword_counts.items():
+        ranked = sorted(counts.items(), key=lambda kv: kv[1], reverse=True)
+        arrays[f"{platform}.keywords.keyword"] = np.asarray([k for k, _ in ranked], dtype=np.str_)
+        arrays[f"{platform}.keywords.count"] = np.asarray([v for _, v in ranked], dtype=np.int64)
+    
+    if base is not None and os.path.exists(base):
+        collected = set(items) | set(keyword_counts)
+        with np.load(base) as previous:
+            for key in previous.files:
+                if key.split('.', 1)[0] not in collected:
+                    arrays[key] = previous[key]
+    
+    np.savez_compressed(path, **arrays)
+
+
+def load_snapshot(path: str, tables: Iterable[str] = None, columns: Iterable[str] = None,
+                  platforms: Iterable[str] = None) -> Dict[str, pd.DataFrame]:
+    """
+    Load tables from a columnar snapshot as DataFrames
+    
+    Args:
+        path: .npz snapshot written by write_snapshot
+        tables: Table names to load, e.g. ['videos', 'keywords'] (default: all)
+        columns: Columns to load; others are never decompressed (default: all)
+        platforms: Platforms to load, e.g. ['youtube'] (default: all)
+    
+    Returns {'<platform>.<table>': DataFrame}.
+    """
+    tables = set(tables) if tables is not None else None
+    columns = set(columns) if columns is not None else None
+    platforms = set(platforms) if platforms is not None else None
+    
+    frames = {}
+    with np.load(path) as snapshot:
+        for key in snapshot.files:
+            platform, table, column = key.split('.')
+            if platforms is not None and platform not in platforms:
+                continue
+            if tables is not None and table not in tables:
+                continue
+            if columns is not None and column not in columns:
+                continue
+            frames.setdefault(f"{platform}.{table}", {})[column] = snapshot[key]
+    
+    return {name: pd.DataFrame(data) for name, data in frames.items()}
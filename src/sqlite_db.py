@@ -0,0 +1,20 @@
+import os
+import sqlite3
+
+
+def connect(path: str, *schema: str) -> sqlite3.Connection:
+    """
+    Open one of the local SQLite state files, creating its directory and tables
+    
+    Each schema statement (CREATE ... IF NOT EXISTS) runs on every open. The
+    connection is shared by the owner's threads, which serialize access with
+    their own lock; the timeout lets other processes wait out a write.
+    """
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    
+    conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    for statement in schema:
+        conn.execute(statement)
+    conn.commit()
+    return conn
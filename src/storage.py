@@ -0,0 +1,238 @@
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import (
+    Column, DateTime, ForeignKey, Index, Integer, JSON, MetaData, String, Table, Text,
+    UniqueConstraint, create_engine, delete, func, select
+)
+from sqlalchemy.dialects import postgresql, sqlite
+
+from config import Config
+from src import tokenizer
+from src.records import ContentRecord
+
+metadata = MetaData()
+
+# Keep IN (...) lists under SQLite's bound-parameter limit
+IN_CLAUSE_CHUNK = 500
+
+# Platform-specific record attributes kept in content.extra: {platform: {key: attribute}}
+EXTRA_FIELDS = {
+    'youtube': {'tags': 'tags'},
+    'reddit': {'subreddit': 'source'},
+}
+
+# One row per collected item, unique per (platform, external_id)
+content = Table(
+    'content', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('platform', String(32), nullable=False),
+    Column('external_id', String(128), nullable=False),
+    Column('title', Text, nullable=False, default=''),
+    Column('author', String(255)),
+    Column('url', Text),
+    Column('views', Integer),
+    Column('likes', Integer),
+    Column('comments', Integer),
+    Column('score', Integer),
+    Column('extra', JSON),
+    Column('published_at', DateTime(timezone=True)),
+    Column('fetched_at', DateTime(timezone=True), nullable=False),
+    UniqueConstraint('platform', 'external_id', name='uq_content_platform_external_id'),
+    Index('idx_content_fetched_at', 'fetched_at'),
+    Index('idx_content_published_at', 'published_at'),
+)
+
+content_keywords = Table(
+    'content_keywords', metadata,
+    Column('content_id', Integer, ForeignKey('content.id', ondelete='CASCADE'), primary_key=True),
+    Column('keyword', String(64), primary_key=True),
+    Column('count', Integer, nullable=False),
+    Index('idx_content_keywords_keyword', 'keyword'),
+)
+
+content_hashtags = Table(
+    'content_hashtags', metadata,
+    Column('content_id', Integer, ForeignKey('content.id', ondelete='CASCADE'), primary_key=True),
+    Column('hashtag', String(128), primary_key=True),
+    Column('count', Integer, nullable=False),
+    Index('idx_content_hashtags_hashtag', 'hashtag'),
+)
+
+
+def chunked(values: List[Any], size: int = IN_CLAUSE_CHUNK):
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def _to_datetime(value) -> Optional[datetime]:
+    """Convert an epoch timestamp or ISO 8601 string to an aware datetime"""
+    if value in (None, '', 0):
+        return None
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value, tz=timezone.utc)
+    try:
+        parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def content_row(item: ContentRecord, fetched_at: datetime) -> Dict[str, Any]:
+    """Map a collected ContentRecord to a content row"""
+    extra = {key: getattr(item, attribute) for key, attribute in EXTRA_FIELDS.get(item.platform, {}).items()}
+    extra['niches'] = item.niches
+    
+    return {
+        'platform': item.platform,
+        'external_id': str(item.id),
+        'title': item.title,
+        'author': item.author or None,
+        'url': item.url or None,
+        'views': item.views,
+        'likes': item.likes,
+        'comments': item.comments,
+        'score': item.score,
+        'extra': extra,
+        'published_at': _to_datetime(item.published),
+        'fetched_at': fetched_at
+    }
+
+
+class TrendStore:
+    """SQL storage for collected content, keywords and hashtags (SQLite or Postgres)"""
+    
+    def __init__(self, database_url: str = None):
+        self.engine = create_engine(database_url or Config.DATABASE_URL)
+        metadata.create_all(self.engine)
+    
+    def _insert(self, table):
+        """Dialect-specific INSERT that supports ON CONFLICT"""
+        if self.engine.dialect.name == 'postgresql':
+            return postgresql.insert(table)
+        return sqlite.insert(table)
+    
+    def upsert_content(self, conn, rows: List[Dict[str, Any]]) -> Dict[tuple, int]:
+        """Bulk upsert content rows keyed on (platform, external_id); returns their row IDs"""
+        if not rows:
+            return {}
+        
+        stmt = self._insert(content)
+        updated = {
+            name: stmt.excluded[name]
+            for name in ('title', 'author', 'url', 'views', 'likes', 'comments', 'score', 'extra',
+                         'published_at', 'fetched_at')
+        }
+        conn.execute(stmt.on_conflict_do_update(index_elements=['platform', 'external_id'], set_=updated), rows)
+        
+        ids = {}
+        for platform in {row['platform'] for row in rows}:
+            external_ids = [row['external_id'] for row in rows if row['platform'] == platform]
+            for chunk in chunked(external_ids):
+                query = select(content.c.id, content.c.external_id).where(
+                    content.c.platform == platform, content.c.external_id.in_(chunk)
+                )
+                for content_id, external_id in conn.execute(query):
+                    ids[(platform, external_id)] = content_id
+        
+        return ids
+    
+    def _replace_terms(self, conn, table, column: str, terms: Dict[int, Counter]):
+        """
+        Replace the keyword/hashtag rows of the given content IDs
+        
+        Terms longer than the column (run-together URLs and the like) are skipped:
+        Postgres rejects them, and truncating could collide two terms on the key.
+        """
+        if not terms:
+            return
+        
+        max_length = table.c[column].type.length
+        for chunk in chunked(list(terms)):
+            conn.execute(delete(table).where(table.c.content_id.in_(chunk)))
+        rows = [
+            {'content_id': content_id, column: term, 'count': count}
+            for content_id, counts in terms.items()
+            for term, count in counts.items()
+            if len(term) <= max_length
+        ]
+        if rows:
+            conn.execute(table.insert(), rows)
+    
+    def save_items(self, items: Dict[str, List[ContentRecord]], fetched_at: datetime = None) -> int:
+        """
+        Persist processed items from one run
+        
+        Args:
+            items: {platform: [ContentRecord]} as collected by TrendAggregator
+            fetched_at: Collection time (default: now)
+        
+        Returns the number of content rows written.
+        """
+        fetched_at = fetched_at or datetime.now(timezone.utc)
+        
+        rows = []
+        for platform_items in items.values():
+            rows.extend((content_row(item, fetched_at), item) for item in platform_items if item.id)
+        
+        # Last occurrence wins if a run returned the same item twice
+        rows = list({(row['platform'], row['external_id']): (row, item) for row, item in rows}.values())
+        
+        with self.engine.begin() as conn:
+            ids = self.upsert_content(conn, [row for row, _ in rows])
+            
+            keywords = {}
+            hashtags = {}
+            for row, item in rows:
+                content_id = ids[(row['platform'], row['external_id'])]
+                # Reuse the record's tokens when the aggregator already computed them
+                if item.keywords is not None:
+                    row_keywords, row_hashtags = item.keywords, item.hashtags
+                else:
+                    row_keywords, row_hashtags = tokenizer.tokenize(row['title'])
+                keywords[content_id] = Counter(row_keywords)
+                hashtags[content_id] = Counter(row_hashtags)
+            
+            self._replace_terms(conn, content_keywords, 'keyword', keywords)
+            self._replace_terms(conn, content_hashtags, 'hashtag', hashtags)
+        
+        return len(rows)
+    
+    def top_keywords(self, since: datetime = None, platform: str = None, limit: int = 20) -> List[Dict[str, Any]]:
+        """Most mentioned keywords over content fetched since a point in time"""
+        total = func.sum(content_keywords.c.count).label('count')
+        query = (
+            select(content_keywords.c.keyword, total)
+            .join(content, content.c.id == content_keywords.c.content_id)
+            .group_by(content_keywords.c.keyword)
+            .order_by(total.desc())
+            .limit(limit)
+        )
+        if since is not None:
+            query = query.where(content.c.fetched_at >= since)
+        if platform is not None:
+            query = query.where(content.c.platform == platform)
+        
+        with self.engine.connect() as conn:
+            return [{'keyword': keyword, 'count': count} for keyword, count in conn.execute(query)]
+    
+    def keyword_history(self, keyword: str, since: datetime = None) -> List[Dict[str, Any]]:
+        """Mentions of a keyword per platform and publication day"""
+        day = func.date(content.c.published_at).label('day')
+        total = func.sum(content_keywords.c.count).label('count')
+        query = (
+            select(day, content.c.platform, total)
+            .join(content, content.c.id == content_keywords.c.content_id)
+            .where(content_keywords.c.keyword == keyword.lower())
+            .group_by(day, content.c.platform)
+            .order_by(day)
+        )
+        if since is not None:
+            query = query.where(content.c.published_at >= since)
+        
+        with self.engine.connect() as conn:
+            return [
+                {'date': str(row_day), 'platform': platform, 'count': count}
+                for row_day, platform, count in conn.execute(query)
+            ]
@@ -0,0 +1,267 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import Column, Float, Integer, String, Table, create_engine, delete, func, select
+
+from config import Config
+from src.storage import metadata
+
+# Raw interest points per (query, geo), one row per timestamp
+trend_points = Table(
+    'trend_points', metadata,
+    Column('query', String(255), primary_key=True),
+    Column('geo', String(16), primary_key=True),
+    Column('ts', Integer, primary_key=True),  # Unix seconds
+    Column('value', Float, nullable=False),
+)
+
+# Precomputed aggregates per (query, geo, resolution, bucket)
+trend_rollups = Table(
+    'trend_rollups', metadata,
+    Column('query', String(255), primary_key=True),
+    Column('geo', String(16), primary_key=True),
+    Column('resolution', String(8), primary_key=True),  # hour, day, week
+    Column('bucket', Integer, primary_key=True),  # Unix seconds of the bucket start
+    Column('mean', Float, nullable=False),
+    Column('min', Float, nullable=False),
+    Column('max', Float, nullable=False),
+    Column('count', Integer, nullable=False),
+)
+
+RESOLUTIONS = ('hour', 'day', 'week')
+RESOLUTION_SECONDS = {'hour': 3600, 'day': 86400, 'week': 7 * 86400}
+
+# Smallest SerpApi `date` window that still covers a gap of N days, in ascending order
+FETCH_WINDOWS = [
+    (1, 'now 1-d'),
+    (7, 'now 7-d'),
+    (30, 'today 1-m'),
+    (90, 'today 3-m'),
+    (365, 'today 12-m'),
+]
+FULL_HISTORY_WINDOW = 'today 12-m'
+
+
+def bucket_start(ts: int, resolution: str) -> int:
+    """Start of the hour/day/ISO week (Monday, UTC) containing ts"""
+    moment = datetime.fromtimestamp(ts, tz=timezone.utc)
+    if resolution == 'hour':
+        moment = moment.replace(minute=0, second=0, microsecond=0)
+    elif resolution == 'day':
+        moment = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    elif resolution == 'week':
+        moment = moment.replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=moment.weekday())
+    else:
+        raise ValueError(f"Unknown resolution: {resolution}")
+    return int(moment.timestamp())
+
+
+def point_spacing(timestamps: List[int]) -> int:
+    """Median gap between consecutive timestamps, 0 for fewer than two"""
+    timestamps = sorted(timestamps)
+    gaps = sorted(b - a for a, b in zip(timestamps, timestamps[1:]))
+    return gaps[len(gaps) // 2] if gaps else 0
+
+
+def bucket_means(points: List[Tuple[int, float]], resolution: str) -> Dict[int, float]:
+    """{bucket start: mean value} of the points at a resolution"""
+    buckets = {}
+    for ts, value in points:
+        buckets.setdefault(bucket_start(ts, resolution), []).append(value)
+    return {bucket: sum(values) / len(values) for bucket, values in buckets.items()}
+
+
+def parse_timeline(timeline: List[Dict[str, Any]], value_index: int = 0) -> List[Tuple[int, float]]:
+    """Turn SerpApi timeline_data into [(timestamp, value)]"""
+    points = []
+    for point in timeline:
+        values = point.get('values', [])
+        if point.get('timestamp') and len(values) > value_index:
+            points.append((int(point['timestamp']), float(values[value_index].get('extracted_value', 0))))
+    return points
+
+
+class TimeSeriesStore:
+    """
+    Incremental Google Trends history with hourly/daily/weekly rollups
+    
+    Each query's timeline is appended to instead of refetched: fetch_window()
+    picks the smallest SerpApi window that covers the gap since the last stored
+    point, and append() stores only newer points and refreshes the rollup
+    buckets they touch.
+    
+    Google Trends scales every response to 0-100 within its own window, so new
+    points are rescaled by the ratio of stored to fetched values over the span
+    both series cover (when there is any overlap), compared bucket by bucket at
+    the coarser of the two resolutions.
+    """
+    
+    def __init__(self, database_url: str = None):
+        self.engine = create_engine(database_url or Config.DATABASE_URL)
+        metadata.create_all(self.engine, tables=[trend_points, trend_rollups])
+    
+    def last_timestamp(self, query: str, geo: str = '') -> Optional[int]:
+        stmt = select(func.max(trend_points.c.ts)).where(trend_points.c.query == query, trend_points.c.geo == geo)
+        with self.engine.connect() as conn:
+            return conn.execute(stmt).scalar()
+    
+    def stored_queries(self, geo: str = '') -> List[str]:
+        """Queries with stored history, alphabetically"""
+        stmt = select(trend_points.c.query).where(trend_points.c.geo == geo).distinct().order_by(trend_points.c.query)
+        with self.engine.connect() as conn:
+            return list(conn.execute(stmt).scalars())
+    
+    def fetch_window(self, query: str, geo: str = '') -> str:
+        """SerpApi `date` value that covers everything since the last stored point"""
+        last = self.last_timestamp(query, geo)
+        if last is None:
+            return FULL_HISTORY_WINDOW
+        
+        gap_days = (datetime.now(timezone.utc).timestamp() - last) / 86400
+        for days, window in FETCH_WINDOWS:
+            if gap_days <= days:
+                return window
+        return FULL_HISTORY_WINDOW
+    
+    def _scale_factor(self, conn, query: str, geo: str, points: List[Tuple[int, float]], last: int) -> float:
+        """
+        Ratio that maps the fetched window's scale onto the stored one
+        
+        The window sizes come at different resolutions (8-minute points for a day,
+        hourly for a week, daily, then weekly for a year), so the stored and fetched
+        series rarely share exact timestamps. Each point stands for the interval up
+        to the next one; both series are cut to the span they both cover, averaged
+        into buckets at the coarser of their spacings, and compared on the buckets
+        they both have.
+        """
+        start = min(ts for ts, _ in points)
+        stored = conn.execute(
+            select(trend_points.c.ts, trend_points.c.value).where(
+                trend_points.c.query == query, trend_points.c.geo == geo,
+                trend_points.c.ts >= bucket_start(start, 'week')
+            )
+        ).all()
+        if not stored:
+            return 1.0
+        
+        fetched_spacing = point_spacing([ts for ts, _ in points])
+        stored_spacing = point_spacing([ts for ts, _ in stored])
+        fetched = [(ts, value) for ts, value in points if ts <= last or ts < last + stored_spacing]
+        stored = [(ts, value) for ts, value in stored if ts >= start or ts + stored_spacing > start]
+        
+        spacing = max(fetched_spacing, stored_spacing)
+        resolution = next((r for r in RESOLUTIONS if RESOLUTION_SECONDS[r] >= spacing), RESOLUTIONS[-1])
+        fetched_means = bucket_means(fetched, resolution)
+        stored_means = bucket_means(stored, resolution)
+        common = fetched_means.keys() & stored_means.keys()
+        
+        fetched_total = sum(fetched_means[bucket] for bucket in common)
+        if not common or fetched_total <= 0:
+            return 1.0
+        return sum(stored_means[bucket] for bucket in common) / fetched_total
+    
+    def append(self, query: str, points: List[Tuple[int, float]], geo: str = '') -> int:
+        """
+        Store points newer than the last stored one and refresh their rollups
+        
+        Returns the number of new points.
+        """
+        if not points:
+            return 0
+        
+        with self.engine.begin() as conn:
+            last = conn.execute(
+                select(func.max(trend_points.c.ts)).where(trend_points.c.query == query, trend_points.c.geo == geo)
+            ).scalar()
+            factor = self._scale_factor(conn, query, geo, points, last) if last is not None else 1.0
+            
+            new_points = [(ts, value * factor) for ts, value in points if last is None or ts > last]
+            if not new_points:
+                return 0
+            
+            conn.execute(trend_points.insert(), [
+                {'query': query, 'geo': geo, 'ts': ts, 'value': value} for ts, value in new_points
+            ])
+            
+            for resolution in RESOLUTIONS:
+                self._refresh_rollups(conn, query, geo, resolution, min(ts for ts, _ in new_points))
+        
+        return len(new_points)
+    
+    def _refresh_rollups(self, conn, query: str, geo: str, resolution: str, since: int):
+        """Recompute the rollup buckets from the one containing `since` onwards"""
+        first_bucket = bucket_start(since, resolution)
+        
+        rows = conn.execute(
+            select(trend_points.c.ts, trend_points.c.value)
+            .where(trend_points.c.query == query, trend_points.c.geo == geo, trend_points.c.ts >= first_bucket)
+            .order_by(trend_points.c.ts)
+        ).all()
+        
+        buckets = {}
+        for ts, value in rows:
+            buckets.setdefault(bucket_start(ts, resolution), []).append(value)
+        
+        conn.execute(delete(trend_rollups).where(
+            trend_rollups.c.query == query, trend_rollups.c.geo == geo,
+            trend_rollups.c.resolution == resolution, trend_rollups.c.bucket >= first_bucket
+        ))
+        if buckets:
+            conn.execute(trend_rollups.insert(), [
+                {
+                    'query': query, 'geo': geo, 'resolution': resolution, 'bucket': bucket,
+                    'mean': sum(values) / len(values), 'min': min(values), 'max': max(values),
+                    'count': len(values)
+                }
+                for bucket, values in buckets.items()
+            ])
+    
+    def rollups(self, query: str, resolution: str = 'day', since: datetime = None,
+                geo: str = '') -> List[Dict[str, Any]]:
+        """Precomputed buckets for a query, oldest first"""
+        stmt = (
+            select(trend_rollups)
+            .where(trend_rollups.c.query == query, trend_rollups.c.geo == geo,
+                   trend_rollups.c.resolution == resolution)
+            .order_by(trend_rollups.c.bucket)
+        )
+        if since is not None:
+            stmt = stmt.where(trend_rollups.c.bucket >= int(since.timestamp()))
+        
+        with self.engine.connect() as conn:
+            return [
+                {
+                    'date': datetime.fromtimestamp(row.bucket, tz=timezone.utc).isoformat(),
+                    'bucket': row.bucket, 'mean': row.mean, 'min': row.min, 'max': row.max, 'count': row.count
+                }
+                for row in conn.execute(stmt)
+            ]
+    
+    def timeline(self, query: str, resolution: str = 'week', geo: str = '') -> List[Dict[str, Any]]:
+        """Rollup means in SerpApi's timeline_data shape, for code written against raw responses"""
+        return [
+            {
+                'date': bucket['date'][:10],
+                'timestamp': str(bucket['bucket']),
+                'values': [{'query': query, 'extracted_value': bucket['mean']}]
+            }
+            for bucket in self.rollups(query, resolution, geo=geo)
+        ]
+    
+    def range_summary(self, queries: List[str], days: int, geo: str = '') -> List[Dict[str, Any]]:
+        """Average interest per query over the last N days, from daily rollups"""
+        since = datetime.now(timezone.utc) - timedelta(days=days)
+        summary = []
+        
+        for query in queries:
+            buckets = self.rollups(query, 'day', since=since, geo=geo)
+            if buckets:
+                total = sum(b['count'] for b in buckets)
+                summary.append({
+                    'query': query,
+                    'interest': round(sum(b['mean'] * b['count'] for b in buckets) / total, 1),
+                    'peak': max(b['max'] for b in buckets),
+                    'points': total
+                })
+        
+        return sorted(summary, key=lambda x: x['interest'], reverse=True)
@@ -0,0 +1,88 @@
+import re
+from collections import Counter
+from itertools import islice
+from typing import Iterable, List, Tuple
+
+# Common words that carry no trend signal
+STOP_WORDS = frozenset({
+    'this', 'that', 'with', 'from', 'have', 'been', 'will', 'your', 'their',
+    'what', 'when', 'where', 'which', 'about', 'there', 'these', 'those'
+})
+
+# One pattern finds both plain words and hashtags: '#' + word characters is a
+# hashtag, and its body (like any other word) is also a keyword candidate
+TOKEN_PATTERN = re.compile(r'#?\w+')
+
+DEFAULT_MIN_LENGTH = 4
+
+# Texts joined per regex call in count_tokens; bounds memory for long streams
+CHUNK_SIZE = 1000
+
+
+def _is_keyword(word: str, min_length: int) -> bool:
+    """ASCII letters only, long enough, not a stop word"""
+    return len(word) >= min_length and word.isascii() and word.isalpha() and word not in STOP_WORDS
+
+
+def tokenize(text: str, min_length: int = DEFAULT_MIN_LENGTH) -> Tuple[List[str], List[str]]:
+    """
+    Extract keywords and hashtags from text in a single pass
+    
+    Returns (keywords, hashtags), both lowercased and in text order.
+    """
+    if not text:
+        return [], []
+    
+    keywords = []
+    hashtags = []
+    
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        if token[0] == '#':
+            hashtags.append(token)
+            token = token[1:]
+        if _is_keyword(token, min_length):
+            keywords.append(token)
+    
+    return keywords, hashtags
+
+
+def extract_keywords(text: str, min_length: int = DEFAULT_MIN_LENGTH) -> List[str]:
+    """Extract keywords from text"""
+    return tokenize(text, min_length)[0]
+
+
+def extract_hashtags(text: str) -> List[str]:
+    """Extract hashtags from text"""
+    return tokenize(text)[1]
+
+
+def count_tokens(texts: Iterable[str], min_length: int = DEFAULT_MIN_LENGTH,
+                 chunk_size: int = CHUNK_SIZE) -> Tuple[Counter, Counter]:
+    """
+    Count keywords and hashtags over many texts
+    
+    Texts are consumed in chunks of chunk_size; each chunk is joined and scanned
+    with one regex call, so the per-text overhead is a string join rather than a
+    Python-level loop. Generators are read incrementally, and memory stays
+    bounded by one chunk plus the counters.
+    
+    Returns (keyword_counts, hashtag_counts).
+    """
+    keyword_counts = Counter()
+    hashtag_counts = Counter()
+    texts = iter(texts)
+    
+    while True:
+        chunk = list(islice(texts, chunk_size))
+        if not chunk:
+            return keyword_counts, hashtag_counts
+        
+        # Newlines are not word characters, so no token can span two texts
+        corpus = '\n'.join(text for text in chunk if text).lower()
+        
+        for token, count in Counter(TOKEN_PATTERN.findall(corpus)).items():
+            if token[0] == '#':
+                hashtag_counts[token] += count
+                token = token[1:]
+            if _is_keyword(token, min_length):
+                keyword_counts[token] += count
@@ -0,0 +1,124 @@
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+# Change (in percent) between the two halves of the recent window that counts as a move
+DIRECTION_THRESHOLD = 10.0
+# Number of most recent points the direction is judged on
+DIRECTION_WINDOW = 5
+
+
+def timelines_to_matrix(timelines: Sequence[Sequence[float]]) -> np.ndarray:
+    """
+    Stack timelines of different lengths into one 2-D float array
+    
+    Rows are right-aligned on the latest point and left-padded with NaN, so
+    column -1 is every query's most recent value.
+    """
+    width = max((len(t) for t in timelines), default=0)
+    matrix = np.full((len(timelines), width), np.nan)
+    for row, timeline in enumerate(timelines):
+        if len(timeline):
+            matrix[row, width - len(timeline):] = timeline
+    return matrix
+
+
+def compute_trend_stats(matrix: np.ndarray, window: int = DIRECTION_WINDOW,
+                        threshold: float = DIRECTION_THRESHOLD) -> Dict[str, np.ndarray]:
+    """
+    Compute trend statistics for every row of a (queries x points) matrix at once
+    
+    Returns arrays of length n_queries:
+        direction: 'rising' / 'falling' / 'stable', from the mean of the second half
+            of the last `window` points versus the first half
+        change_percent: that half-over-half change in percent
+        slope: least-squares slope over all points (interest per point)
+        zscore: latest point relative to the row's mean and standard deviation
+        volatility: standard deviation of point-to-point changes
+    """
+    matrix = np.asarray(matrix, dtype=float)
+    n_rows, width = matrix.shape
+    
+    if width == 0:
+        zeros = np.zeros(n_rows)
+        return {
+            'direction': np.full(n_rows, 'stable', dtype=object),
+            'change_percent': zeros, 'slope': zeros, 'zscore': zeros, 'volatility': zeros
+        }
+    
+    valid = ~np.isnan(matrix)
+    values = np.where(valid, matrix, 0.0)
+    counts = valid.sum(axis=1)
+    
+    # Half-over-half change on the recent window (rows are right-aligned, so
+    # each row's valid points are contiguous at the end of the window)
+    recent = values[:, -window:]
+    recent_valid = valid[:, -window:]
+    span = recent.shape[1]
+    n_recent = recent_valid.sum(axis=1)
+    half = n_recent // 2
+    
+    position = np.arange(span)[None, :]
+    start = (span - n_recent)[:, None]
+    first_half = recent_valid & (position < start + half[:, None])
+    second_half = recent_valid & ~first_half
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        first_mean = (recent * first_half).sum(axis=1) / first_half.sum(axis=1)
+        second_mean = (recent * second_half).sum(axis=1) / second_half.sum(axis=1)
+        change_percent = np.where(first_mean > 0, (second_mean - first_mean) / first_mean * 100, 0.0)
+    change_percent = np.where(n_recent >= 2, change_percent, 0.0)
+    
+    direction = np.full(n_rows, 'stable', dtype=object)
+    direction[change_percent > threshold] = 'rising'
+    direction[change_percent < -threshold] = 'falling'
+    
+    # Least-squares slope over every valid point
+    x = np.broadcast_to(np.arange(width, dtype=float), matrix.shape)
+    safe_counts = np.maximum(counts, 1)
+    x_mean = (x * valid).sum(axis=1) / safe_counts
+    y_mean = values.sum(axis=1) / safe_counts
+    x_dev = np.where(valid, x - x_mean[:, None], 0.0)
+    y_dev = np.where(valid, matrix - y_mean[:, None], 0.0)
+    denominator = (x_dev ** 2).sum(axis=1)
+    slope = np.divide((x_dev * y_dev).sum(axis=1), denominator,
+                      out=np.zeros(n_rows), where=denominator > 0)
+    
+    # z-score of the latest point against the row's own distribution
+    std = np.sqrt((y_dev ** 2).sum(axis=1) / safe_counts)
+    latest = values[:, -1]
+    zscore = np.divide(latest - y_mean, std, out=np.zeros(n_rows), where=(std > 0) & valid[:, -1])
+    
+    # Volatility: spread of point-to-point changes
+    diffs = np.diff(matrix, axis=1)
+    diff_valid = ~np.isnan(diffs)
+    diff_counts = diff_valid.sum(axis=1)
+    diff_values = np.where(diff_valid, diffs, 0.0)
+    diff_mean = diff_values.sum(axis=1) / np.maximum(diff_counts, 1)
+    diff_dev = np.where(diff_valid, diffs - diff_mean[:, None], 0.0)
+    volatility = np.sqrt((diff_dev ** 2).sum(axis=1) / np.maximum(diff_counts, 1))
+    
+    return {
+        'direction': direction,
+        'change_percent': change_percent,
+        'slope': slope,
+        'zscore': zscore,
+        'volatility': volatility
+    }
+
+
+def trend_stats_for(timelines: Dict[str, List[float]], **kwargs) -> Dict[str, Dict[str, object]]:
+    """Convenience wrapper: {query: values} in, {query: {stat: value}} out"""
+    queries = list(timelines)
+    stats = compute_trend_stats(timelines_to_matrix([timelines[q] for q in queries]), **kwargs)
+    
+    return {
+        query: {
+            'trend_direction': stats['direction'][row],
+            'change_percent': round(float(stats['change_percent'][row]), 2),
+            'slope': round(float(stats['slope'][row]), 4),
+            'zscore': round(float(stats['zscore'][row]), 3),
+            'volatility': round(float(stats['volatility'][row]), 3)
+        }
+        for row, query in enumerate(queries)
+    }
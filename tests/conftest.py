@@ -0,0 +1,84 @@
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+from config import Config
+from src import http_client
+
+
+class FakeResponse:
+    """Just enough of requests.Response for the collectors"""
+    
+    def __init__(self, data):
+        self.data = data
+    
+    def raise_for_status(self):
+        pass
+    
+    def json(self):
+        return self.data
+
+
+class FakeSession:
+    """Stands in for the shared TransportSession: answers GETs from a handler and records them"""
+    
+    def __init__(self, handler):
+        self.handler = handler
+        self.calls = []
+    
+    def get(self, url, params=None, **kwargs):
+        self.calls.append((url, dict(params or {})))
+        result = self.handler(url, params or {})
+        if isinstance(result, Exception):
+            raise result
+        return FakeResponse(result)
+
+
+class FakeAdapter(BaseAdapter):
+    """Transport adapter answering from handler(request) -> (status, body, headers), for TransportSession tests"""
+    
+    def __init__(self, handler):
+        super().__init__()
+        self.handler = handler
+        self.requests = []
+    
+    def send(self, request, **kwargs):
+        self.requests.append(request)
+        status, body, headers = self.handler(request)
+        response = requests.Response()
+        response.status_code = status
+        response._content = body
+        response.headers = CaseInsensitiveDict(headers)
+        response.url = request.url
+        response.request = request
+        return response
+    
+    def close(self):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def isolated_state(tmp_path, monkeypatch):
+    """Keep every state file under tmp_path and give each test a fresh shared session"""
+    monkeypatch.setattr(Config, 'PROCESSED_DATA_DIR', str(tmp_path / 'processed'))
+    monkeypatch.setattr(Config, 'DATABASE_URL', f"sqlite:///{tmp_path / 'trends.db'}")
+    monkeypatch.setattr(Config, 'HTTP_CACHE_PATH', str(tmp_path / 'http_cache.sqlite'))
+    monkeypatch.setattr(Config, 'HN_ITEM_STORE_PATH', str(tmp_path / 'hn_items.sqlite'))
+    monkeypatch.setattr(Config, 'QUOTA_LEDGER_PATH', str(tmp_path / 'quota_ledger.sqlite'))
+    monkeypatch.setattr(Config, 'HTTP_CACHE_ENABLED', False)
+    monkeypatch.setattr(Config, 'RATE_LIMIT_ENABLED', False)
+    monkeypatch.setattr(http_client, '_session', None)
+    return tmp_path
+
+
+@pytest.fixture
+def fake_session():
+    """Factory for FakeSession(handler), where handler(url, params) returns the JSON or an exception"""
+    return FakeSession
+
+
+@pytest.fixture
+def fake_adapter():
+    """Factory for FakeAdapter(handler); mount it on a session to stub the network"""
+    return FakeAdapter
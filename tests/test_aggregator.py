@@ -0,0 +1,225 @@
+import json
+import os
+
+import pytest
+
+from config import Config
+from src import snapshots
+from src.aggregator import TrendAggregator, file_version, load_latest_results
+
+
+def youtube_api(url, params):
+    if url.endswith('/search'):
+        page = int(params.get('pageToken') or 0)
+        return {'items': [{'id': {'videoId': f'n{page + i}'}} for i in range(params['maxResults'])]}
+    if 'chart' in params:
+        ids = [f'v{i}' for i in range(5)]
+    else:
+        ids = params['id'].split(',')
+    return {'items': [
+        {'id': video_id, 'snippet': {'title': f'Python tutorial {video_id}', 'channelTitle': 'Channel'},
+         'statistics': {'viewCount': '100', 'likeCount': '5', 'commentCount': '1'}}
+        for video_id in ids
+    ]}
+
+
+def reddit_api(url, params):
+    subreddit = url.split('/r/')[1].split('/')[0]
+    return {'data': {'after': None, 'children': [
+        {'kind': 't3', 'data': {'id': f'{subreddit}{i}', 'title': f'Rust release {i}', 'subreddit': subreddit,
+                                'score': i, 'num_comments': 1, 'created_utc': 1700000000}}
+        for i in range(3)
+    ]}}
+
+
+def serpapi(url, params):
+    terms = params['q'].split(',')
+    return {'interest_over_time': {'timeline_data': [
+        {'date': 'Jan 1', 'timestamp': str(1700000000 + 86400 * day),
+         'values': [{'query': term, 'extracted_value': 10 + day} for term in terms]}
+        for day in range(3)
+    ]}}
+
+
+@pytest.fixture
+def hn_down():
+    """Set hn_down['error'] to an exception to make every Hacker News item request raise it"""
+    return {'error': None}
+
+
+@pytest.fixture
+def aggregator(fake_session, monkeypatch, hn_down):
+    monkeypatch.setattr(Config, 'REDDIT_SUBREDDITS', ['python', 'rust'])
+    monkeypatch.setattr(Config, 'HN_INCREMENTAL_SYNC', False)
+    
+    def hackernews_api(url, params):
+        if url.endswith('topstories.json'):
+            return list(range(1, 31))
+        if hn_down['error'] is not None:
+            return hn_down['error']
+        item_id = int(url.rsplit('/', 1)[1].split('.')[0])
+        return {'id': item_id, 'title': f'Show HN: Python tool {item_id}', 'score': item_id, 'by': 'pg',
+                'descendants': 2, 'time': 1700000000}
+    
+    aggregator = TrendAggregator()
+    aggregator.youtube_collector.session = fake_session(youtube_api)
+    aggregator.reddit_collector.session = fake_session(reddit_api)
+    aggregator.hn_collector.session = fake_session(hackernews_api)
+    aggregator.google_collector.session = fake_session(serpapi)
+    return aggregator
+
+
+def saved_stories():
+    path = os.path.join(Config.PROCESSED_DATA_DIR, 'latest.npz')
+    return snapshots.load_snapshot(path, platforms=['hackernews'])['hackernews.stories']
+
+
+def test_full_run_saves_every_platform(aggregator):
+    results = aggregator.aggregate_all_trends()
+    
+    assert results['youtube']['total_videos'] == 5
+    assert results['reddit']['total_posts'] == 6
+    assert results['hackernews']['total_stories'] == 30
+    assert len(results['google_trends']['trends']) == len(TrendAggregator.TREND_QUERIES)
+    assert results['errors'] == {}
+    assert {kw['keyword'] for kw in results['global_keywords']} >= {'python', 'rust'}
+    assert load_latest_results()['timestamp'] == results['timestamp']
+
+
+def test_concurrent_and_sequential_runs_agree(aggregator):
+    concurrent = aggregator.run_stages(concurrent=True)
+    sequential = aggregator.run_stages(concurrent=False)
+    
+    assert list(concurrent) == list(sequential) == [platform for platform, _, _ in TrendAggregator.stages_for()]
+    for platform in concurrent:
+        assert concurrent[platform][0].get('total_videos') == sequential[platform][0].get('total_videos')
+        assert concurrent[platform][0].get('total_posts') == sequential[platform][0].get('total_posts')
+
+
+def test_failing_stage_does_not_stop_the_others(aggregator, hn_down):
+    hn_down['error'] = ValueError('malformed item')
+    finished = []
+    
+    stages = aggregator.run_stages(progress=lambda platform, label, seconds, error: finished.append((platform, error)))
+    
+    assert stages['hackernews'][0] == {'error': 'malformed item'}
+    assert stages['reddit'][0]['total_posts'] == 6
+    assert sorted(finished) == sorted([('hackernews', 'malformed item'), ('youtube', None), ('reddit', None),
+                                       ('google_trends', None)])
+
+
+def test_failed_partial_run_keeps_last_good_data(aggregator, hn_down):
+    first = aggregator.aggregate_all_trends()
+    hn_down['error'] = ValueError('malformed item')
+    
+    results = aggregator.aggregate_all_trends(platforms=['hackernews'])
+    
+    saved = load_latest_results()
+    assert saved['hackernews']['stories'] == first['hackernews']['stories']
+    assert saved['updated']['hackernews'] == first['updated']['hackernews']
+    assert saved['errors']['hackernews']['error'] == 'malformed item'
+    assert saved['errors']['hackernews']['at'] == results['timestamp']
+    assert saved['reddit'] == first['reddit']
+    assert len(saved_stories()) == 30
+
+
+def test_failed_stage_in_full_run_carries_over(aggregator, hn_down):
+    first = aggregator.aggregate_all_trends()
+    hn_down['error'] = ValueError('malformed item')
+    
+    results = aggregator.aggregate_all_trends()
+    
+    assert results['hackernews']['stories'] == first['hackernews']['stories']
+    assert results['updated']['hackernews'] == first['updated']['hackernews']
+    assert results['updated']['reddit'] != first['updated']['reddit']
+    assert list(results['errors']) == ['hackernews']
+    assert len(saved_stories()) == 30
+
+
+def test_next_successful_run_clears_the_error(aggregator, hn_down):
+    aggregator.aggregate_all_trends()
+    hn_down['error'] = ValueError('malformed item')
+    aggregator.aggregate_all_trends(platforms=['hackernews'])
+    hn_down['error'] = None
+    
+    results = aggregator.aggregate_all_trends(platforms=['hackernews'])
+    
+    assert results['errors'] == {}
+    assert results['updated']['hackernews'] == results['timestamp']
+
+
+@pytest.mark.parametrize('columnar', [True, False])
+def test_partial_run_merges_into_latest(aggregator, monkeypatch, columnar):
+    monkeypatch.setattr(Config, 'COLUMNAR_SNAPSHOTS', columnar)
+    first = aggregator.aggregate_all_trends()
+    
+    results = aggregator.aggregate_all_trends(platforms=['reddit'])
+    
+    assert results['updated']['reddit'] == results['timestamp']
+    assert results['updated']['youtube'] == first['updated']['youtube']
+    assert results['youtube'] == first['youtube']
+    # Platforms left out of the run still count towards the global keywords
+    assert results['global_keywords'] == first['global_keywords']
+    by_platform = lambda trends: {trend['topic']: trend['by_platform'] for trend in trends}
+    assert by_platform(results['cross_platform_trends']) == by_platform(first['cross_platform_trends'])
+    assert first['cross_platform_trends']
+    with open(os.path.join(Config.PROCESSED_DATA_DIR, 'latest.json'), encoding='utf-8') as f:
+        assert json.load(f)['updated'] == results['updated']
+
+
+@pytest.mark.parametrize('retention, kept', [(2, 2), (0, 4)])
+def test_old_result_files_are_pruned(aggregator, monkeypatch, retention, kept):
+    monkeypatch.setattr(Config, 'RESULTS_RETENTION', retention)
+    aggregator.aggregate_all_trends()
+    for _ in range(3):
+        aggregator.aggregate_all_trends(platforms=['hackernews'])
+    
+    files = os.listdir(Config.PROCESSED_DATA_DIR)
+    history = sorted(name for name in files if name.startswith('trends_') and name.endswith('.json'))
+    assert len(history) == kept
+    assert len([name for name in files if name.startswith('trends_') and name.endswith('.npz')]) == kept
+    with open(os.path.join(Config.PROCESSED_DATA_DIR, history[-1]), encoding='utf-8') as f:
+        assert json.load(f) == load_latest_results()
+
+
+def test_file_version_changes_when_a_rewrite_keeps_the_mtime(tmp_path):
+    path = tmp_path / 'latest.json'
+    assert file_version(str(path)) is None
+    
+    path.write_text('{}')
+    before = file_version(str(path))
+    path.write_text('{"a": 1}')
+    os.utime(path, ns=(before[0], before[0]))
+    
+    assert file_version(str(path)) != before
+
+
+def test_decode_drops_repeats_and_tokenizes_each_item_once(aggregator):
+    post = {'kind': 't3', 'data': {'id': 'p1', 'title': 'Python machine learning #tips', 'subreddit': 'all'}}
+    other = {'kind': 't3', 'data': {'id': 'p2', 'title': 'Rust release', 'subreddit': 'popular'}}
+    
+    records = aggregator._decode('reddit', [post, other, post])
+    
+    assert [record.id for record in records] == ['p1', 'p2']
+    assert records[0].niches == ('tech',)
+    assert 'python' in records[0].keywords
+    assert records[0].hashtags == ['#tips']
+    assert records[1].niches == ()
+
+
+def test_niche_search_only_runs_on_its_own_schedule(aggregator):
+    search_calls = lambda: [url for url, _ in aggregator.youtube_collector.session.calls if url.endswith('/search')]
+    first = aggregator.aggregate_all_trends()
+    assert search_calls() == []
+    assert 'youtube_niches' not in first['stage_timings']
+    
+    results = aggregator.aggregate_all_trends(platforms=['youtube_niches'])
+    
+    assert len(search_calls()) == len(Config.NICHES)
+    assert set(results['youtube_niches']['niches']) == set(Config.NICHES)
+    # Niche videos stay out of the trending totals and the global keywords
+    assert results['youtube'] == first['youtube']
+    assert results['global_keywords'] == first['global_keywords']
+    
+    # ...and full runs keep the last niche results
+    assert aggregator.aggregate_all_trends()['youtube_niches'] == results['youtube_niches']
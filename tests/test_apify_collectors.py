@@ -0,0 +1,140 @@
+import pytest
+
+from config import Config
+
+pytest.importorskip('apify_client')
+
+from src.collectors.instagram_collector import InstagramCollector
+from src.collectors.tiktok_collector import TikTokCollector
+from src.collectors.twitter_collector import TwitterCollector
+
+
+class FakeApifyClient:
+    """ApifyClient stand-in: every run gets its own dataset, built from the run input by `items`"""
+    
+    def __init__(self, items):
+        self.items = items
+        self.runs = []
+        self.streamed = 0
+    
+    def actor(self, actor_id):
+        client = self
+        
+        class Actor:
+            def call(self, run_input):
+                client.runs.append((actor_id, run_input))
+                return {'defaultDatasetId': len(client.runs) - 1}
+        
+        return Actor()
+    
+    def dataset(self, dataset_id):
+        client = self
+        
+        class Dataset:
+            def iterate_items(self):
+                for item in client.items(client.runs[dataset_id][1]):
+                    client.streamed += 1
+                    yield item
+        
+        return Dataset()
+
+
+@pytest.mark.parametrize('collector_class, method', [
+    (InstagramCollector, 'iter_hashtag'),
+    (TikTokCollector, 'iter_hashtag'),
+    (TwitterCollector, 'iter_search_tweets'),
+])
+def test_items_stream_as_the_dataset_downloads(collector_class, method):
+    collector = collector_class()
+    collector.client = FakeApifyClient(lambda run_input: ({'n': i} for i in range(100)))
+    
+    items = getattr(collector, method)('ai')
+    
+    assert next(items) == {'n': 0}
+    assert collector.client.streamed == 1
+    assert sum(1 for _ in items) == 99
+
+
+@pytest.mark.parametrize('collector_class, method', [
+    (InstagramCollector, 'scrape_hashtag'),
+    (TikTokCollector, 'scrape_hashtag'),
+    (TwitterCollector, 'search_tweets'),
+])
+def test_list_methods_wrap_the_generators(collector_class, method):
+    collector = collector_class()
+    collector.client = FakeApifyClient(lambda run_input: [{'n': 1}, {'n': 2}])
+    
+    assert getattr(collector, method)('ai') == [{'n': 1}, {'n': 2}]
+
+
+def test_failed_run_ends_the_stream(capsys):
+    collector = TikTokCollector()
+    
+    def broken(run_input):
+        yield {'n': 0}
+        raise RuntimeError('dataset gone')
+    
+    collector.client = FakeApifyClient(broken)
+    
+    assert collector.scrape_hashtag('ai') == [{'n': 0}]
+    assert 'dataset gone' in capsys.readouterr().out
+
+
+def tiktok_videos(run_input):
+    """Two videos per searched hashtag, attributed the way the TikTok actor reports them"""
+    for tag in run_input['hashtags']:
+        yield {'id': f'{tag}-1', 'searchHashtag': {'name': tag}}
+        yield {'id': f'{tag}-2', 'input': f'#{tag.upper()}'}
+
+
+def instagram_posts(run_input):
+    """Two posts per tag URL, one attributed by inputUrl and one only by its own hashtags"""
+    for url in run_input['directUrls']:
+        tag = url.rstrip('/').rsplit('/', 1)[-1]
+        yield {'id': f'{tag}-1', 'inputUrl': url}
+        yield {'id': f'{tag}-2', 'hashtags': ['#other', f'#{tag.capitalize()}']}
+
+
+@pytest.mark.parametrize('collector_class, items, size_key', [
+    (TikTokCollector, tiktok_videos, 'hashtags'),
+    (InstagramCollector, instagram_posts, 'directUrls'),
+])
+def test_hashtags_are_batched_and_split_back_out(collector_class, items, size_key):
+    collector = collector_class()
+    collector.client = FakeApifyClient(items)
+    hashtags = ['#AI', 'crypto', 'ai', 'fitness', 'tech', 'design']
+    
+    results = collector.scrape_hashtags(hashtags, batch_size=2)
+    
+    assert [len(run_input[size_key]) for _, run_input in collector.client.runs] == [2, 2, 1]
+    assert list(results) == ['ai', 'crypto', 'fitness', 'tech', 'design']
+    for tag, found in results.items():
+        assert [item['id'] for item in found] == [f'{tag}-1', f'{tag}-2']
+
+
+def test_batch_size_defaults_to_config(monkeypatch):
+    monkeypatch.setattr(Config, 'APIFY_HASHTAG_BATCH_SIZE', 3)
+    collector = TikTokCollector()
+    collector.client = FakeApifyClient(tiktok_videos)
+    
+    collector.scrape_hashtags([f'tag{i}' for i in range(7)])
+    
+    assert [run_input['hashtags'] for _, run_input in collector.client.runs] == [
+        ['tag0', 'tag1', 'tag2'], ['tag3', 'tag4', 'tag5'], ['tag6']
+    ]
+
+
+@pytest.mark.parametrize('item', [
+    {'searchHashtag': {'name': 'elsewhere'}},
+    {'hashtags': [{'name': 'unrelated'}]},
+    {},
+])
+def test_unattributable_videos_are_dropped(item):
+    assert TikTokCollector._source_hashtag(item, ['ai', 'tech']) is None
+
+
+def test_instagram_attribution_prefers_the_input_url():
+    post = {'inputUrl': 'https://www.instagram.com/explore/tags/tech/', 'hashtags': ['#ai', '#tech']}
+    
+    assert InstagramCollector._source_hashtag(post, ['ai', 'tech']) == 'tech'
+    assert InstagramCollector._source_hashtag({'hashtags': ['#ai', '#tech']}, ['tech', 'ai']) == 'tech'
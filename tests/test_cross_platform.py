@@ -0,0 +1,79 @@
+import math
+
+import pytest
+
+from src.cross_platform import CrossPlatformIndex, detect_cross_platform_trends
+from src.records import ContentRecord
+
+
+def record(platform, title, **counters):
+    return ContentRecord(platform, title, title=title, **counters)
+
+
+ITEMS = {
+    'youtube': [record('youtube', 'Python tutorial', likes=90, comments=10),
+                record('youtube', 'Rust vs Python', likes=20, comments=0)],
+    'reddit': [record('reddit', 'Python release notes', score=5, comments=5)],
+    'hackernews': [record('hackernews', 'Show HN: Rust tool', score=50, comments=10)],
+}
+
+
+def test_only_keywords_on_several_platforms_trend():
+    trends = detect_cross_platform_trends(ITEMS)
+    
+    assert [trend['topic'] for trend in trends] == ['python', 'rust']
+    assert trends[0]['platforms'] == ['reddit', 'youtube']
+    assert trends[0]['by_platform'] == {'reddit': 1, 'youtube': 2}
+    assert 'tutorial' in {trend['topic'] for trend in detect_cross_platform_trends(ITEMS, min_platforms=1)}
+
+
+def test_engagement_is_normalized_per_platform():
+    index = CrossPlatformIndex()
+    for platform, items in ITEMS.items():
+        index.add_items(platform, items)
+    
+    # YouTube mean engagement is 60: 100/60 + 20/60; Reddit's one item is at its own mean
+    python = index.score('python')
+    assert python['engagement'] == pytest.approx(round((100 / 60 + 20 / 60 + 1) / 3, 3))
+    assert index.score('rust')['engagement'] == pytest.approx(round((20 / 60 + 1) / 2, 3))
+
+
+def test_score_follows_the_roadmap_weights():
+    index = CrossPlatformIndex()
+    for platform, items in ITEMS.items():
+        index.add_items(platform, items)
+    
+    trend = index.score('python', previous_mentions=2)
+    
+    expected = 1.5 * 3 + math.log(3) * 2 + 2 * 2 + trend['engagement']
+    assert trend['velocity'] == 1.5
+    assert trend['score'] == pytest.approx(expected, abs=0.002)
+
+
+def test_keywords_new_since_the_previous_run_have_unit_velocity():
+    trends = detect_cross_platform_trends(ITEMS, previous_counts={'rust': 4})
+    
+    by_topic = {trend['topic']: trend for trend in trends}
+    assert by_topic['python']['velocity'] == 1.0
+    assert by_topic['rust']['velocity'] == 0.5
+
+
+def test_pre_tokenized_items_are_not_tokenized_again():
+    tagged = record('reddit', 'Nothing relevant here')
+    tagged.keywords = ['python']
+    
+    trends = detect_cross_platform_trends({'youtube': ITEMS['youtube'], 'reddit': [tagged]})
+    
+    assert trends[0]['topic'] == 'python'
+    assert trends[0]['by_platform'] == {'reddit': 1, 'youtube': 2}
+
+
+def test_platforms_without_engagement_score_zero():
+    index = CrossPlatformIndex()
+    index.add_items('youtube', [record('youtube', 'Python news')])
+    index.add_items('reddit', [record('reddit', 'Python news')])
+    index.add_items('reddit', [])
+    
+    assert index.score('python')['engagement'] == 0.0
+    assert len(index) == 2
+    assert {trend['topic'] for trend in index.top()} == {'python', 'news'}
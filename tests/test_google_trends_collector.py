@@ -0,0 +1,43 @@
+import pytest
+
+from src.collectors.google_trends_collector import GoogleTrendsCollector
+
+
+def comparison(url, params):
+    """SerpApi-shaped comparison where each term's interest is its position + 1"""
+    terms = params['q'].split(',')
+    return {'interest_over_time': {'timeline_data': [
+        {'date': 'Jan 1', 'timestamp': '1700000000',
+         'values': [{'query': term, 'extracted_value': index + 1} for index, term in enumerate(terms)]}
+    ]}}
+
+
+@pytest.mark.parametrize('queries, anchor, expected', [
+    ([], None, 0),
+    (['ai'], None, 1),
+    (['ai', 'crypto', 'climate', 'tech', 'startup'], None, 1),
+    (['ai', 'crypto', 'climate', 'tech', 'startup'], 'crypto', 1),
+    (['ai', 'crypto', 'climate', 'tech', 'startup'], 'weather', 2),
+    (['ai'], 'weather', 1),
+    (['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h', 'i'], 'weather', 3),
+])
+def test_batch_request_count_matches_requests_made(fake_session, queries, anchor, expected):
+    collector = GoogleTrendsCollector()
+    collector.session = fake_session(comparison)
+    
+    timelines = collector.get_interest_over_time_batch(queries, anchor=anchor)
+    
+    assert GoogleTrendsCollector.batch_request_count(queries, anchor=anchor) == expected
+    assert len(collector.session.calls) == expected
+    assert set(queries) <= set(timelines)
+
+
+def test_batch_rescales_groups_to_the_first_anchor(fake_session):
+    collector = GoogleTrendsCollector()
+    collector.session = fake_session(comparison)
+    
+    timelines = collector.get_interest_over_time_batch(['a', 'b', 'c', 'd', 'e', 'f'], anchor='x')
+    
+    # Every group sends the anchor first, so it always reads 1 and nothing needs rescaling
+    assert [params['q'] for _, params in collector.session.calls] == ['x,a,b,c,d', 'x,e,f']
+    assert timelines['f'][0]['values'][0]['extracted_value'] == 3
@@ -0,0 +1,79 @@
+import time
+
+import pytest
+
+from config import Config
+from src.collectors.hackernews_collector import HackerNewsCollector
+
+
+@pytest.fixture
+def updates():
+    """Item IDs listed in /v0/updates.json"""
+    return [3, 7]
+
+
+@pytest.fixture
+def collector(fake_session, monkeypatch, updates):
+    monkeypatch.setattr(Config, 'HN_INCREMENTAL_SYNC', True)
+    fetches = {'count': 0}
+    
+    def handler(url, params):
+        name = url.rsplit('/', 1)[1]
+        if name == 'topstories.json':
+            return list(range(1, 101))
+        if name == 'updates.json':
+            return {'items': updates, 'profiles': []}
+        fetches['count'] += 1
+        item_id = int(name.split('.')[0])
+        return {'id': item_id, 'title': f'Story {item_id}', 'score': fetches['count']}
+    
+    collector = HackerNewsCollector()
+    collector.session = fake_session(handler)
+    return collector
+
+
+def item_calls(collector):
+    return sorted(int(url.rsplit('/', 1)[1].split('.')[0]) for url, _ in collector.session.calls if '/item/' in url)
+
+
+def test_first_sync_fetches_everything(collector):
+    items = collector.sync_items(range(1, 31))
+    
+    assert [item['id'] for item in items] == list(range(1, 31))
+    assert item_calls(collector) == list(range(1, 31))
+    # An empty store has nothing to check against the updates feed
+    assert not any(url.endswith('updates.json') for url, _ in collector.session.calls)
+
+
+def test_resync_fetches_only_updated_items(collector):
+    first = collector.sync_items(range(1, 31))
+    collector.session.calls.clear()
+    
+    second = collector.sync_items(range(1, 31))
+    
+    assert item_calls(collector) == [3, 7]
+    assert [item['id'] for item in second] == list(range(1, 31))
+    assert second[0] == first[0]
+    assert second[2]['score'] != first[2]['score']
+
+
+def test_resync_refetches_items_older_than_max_age(collector, updates):
+    collector.sync_items(range(1, 11))
+    updates.clear()
+    item, _ = collector.item_store.get_many([5])[5]
+    collector.item_store.put_many([item], fetched_at=time.time() - 7200)
+    collector.session.calls.clear()
+    
+    collector.sync_items(range(1, 11), max_age=3600)
+    
+    assert item_calls(collector) == [5]
+
+
+def test_resync_without_updates_feed_refetches_everything(collector, monkeypatch):
+    collector.sync_items(range(1, 11))
+    monkeypatch.setattr(collector, 'get_updates', lambda: None)
+    collector.session.calls.clear()
+    
+    collector.sync_items(range(1, 11))
+    
+    assert item_calls(collector) == list(range(1, 11))
@@ -0,0 +1,101 @@
+import time
+
+import pytest
+
+from src.http_cache import ResponseCache
+from src.http_client import TransportSession
+
+URL = 'https://api.test/v1/items'
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(path=str(tmp_path / 'cache.sqlite'), ttls={'api.test/v1': 60, 'api.test/v1/live': 0})
+
+
+@pytest.fixture
+def server():
+    """Responses the fake API gives, in order; the last one repeats"""
+    return [(200, b'{"n": 1}', {'ETag': '"v1"', 'Content-Type': 'application/json'})]
+
+
+@pytest.fixture
+def session(cache, server, fake_adapter):
+    session = TransportSession(cache=cache, max_retries=0)
+    adapter = fake_adapter(lambda request: server.pop(0) if len(server) > 1 else server[0])
+    session.mount('https://', adapter)
+    session.adapter = adapter
+    return session
+
+
+def expire(cache):
+    with cache._lock:
+        cache._conn.execute("UPDATE responses SET expires_at = ?", (time.time() - 1,))
+        cache._conn.commit()
+
+
+def test_ttl_uses_the_longest_matching_prefix(cache):
+    assert cache.ttl_for(URL) == 60
+    assert cache.ttl_for('https://api.test/v1/live/feed') == 0
+    assert cache.ttl_for('https://other.test/v1') is None
+
+
+def test_fresh_entry_is_served_without_a_request(session, cache):
+    first = session.get(URL, params={'q': 'ai'})
+    second = session.get(URL, params={'q': 'ai'})
+    
+    assert len(session.adapter.requests) == 1
+    assert second.json() == first.json() == {'n': 1}
+    assert getattr(second, 'from_cache', False)
+    assert cache.stats()['hits'] == 1
+
+
+def test_expired_entry_is_revalidated_with_its_etag(session, cache, server):
+    session.get(URL)
+    expire(cache)
+    server[:] = [(304, b'', {})]
+    
+    response = session.get(URL)
+    
+    assert session.adapter.requests[-1].headers['If-None-Match'] == '"v1"'
+    assert response.json() == {'n': 1}
+    assert cache.get(cache.make_key(URL))['fresh']
+    assert cache.stats()['revalidated'] == 1
+
+
+def test_expired_entry_is_served_stale_when_the_api_fails(session, cache, server):
+    session.get(URL)
+    expire(cache)
+    server[:] = [(503, b'unavailable', {})]
+    
+    response = session.get(URL)
+    
+    assert response.status_code == 200
+    assert response.json() == {'n': 1}
+    assert cache.stats()['stale_served'] == 1
+
+
+def test_cache_ttl_zero_bypasses_the_cache(session):
+    session.get(URL)
+    session.get(URL, cache_ttl=0)
+    
+    assert len(session.adapter.requests) == 2
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, fake_adapter):
+    cache = ResponseCache(path=str(tmp_path / 'cache.sqlite'), ttls={'api.test/': 60}, max_bytes=250)
+    session = TransportSession(cache=cache, max_retries=0)
+    session.mount('https://', fake_adapter(lambda request: (200, b'x' * 100, {})))
+    
+    session.get('https://api.test/a')
+    time.sleep(0.01)
+    session.get('https://api.test/b')
+    time.sleep(0.01)
+    session.get('https://api.test/a')  # a is now the most recently used
+    time.sleep(0.01)
+    session.get('https://api.test/c')
+    
+    assert cache.get(cache.make_key('https://api.test/b')) is None
+    assert cache.get(cache.make_key('https://api.test/a')) is not None
+    assert cache.get(cache.make_key('https://api.test/c')) is not None
+    assert cache.stats()['evictions'] == 1
@@ -0,0 +1,77 @@
+import random
+from collections import Counter
+
+import pytest
+
+from src.aggregator import TrendAggregator
+from src.sketches import SpaceSaving
+
+
+@pytest.fixture
+def platform_counts():
+    rng = random.Random(7)
+    words = [f'word{i}' for i in range(500)]
+    # Zipf-like: a few heavy keywords and a long tail
+    return [
+        Counter({word: int(1000 / (rank + 1) * rng.uniform(0.5, 1.5)) + 1 for rank, word in enumerate(words)})
+        for _ in range(3)
+    ]
+
+
+def test_exact_merge_sums_full_counts(platform_counts):
+    merged = TrendAggregator().merge_keyword_counts(platform_counts, sketch_size=0)
+    
+    expected = Counter()
+    for counts in platform_counts:
+        expected.update(counts)
+    assert merged == expected
+
+
+def test_exact_merge_counts_keywords_outside_each_top_ten():
+    youtube = Counter({f'yt{i}': 10 for i in range(10)}, shared=9)
+    reddit = Counter({f'rd{i}': 10 for i in range(10)}, shared=9)
+    
+    merged = TrendAggregator().merge_keyword_counts([youtube, reddit], sketch_size=0)
+    
+    assert merged.most_common(1) == [('shared', 18)]
+
+
+def test_sketch_merge_finds_the_heavy_hitters(platform_counts):
+    merged = TrendAggregator().merge_keyword_counts(platform_counts, sketch_size=100)
+    
+    exact = Counter()
+    for counts in platform_counts:
+        exact.update(counts)
+    assert isinstance(merged, SpaceSaving)
+    assert len(merged) == 100
+    assert [word for word, _ in merged.most_common(10)] == [word for word, _ in exact.most_common(10)]
+
+
+def test_space_saving_error_bounds():
+    rng = random.Random(3)
+    stream = [f'w{min(int(rng.paretovariate(1.2)), 400)}' for _ in range(20000)]
+    exact = Counter(stream)
+    sketch = SpaceSaving(50)
+    for word in stream:
+        sketch.update(word)
+    
+    assert sketch.total == len(stream)
+    for word, estimate in sketch.counts.items():
+        assert exact[word] <= estimate <= exact[word] + sketch.errors[word]
+    # Every item above total / capacity is tracked
+    for word, count in exact.items():
+        if count > sketch.total / sketch.capacity:
+            assert word in sketch.counts
+
+
+def test_space_saving_weighted_updates():
+    sketch = SpaceSaving(2)
+    sketch.update_counts({'a': 5, 'b': 3})
+    sketch.update('c', 2)
+    
+    # c replaced the smallest item (b) and inherited its count as error
+    assert sketch.most_common() == [('a', 5), ('c', 5)]
+    assert sketch.errors['c'] == 3
+    
+    with pytest.raises(ValueError):
+        SpaceSaving(0)
@@ -0,0 +1,73 @@
+import random
+
+import pytest
+
+from src.niches import WORD_PATTERN, NicheClassifier
+
+
+def naive_classify(niches, text):
+    """Reference matcher: a niche matches if any keyword's words appear consecutively in the text"""
+    words = WORD_PATTERN.findall(text.lower())
+    found = []
+    for niche, keywords in niches.items():
+        for keyword in keywords:
+            pattern = WORD_PATTERN.findall(keyword.lower())
+            if pattern and any(words[i:i + len(pattern)] == pattern for i in range(len(words))):
+                found.append(niche)
+                break
+    return found
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('New machine learning course', ['tech']),
+    ('The learning machine is here', []),
+    ('Rain in Spain', []),
+    ('AI-powered WORKOUT plans', ['tech', 'fitness']),
+    ('', []),
+    ('machine machine learning', ['tech']),
+])
+def test_phrases_match_on_word_boundaries(text, expected):
+    classifier = NicheClassifier({'tech': ['ai', 'machine learning'], 'fitness': ['workout']})
+    
+    assert classifier.classify(text) == expected
+
+
+def test_overlapping_patterns_follow_failure_links():
+    classifier = NicheClassifier({
+        'a': ['new york times'],
+        'b': ['york'],
+        'c': ['new york city'],
+        'd': ['times square'],
+    })
+    
+    assert classifier.classify('new york city') == ['b', 'c']
+    assert classifier.classify('the new york times square') == ['a', 'b', 'd']
+    assert classifier.classify('new new york times') == ['a', 'b']
+
+
+def test_results_keep_configuration_order():
+    classifier = NicheClassifier({'z': ['zebra'], 'a': ['apple']})
+    
+    assert classifier.classify('apple zebra') == ['z', 'a']
+
+
+def test_fields_are_scanned_separately():
+    classifier = NicheClassifier({'tech': ['machine learning'], 'gaming': ['game']})
+    
+    assert classifier.classify_fields(['Big machine', ['learning', 'game'], None, 0]) == ['gaming']
+    assert classifier.classify_fields(['machine learning', ['x']]) == ['tech']
+
+
+def test_matches_a_naive_scan_on_random_text():
+    vocabulary = ['ai', 'machine', 'learning', 'deep', 'game', 'crypto', 'bitcoin', 'the', 'of']
+    niches = {
+        'tech': ['ai', 'machine learning', 'deep learning'],
+        'gaming': ['game', 'the game'],
+        'finance': ['crypto', 'bitcoin', 'crypto of the'],
+    }
+    classifier = NicheClassifier(niches)
+    rng = random.Random(7)
+    
+    for _ in range(500):
+        text = ' '.join(rng.choice(vocabulary) for _ in range(rng.randint(0, 12)))
+        assert classifier.classify(text) == naive_classify(niches, text), text
@@ -0,0 +1,147 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from config import Config
+from src.http_client import TransportSession
+from src.rate_limit import QuotaExceeded, QuotaLedger, RateLimiter, TokenBucket
+
+YOUTUBE_VIDEOS = 'https://www.googleapis.com/youtube/v3/videos'
+YOUTUBE_SEARCH = 'https://www.googleapis.com/youtube/v3/search'
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    return QuotaLedger(path=str(tmp_path / 'ledger.sqlite'), quotas={'youtube': 150})
+
+
+def test_bucket_allows_a_burst_then_paces_to_its_rate():
+    bucket = TokenBucket(rate=100, capacity=3)
+    
+    burst = [bucket.acquire() for _ in range(3)]
+    paced = bucket.acquire()
+    
+    assert burst == [0.0, 0.0, 0.0]
+    assert paced == pytest.approx(0.01, abs=0.005)
+
+
+def test_limiter_only_paces_known_hosts():
+    limiter = RateLimiter({'youtube': (100, 1)})
+    
+    limiter.acquire(YOUTUBE_VIDEOS)
+    
+    assert limiter.acquire(YOUTUBE_VIDEOS) > 0
+    assert limiter.acquire('https://example.com/') == 0.0
+
+
+@pytest.mark.parametrize('method, url, expected', [
+    ('GET', YOUTUBE_VIDEOS, ('youtube', 'www.googleapis.com/youtube/v3/', 1)),
+    ('GET', YOUTUBE_SEARCH + '?q=ai', ('youtube', 'www.googleapis.com/youtube/v3/search', 100)),
+    ('POST', 'https://api.apify.com/v2/acts/a~b/runs', ('apify', 'api.apify.com/v2/acts/', 1)),
+    ('GET', 'https://api.apify.com/v2/acts/a~b/runs', ('apify', 'api.apify.com/v2/acts/a~b/runs', 0)),
+    ('GET', 'https://www.reddit.com/r/python/hot.json', ('reddit', 'www.reddit.com/r/python/hot.json', 0)),
+])
+def test_costs_use_the_longest_matching_prefix(ledger, method, url, expected):
+    assert ledger.cost_for(method, url) == expected
+
+
+def test_charges_past_the_quota_are_refused(ledger):
+    ledger.charge_request('GET', YOUTUBE_SEARCH)
+    ledger.charge_request('GET', YOUTUBE_VIDEOS)
+    
+    with pytest.raises(QuotaExceeded):
+        ledger.charge_request('GET', YOUTUBE_SEARCH)
+    
+    assert ledger.used('youtube') == 101
+    assert ledger.remaining('youtube') == 49
+    assert ledger.usage() == {'youtube': {'calls': 2, 'units': 101, 'limit': 150, 'remaining': 49}}
+
+
+def test_platforms_without_a_quota_are_recorded_but_never_refused(ledger):
+    for _ in range(3):
+        ledger.charge_request('POST', 'https://api.apify.com/v2/acts/a~b/runs')
+    
+    assert ledger.remaining('apify') is None
+    assert ledger.usage()['apify'] == {'calls': 3, 'units': 3, 'limit': None, 'remaining': None}
+
+
+def test_preflight_compares_planned_units_with_what_is_left(ledger):
+    ledger.charge_request('GET', YOUTUBE_SEARCH)
+    
+    report = ledger.preflight({'youtube': 60, 'apify': 5})
+    
+    assert report['youtube'] == {'planned': 60, 'used': 100, 'limit': 150, 'remaining': 50, 'ok': False}
+    assert report['apify']['ok']
+
+
+class FlakyServer(ThreadingHTTPServer):
+    """Answers 503 to the first `failures` requests, then 200"""
+    
+    def __init__(self, failures):
+        super().__init__(('127.0.0.1', 0), FlakyHandler)
+        self.failures = failures
+        self.requests = 0
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.requests += 1
+        status = 503 if self.server.requests <= self.server.failures else 200
+        self.send_response(status)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'{}')
+    
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def flaky_server(monkeypatch):
+    """Start a FlakyServer; its host is the 'local' platform, charged 1 unit per request"""
+    servers = []
+    
+    def start(failures):
+        server = FlakyServer(failures)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        host = f'127.0.0.1:{server.server_port}'
+        monkeypatch.setitem(Config.API_HOSTS, host, 'local')
+        return server, f'http://{host}/items'
+    
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(Config, 'HTTP_BACKOFF_FACTOR', 0)
+
+
+def test_every_retry_is_charged_and_rate_limited(tmp_path, flaky_server, no_backoff):
+    server, url = flaky_server(failures=2)
+    ledger = QuotaLedger(path=str(tmp_path / 'ledger.sqlite'), costs={url.split('//')[1]: 1}, quotas={})
+    limiter = RateLimiter({'local': (0.001, 10)})
+    session = TransportSession(max_retries=3, ledger=ledger, limiter=limiter)
+    
+    response = session.get(url)
+    
+    assert response.status_code == 200
+    assert server.requests == 3
+    assert ledger.usage()['local']['calls'] == 3
+    assert limiter.buckets['local'].tokens == pytest.approx(7, abs=0.01)
+
+
+def test_retry_past_the_quota_raises_quota_exceeded(tmp_path, flaky_server, no_backoff):
+    server, url = flaky_server(failures=5)
+    ledger = QuotaLedger(path=str(tmp_path / 'ledger.sqlite'), costs={url.split('//')[1]: 1}, quotas={'local': 2})
+    session = TransportSession(max_retries=5, ledger=ledger)
+    
+    with pytest.raises(QuotaExceeded):
+        session.get(url)
+    
+    assert server.requests == 2
+    assert ledger.used('local') == 2
@@ -0,0 +1,93 @@
+import json
+import sys
+
+import pytest
+
+from src.records import DECODERS, ContentRecord, dedupe
+
+
+def test_youtube_video_decodes_with_its_top_tags():
+    record = DECODERS['youtube']({
+        'id': 'abc',
+        'snippet': {'title': 'Rust in 100 seconds', 'channelTitle': 'Fireship', 'publishedAt': '2024-01-01T00:00:00Z',
+                    'tags': ['rust', 'a', 'b', 'c', 'd', 'e']},
+        'statistics': {'viewCount': '1000', 'likeCount': '50', 'commentCount': '7'}
+    })
+    
+    assert record.to_dict() == {
+        'id': 'abc', 'title': 'Rust in 100 seconds', 'channel': 'Fireship', 'views': 1000, 'likes': 50,
+        'comments': 7, 'published': '2024-01-01T00:00:00Z', 'tags': ['rust', 'a', 'b', 'c', 'd'], 'niches': []
+    }
+    assert record.url == 'https://www.youtube.com/watch?v=abc'
+    assert record.score is None
+
+
+def test_reddit_post_decodes_with_its_exported_names():
+    record = DECODERS['reddit']({'kind': 't3', 'data': {
+        'id': 'p1', 'title': 'Python 3.13', 'subreddit': 'python', 'score': 42, 'num_comments': 3,
+        'url': 'https://python.org', 'author': 'guido', 'created_utc': 1700000000
+    }})
+    
+    assert record.to_dict() == {
+        'id': 'p1', 'title': 'Python 3.13', 'subreddit': 'python', 'score': 42, 'comments': 3,
+        'url': 'https://python.org', 'author': 'guido', 'created': 1700000000, 'niches': []
+    }
+    assert record.source == 'python'
+    assert record.views is None
+
+
+def test_hackernews_story_decodes():
+    record = DECODERS['hackernews']({'id': 7, 'title': 'Show HN: x', 'by': 'pg', 'score': 5, 'time': 1700000000})
+    
+    assert record.to_dict() == {
+        'id': 7, 'title': 'Show HN: x', 'score': 5, 'comments': 0, 'url': '', 'author': 'pg',
+        'time': 1700000000, 'niches': []
+    }
+
+
+@pytest.mark.parametrize('platform, payload', [
+    ('youtube', {}),
+    ('reddit', {}),
+    ('reddit', {'kind': 't3'}),
+    ('hackernews', {}),
+])
+def test_missing_fields_decode_to_defaults(platform, payload):
+    record = DECODERS[platform](payload)
+    
+    assert record.id == ''
+    assert record.title == ''
+    assert json.loads(json.dumps(record.to_dict()))['niches'] == []
+
+
+@pytest.mark.parametrize('platform', ['youtube', 'reddit', 'hackernews'])
+def test_from_dict_rebuilds_an_exported_record(platform):
+    original = ContentRecord(platform, 'x1', title='Title', author='me', source='src', views=1, likes=2,
+                             comments=3, score=4, published=5, tags=('t',), niches=('tech',))
+    
+    rebuilt = ContentRecord.from_dict(platform, original.to_dict())
+    
+    assert rebuilt.to_dict() == original.to_dict()
+
+
+def test_records_without_tags_or_niches_share_one_empty_tuple():
+    first, second = ContentRecord('hackernews', '1'), ContentRecord('hackernews', '2')
+    
+    assert first.tags is second.niches == ()
+    assert not hasattr(first, '__dict__')
+    assert sys.getsizeof(first) < sys.getsizeof(first.to_dict())
+
+
+def test_dedupe_keeps_the_first_of_each_item_and_records_without_ids():
+    records = [
+        ContentRecord('reddit', 'a', title='first'),
+        ContentRecord('hackernews', 'a'),
+        ContentRecord('reddit', 'a', title='repeat'),
+        ContentRecord('reddit', ''),
+        ContentRecord('reddit', ''),
+    ]
+    
+    unique = dedupe(records)
+    
+    assert [(r.platform, r.id, r.title) for r in unique] == [
+        ('reddit', 'a', 'first'), ('hackernews', 'a', ''), ('reddit', '', ''), ('reddit', '', '')
+    ]
@@ -0,0 +1,58 @@
+import requests
+
+from config import Config
+from src.collectors.reddit_collector import RedditCollector
+
+
+def listing(pages_per_subreddit=3, page_size=2):
+    """Handler serving page_size posts per page, with `after` cursors up to the last page"""
+    def handler(url, params):
+        subreddit = url.split('/r/')[1].split('/')[0]
+        page = int(params.get('after') or 0)
+        posts = [{'kind': 't3', 'data': {'id': f'{subreddit}{page}_{i}', 'subreddit': subreddit}}
+                 for i in range(min(page_size, params['limit']))]
+        after = str(page + 1) if page + 1 < pages_per_subreddit else None
+        return {'data': {'children': posts, 'after': after}}
+    return handler
+
+
+def test_crawl_follows_cursors_across_subreddits(fake_session):
+    collector = RedditCollector()
+    collector.session = fake_session(listing())
+    
+    posts = list(collector.crawl(['python', 'rust', 'go'], limit=100, max_workers=2))
+    
+    ids = {post['data']['id'] for post in posts}
+    assert len(posts) == len(ids) == 3 * 3 * 2
+    assert {post['data']['subreddit'] for post in posts} == {'python', 'rust', 'go'}
+    assert [params.get('after') for url, params in collector.session.calls if '/r/go/' in url] == [None, '1', '2']
+
+
+def test_crawl_stops_at_limit_and_max_pages(fake_session, monkeypatch):
+    monkeypatch.setattr(Config, 'REDDIT_MAX_PAGES', 2)
+    collector = RedditCollector()
+    collector.session = fake_session(listing(pages_per_subreddit=10))
+    
+    assert len(list(collector.crawl(['python'], limit=3))) == 3
+    assert len(list(collector.crawl(['python'], limit=100))) == 4
+
+
+def test_crawl_logs_failed_subreddits_and_keeps_the_rest(fake_session, capsys):
+    serve = listing(pages_per_subreddit=1)
+    
+    def handler(url, params):
+        if '/r/down/' in url:
+            return requests.exceptions.ConnectionError('connection refused')
+        if '/r/broken/' in url:
+            return ValueError('bad listing')
+        return serve(url, params)
+    
+    collector = RedditCollector()
+    collector.session = fake_session(handler)
+    
+    posts = list(collector.crawl(['python', 'down', 'broken', 'rust']))
+    
+    assert {post['data']['subreddit'] for post in posts} == {'python', 'rust'}
+    output = capsys.readouterr().out
+    assert 'r/down/hot' in output
+    assert '❌ Error crawling r/broken: bad listing' in output
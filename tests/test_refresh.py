@@ -0,0 +1,99 @@
+import threading
+
+import pytest
+
+from src.refresh import RefreshManager
+
+
+class GatedAggregator:
+    """Stands in for TrendAggregator: reports each stage, then blocks until `release` is set"""
+    
+    runs = []
+    release = threading.Event()
+    fail_with = None
+    
+    def aggregate_all_trends(self, platforms=None, progress=None):
+        self.runs.append(platforms)
+        progress('reddit', 'Reddit', 0.5, None)
+        progress('hackernews', 'Hacker News', 0.25, 'timed out')
+        self.release.wait(5)
+        if self.fail_with is not None:
+            raise self.fail_with
+        return {}
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    monkeypatch.setattr(GatedAggregator, 'runs', [])
+    monkeypatch.setattr(GatedAggregator, 'release', threading.Event())
+    monkeypatch.setattr(GatedAggregator, 'fail_with', None)
+    manager = RefreshManager(aggregator_factory=GatedAggregator, history=2)
+    yield manager
+    GatedAggregator.release.set()
+
+
+def test_concurrent_starts_share_one_run(manager):
+    jobs = []
+    threads = [threading.Thread(target=lambda: jobs.append(manager.start())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    GatedAggregator.release.set()
+    assert jobs[0].wait(5)
+    
+    assert len({job.id for job in jobs}) == 1
+    assert GatedAggregator.runs == [None]
+    assert manager.current() is jobs[0]
+
+
+def test_start_after_a_run_finishes_starts_a_new_one(manager):
+    GatedAggregator.release.set()
+    first = manager.start(['reddit'])
+    assert first.wait(5)
+    
+    second = manager.start(['reddit'])
+    assert second.wait(5)
+    
+    assert second.id != first.id
+    assert GatedAggregator.runs == [['reddit'], ['reddit']]
+    assert manager.get(first.id) is first
+
+
+def test_progress_is_reported_per_stage(manager):
+    job = manager.start(['reddit', 'hackernews'])
+    
+    running = job.snapshot()
+    GatedAggregator.release.set()
+    job.wait(5)
+    
+    assert running['status'] == 'running'
+    assert job.snapshot()['status'] == 'done'
+    assert job.snapshot()['progress'] == 1.0
+    assert job.snapshot()['stages']['hackernews'] == {
+        'label': 'Hacker News', 'status': 'failed', 'seconds': 0.25, 'error': 'timed out'
+    }
+
+
+def test_failed_run_is_recorded_and_frees_the_slot(manager):
+    GatedAggregator.fail_with = RuntimeError('disk full')
+    GatedAggregator.release.set()
+    
+    job = manager.start()
+    job.wait(5)
+    
+    assert job.snapshot()['status'] == 'failed'
+    assert job.snapshot()['error'] == 'disk full'
+    assert manager.start().id != job.id
+
+
+def test_only_the_latest_jobs_are_kept(manager):
+    GatedAggregator.release.set()
+    jobs = []
+    for _ in range(3):
+        jobs.append(manager.start())
+        jobs[-1].wait(5)
+    
+    assert list(manager.jobs) == [job.id for job in jobs[1:]]
+    assert manager.get(jobs[0].id) is None
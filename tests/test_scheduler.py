@@ -0,0 +1,33 @@
+from datetime import timedelta
+
+from config import Config
+from src.aggregator import TrendAggregator
+from src.scheduler import build_scheduler
+
+
+def intervals(scheduler):
+    return {job.id: job.trigger.interval for job in scheduler.get_jobs()}
+
+
+def test_platforms_without_an_interval_use_data_fetch_interval(monkeypatch):
+    monkeypatch.setattr(Config, 'DATA_FETCH_INTERVAL', 1800)
+    monkeypatch.setattr(Config, 'SCHEDULE_INTERVALS', {'hackernews': 300, 'youtube_niches': 0})
+    
+    jobs = intervals(build_scheduler(TrendAggregator(), run_now=False))
+    
+    assert jobs == {
+        'collect_youtube': timedelta(seconds=1800),
+        'collect_reddit': timedelta(seconds=1800),
+        'collect_hackernews': timedelta(seconds=300),
+        'collect_google_trends': timedelta(seconds=1800),
+    }
+
+
+def test_jitter_stays_a_fraction_of_short_intervals(monkeypatch):
+    monkeypatch.setattr(Config, 'SCHEDULE_JITTER', 300)
+    
+    scheduler = build_scheduler(TrendAggregator(), run_now=False)
+    
+    jitter = {job.id: job.trigger.jitter for job in scheduler.get_jobs()}
+    assert jitter['collect_hackernews'] == 30
+    assert jitter['collect_google_trends'] == 300
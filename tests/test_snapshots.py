@@ -0,0 +1,74 @@
+import json
+from collections import Counter
+
+import pytest
+
+from src import snapshots
+from src.records import ContentRecord
+
+
+@pytest.fixture
+def items():
+    return {
+        'youtube': [
+            ContentRecord('youtube', 'v1', title='Rust in 100 seconds', source='Fireship', views=1000, likes=50,
+                          comments=7, published='2024-01-01T00:00:00Z', tags=['rust', 'tutorial'], niches=['tech']),
+            ContentRecord('youtube', 'v2', title='Ünïcödé title', source='Chan', views=5, likes=0, comments=0,
+                          published='2024-01-02T00:00:00Z'),
+        ],
+        'reddit': [
+            ContentRecord('reddit', 'r1', title='Show r/python', source='python', score=42, comments=3,
+                          url='https://example.com', author='u1', published=1700000000.5),
+        ],
+    }
+
+
+def test_round_trip(tmp_path, items):
+    path = str(tmp_path / 'run.npz')
+    snapshots.write_snapshot(path, items, {'youtube': Counter(rust=3, tutorial=1)})
+    
+    frames = snapshots.load_snapshot(path)
+    
+    videos = frames['youtube.videos']
+    assert videos.to_dict('records')[0] == {
+        'id': 'v1', 'title': 'Rust in 100 seconds', 'channel': 'Fireship', 'views': 1000, 'likes': 50,
+        'comments': 7, 'published': '2024-01-01T00:00:00Z', 'tags': '["rust", "tutorial"]', 'niches': '["tech"]'
+    }
+    assert videos['title'].tolist()[1] == 'Ünïcödé title'
+    assert json.loads(videos['tags'].tolist()[1]) == []
+    posts = frames['reddit.posts']
+    assert posts['subreddit'].tolist() == ['python'] and posts['created'].tolist() == [1700000000.5]
+    assert len(frames['hackernews.stories']) == 0
+    assert frames['youtube.keywords'].to_dict('records') == [{'keyword': 'rust', 'count': 3},
+                                                             {'keyword': 'tutorial', 'count': 1}]
+    
+    # Scalar columns rebuild the original records (list columns stay JSON strings)
+    rebuilt = ContentRecord.from_dict('reddit', posts.to_dict('records')[0]).to_dict()
+    original = items['reddit'][0].to_dict()
+    assert json.loads(rebuilt.pop('niches')) == original.pop('niches')
+    assert rebuilt == original
+
+
+def test_selective_load_reads_only_what_is_asked(tmp_path, items):
+    path = str(tmp_path / 'run.npz')
+    snapshots.write_snapshot(path, items, {})
+    
+    frames = snapshots.load_snapshot(path, tables=['videos'], columns=['title', 'views'], platforms=['youtube'])
+    
+    assert list(frames) == ['youtube.videos']
+    assert list(frames['youtube.videos'].columns) == ['title', 'views']
+
+
+def test_base_snapshot_fills_platforms_missing_from_the_run(tmp_path, items):
+    base = str(tmp_path / 'latest.npz')
+    snapshots.write_snapshot(base, items, {'youtube': {'rust': 3}, 'reddit': {'python': 1}})
+    
+    path = str(tmp_path / 'partial.npz')
+    new_post = ContentRecord('reddit', 'r2', title='Another post', score=1, published=1700000001)
+    snapshots.write_snapshot(path, {'reddit': [new_post]}, {'reddit': {'another': 1}}, base=base)
+    
+    frames = snapshots.load_snapshot(path)
+    assert frames['youtube.videos']['id'].tolist() == ['v1', 'v2']
+    assert frames['youtube.keywords']['keyword'].tolist() == ['rust']
+    assert frames['reddit.posts']['id'].tolist() == ['r2']
+    assert frames['reddit.keywords']['keyword'].tolist() == ['another']
@@ -0,0 +1,96 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import func, select
+
+from src.records import ContentRecord
+from src.storage import TrendStore, content, content_hashtags, content_keywords
+
+
+@pytest.fixture
+def store():
+    return TrendStore('sqlite://')
+
+
+def post(post_id, title, score=1, **attributes):
+    return ContentRecord('reddit', post_id, title=title, score=score, source='python', published=1700000000,
+                         **attributes)
+
+
+def rows(store, table):
+    with store.engine.connect() as conn:
+        return conn.execute(select(table)).all()
+
+
+def test_save_items_inserts_content_and_terms(store):
+    saved = store.save_items({
+        'reddit': [post('a', 'Python tips and Python tricks #python')],
+        'youtube': [ContentRecord('youtube', 'v1', title='Rust tutorial', views=10, tags=['rust'])],
+    })
+    
+    assert saved == 2
+    by_id = {row.external_id: row for row in rows(store, content)}
+    assert by_id['a'].extra == {'subreddit': 'python', 'niches': []}
+    assert by_id['a'].published_at.replace(tzinfo=timezone.utc) == datetime.fromtimestamp(1700000000, timezone.utc)
+    assert by_id['v1'].extra['tags'] == ['rust']
+    keywords = {(row.content_id, row.keyword): row.count for row in rows(store, content_keywords)}
+    assert keywords[(by_id['a'].id, 'python')] == 3
+    assert [row.hashtag for row in rows(store, content_hashtags)] == ['#python']
+
+
+def test_upsert_updates_in_place_and_replaces_terms(store):
+    store.save_items({'reddit': [post('a', 'Python news', score=1)]})
+    first_id = rows(store, content)[0].id
+    
+    store.save_items({'reddit': [post('a', 'Rust news', score=50), post('b', 'Golang news')]})
+    
+    by_id = {row.external_id: row for row in rows(store, content)}
+    assert len(by_id) == 2
+    assert by_id['a'].id == first_id
+    assert by_id['a'].score == 50 and by_id['a'].title == 'Rust news'
+    terms = {row.keyword for row in rows(store, content_keywords) if row.content_id == first_id}
+    assert terms == {'rust', 'news'}
+
+
+def test_duplicate_items_in_one_run_keep_the_last(store):
+    assert store.save_items({'reddit': [post('a', 'Old title'), post('a', 'New title')]}) == 1
+    assert rows(store, content)[0].title == 'New title'
+
+
+def test_items_without_id_are_skipped(store):
+    assert store.save_items({'reddit': [post('', 'No id')]}) == 0
+
+
+def test_precomputed_tokens_are_reused(store):
+    item = post('a', 'Python news')
+    item.keywords, item.hashtags = ['cached'], []
+    
+    store.save_items({'reddit': [item]})
+    
+    assert [row.keyword for row in rows(store, content_keywords)] == ['cached']
+
+
+def test_overlong_terms_are_skipped(store):
+    store.save_items({'reddit': [post('a', 'python ' + 'x' * 80 + ' #' + 'y' * 200)]})
+    
+    assert [row.keyword for row in rows(store, content_keywords)] == ['python']
+    assert rows(store, content_hashtags) == []
+
+
+def test_many_items_upsert_past_the_in_clause_chunk(store):
+    store.save_items({'reddit': [post(str(i), f'Post number {i}') for i in range(1200)]})
+    store.save_items({'reddit': [post(str(i), f'Edited post {i}') for i in range(1200)]})
+    
+    with store.engine.connect() as conn:
+        assert conn.execute(select(func.count()).select_from(content)).scalar() == 1200
+        assert conn.execute(select(func.count()).select_from(content_keywords)
+                            .where(content_keywords.c.keyword == 'edited')).scalar() == 1200
+
+
+def test_top_keywords_and_history(store):
+    store.save_items({'reddit': [post('a', 'Python python rust'), post('b', 'Python golang')]})
+    
+    assert store.top_keywords(limit=1) == [{'keyword': 'python', 'count': 3}]
+    assert {kw['keyword'] for kw in store.top_keywords()} == {'python', 'rust', 'golang'}
+    assert store.top_keywords(since=datetime.now(timezone.utc) + timedelta(days=1)) == []
+    assert store.keyword_history('PYTHON') == [{'date': '2023-11-14', 'platform': 'reddit', 'count': 3}]
@@ -0,0 +1,84 @@
+import time
+
+import pytest
+
+from src.timeseries import TimeSeriesStore
+
+HOUR = 3600
+DAY = 24 * HOUR
+WEEK = 7 * DAY
+
+
+@pytest.fixture
+def store():
+    return TimeSeriesStore('sqlite://')
+
+
+@pytest.fixture
+def now():
+    return int(time.time()) // DAY * DAY
+
+
+def scale_factor(store, points, last):
+    with store.engine.begin() as conn:
+        return store._scale_factor(conn, 'ai', '', points, last)
+
+
+def test_scale_factor_on_shared_timestamps(store, now):
+    store.append('ai', [(now - DAY * i, 60.0) for i in range(10, 0, -1)])
+    
+    fetched = [(now - DAY * i, 30.0) for i in range(5, -1, -1)]
+    assert scale_factor(store, fetched, now - DAY) == pytest.approx(2.0)
+
+
+def test_scale_factor_hourly_window_over_daily_history(store, now):
+    store.append('ai', [(now - DAY * i, 50.0) for i in range(30, 0, -1)])
+    
+    # No hourly point lands on a stored daily timestamp except by bucket
+    fetched = [(now - 7 * DAY + HOUR * i + 1800, 25.0) for i in range(7 * 24)]
+    assert scale_factor(store, fetched, now - DAY) == pytest.approx(2.0)
+
+
+def test_scale_factor_daily_window_over_weekly_history(store, now):
+    store.append('ai', [(now - WEEK * i + 3 * HOUR, 80.0) for i in range(10, 0, -1)])
+    
+    fetched = [(now - DAY * i, 40.0) for i in range(30, -1, -1)]
+    assert scale_factor(store, fetched, now - WEEK + 3 * HOUR) == pytest.approx(2.0)
+
+
+def test_scale_factor_without_overlap_is_one(store, now):
+    store.append('ai', [(now - WEEK * i, 80.0) for i in range(10, 5, -1)])
+    
+    fetched = [(now - DAY * i, 40.0) for i in range(7, -1, -1)]
+    assert scale_factor(store, fetched, now - 6 * WEEK) == 1.0
+
+
+def test_append_rescales_new_points(store, now):
+    store.append('ai', [(now - DAY * i, 50.0) for i in range(30, 0, -1)])
+    
+    added = store.append('ai', [(now - 3 * DAY + HOUR * i, 25.0) for i in range(3 * 24 + 1)])
+    
+    assert added == 24  # Hours after the last stored day
+    newest = store.rollups('ai', 'hour')[-1]
+    assert newest['mean'] == pytest.approx(50.0)
+
+
+def test_fetch_window_covers_the_gap_since_the_last_point(store, now):
+    assert store.fetch_window('ai') == 'today 12-m'
+    
+    store.append('ai', [(int(time.time()) - 3 * DAY, 10.0)])
+    
+    assert store.fetch_window('ai') == 'now 7-d'
+
+
+def test_rollups_and_range_summary(store, now):
+    store.append('ai', [(now - DAY + HOUR * i, float(i)) for i in range(24)])
+    
+    days = store.rollups('ai', 'day')
+    assert len(days) == 1
+    assert days[0]['count'] == 24 and days[0]['min'] == 0 and days[0]['max'] == 23 and days[0]['mean'] == 11.5
+    assert len(store.rollups('ai', 'hour')) == 24
+    assert store.range_summary(['ai', 'unknown'], days=7) == [
+        {'query': 'ai', 'interest': 11.5, 'peak': 23, 'points': 24}
+    ]
+    assert store.stored_queries() == ['ai']
@@ -0,0 +1,58 @@
+import re
+from collections import Counter
+
+import pytest
+
+from src import tokenizer
+
+OLD_STOP_WORDS = {'this', 'that', 'with', 'from', 'have', 'been', 'will', 'your', 'their', 'what', 'when', 'where',
+                  'which', 'about', 'there', 'these', 'those'}
+
+TITLES = [
+    'Python 3.13 released: what is new? #python #release',
+    'This is THE best Rust tutorial from 2024 #RustLang',
+    'Café owners hate this one weird trick — naïve résumé tips',
+    'snake_case vs camelCase: which naming wins? ##double #tag_with_underscore',
+    'email me at dev@example.com or visit https://example.com/path?q=machine-learning',
+    'AI/ML, GPT-4o & LLaMA-3: open-weights models compared',
+    'a#midword hashtag, trailing # and #123numbers',
+    '',
+    'ﬁnance ＡＩ fullwidth and ligatures',
+    'Ünïcödé wörds next to ascii words',
+]
+
+
+def old_extract_keywords(text, min_length=4):
+    """TrendAggregator.extract_keywords before the shared tokenizer"""
+    if not text:
+        return []
+    words = re.findall(r'\b[a-zA-Z]{' + str(min_length) + r',}\b', text.lower())
+    return [w for w in words if w not in OLD_STOP_WORDS]
+
+
+def old_extract_hashtags(text):
+    """TrendAggregator.extract_hashtags before the shared tokenizer"""
+    if not text:
+        return []
+    return re.findall(r'#\w+', text.lower())
+
+
+@pytest.mark.parametrize('title', TITLES)
+def test_tokenize_matches_the_old_extractors(title):
+    assert tokenizer.tokenize(title) == (old_extract_keywords(title), old_extract_hashtags(title))
+    assert tokenizer.extract_keywords(title) == old_extract_keywords(title)
+    assert tokenizer.extract_hashtags(title) == old_extract_hashtags(title)
+
+
+@pytest.mark.parametrize('min_length', [3, 5])
+def test_min_length_matches_the_old_extractor(min_length):
+    for title in TITLES:
+        assert tokenizer.extract_keywords(title, min_length) == old_extract_keywords(title, min_length)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 1000])
+def test_count_tokens_matches_per_title_counts(chunk_size):
+    keyword_counts, hashtag_counts = tokenizer.count_tokens(iter(TITLES * 3), chunk_size=chunk_size)
+    
+    assert keyword_counts == Counter(w for title in TITLES * 3 for w in old_extract_keywords(title))
+    assert hashtag_counts == Counter(h for title in TITLES * 3 for h in old_extract_hashtags(title))
@@ -0,0 +1,71 @@
+import random
+
+import numpy as np
+import pytest
+
+from src.trend_stats import compute_trend_stats, timelines_to_matrix, trend_stats_for
+
+
+def old_trend_direction(values):
+    """TrendAggregator._calculate_trend_direction before the vectorized engine, on plain values"""
+    if len(values) < 2:
+        return 'stable'
+    recent_values = values[-5:]
+    if len(recent_values) < 2:
+        return 'stable'
+    
+    avg_first_half = sum(recent_values[:len(recent_values) // 2]) / (len(recent_values) // 2)
+    avg_second_half = sum(recent_values[len(recent_values) // 2:]) / (len(recent_values) - len(recent_values) // 2)
+    diff_percent = ((avg_second_half - avg_first_half) / avg_first_half * 100) if avg_first_half > 0 else 0
+    
+    if diff_percent > 10:
+        return 'rising'
+    elif diff_percent < -10:
+        return 'falling'
+    return 'stable'
+
+
+def test_direction_matches_the_old_calculation_on_random_timelines():
+    rng = random.Random(11)
+    timelines = {
+        f'q{i}': [rng.choice([0, rng.randint(0, 100)]) for _ in range(rng.randint(0, 60))]
+        for i in range(500)
+    }
+    
+    stats = trend_stats_for(timelines)
+    
+    for query, values in timelines.items():
+        assert stats[query]['trend_direction'] == old_trend_direction(values), (query, values)
+
+
+@pytest.mark.parametrize('values, direction', [
+    ([], 'stable'),
+    ([50], 'stable'),
+    ([10, 20], 'rising'),
+    ([20, 10], 'falling'),
+    ([0, 0, 30], 'stable'),  # No baseline to compare against
+    ([1, 2, 3, 100, 100, 100, 100, 100], 'stable'),  # Only the last five points count
+])
+def test_direction_edge_cases(values, direction):
+    assert trend_stats_for({'q': values})['q']['trend_direction'] == direction == old_trend_direction(values)
+
+
+def test_matrix_is_right_aligned_on_the_latest_point():
+    matrix = timelines_to_matrix([[1, 2, 3], [4]])
+    
+    assert matrix.shape == (2, 3)
+    assert np.isnan(matrix[1, :2]).all() and matrix[1, 2] == 4
+
+
+def test_slope_zscore_and_volatility_match_numpy():
+    values = [3.0, 7.0, 4.0, 9.0, 12.0, 10.0]
+    
+    stats = compute_trend_stats(timelines_to_matrix([values, [5.0] + values]))
+    
+    x = np.arange(len(values))
+    assert stats['slope'][0] == pytest.approx(np.polyfit(x, values, 1)[0])
+    assert stats['zscore'][0] == pytest.approx((values[-1] - np.mean(values)) / np.std(values))
+    assert stats['volatility'][0] == pytest.approx(np.std(np.diff(values)))
+    # A flat series has no slope, z-score or volatility
+    flat = trend_stats_for({'flat': [5, 5, 5, 5]})['flat']
+    assert (flat['slope'], flat['zscore'], flat['volatility']) == (0, 0, 0)
@@ -0,0 +1,164 @@
+import json
+import threading
+import time
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from config import Config
+from src.collectors.twitter_apify_collector import TwitterApifyCollector
+from src.http_client import get_session
+
+
+class ApifyServer:
+    """Fake Apify API: runs finish after `polls` status requests, datasets hold `items`"""
+    
+    def __init__(self, items, polls=1, final_status='SUCCEEDED'):
+        self.items = items
+        self.polls = polls
+        self.final_status = final_status
+        self.runs = {}
+        self.lock = threading.Lock()
+    
+    def __call__(self, request):
+        url = urlsplit(request.url)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        
+        with self.lock:
+            if request.method == 'POST':
+                run_id = f'run{len(self.runs)}'
+                self.runs[run_id] = {'input': json.loads(request.body), 'polls': 0}
+                return self.reply(run_id)
+            
+            if '/actor-runs/' in url.path:
+                run_id = url.path.rsplit('/', 1)[-1]
+                self.runs[run_id]['polls'] += 1
+                return self.reply(run_id)
+        
+        run_id = url.path.split('/')[-2]
+        offset, limit = int(params['offset']), int(params['limit'])
+        items = self.items(self.runs[run_id]['input']) if callable(self.items) else self.items
+        return 200, json.dumps(items[offset:offset + limit]).encode(), {}
+    
+    def reply(self, run_id):
+        run = self.runs[run_id]
+        status = self.final_status if run['polls'] >= self.polls else 'RUNNING'
+        body = {'data': {'id': run_id, 'status': status, 'defaultDatasetId': run_id}}
+        return 201, json.dumps(body).encode(), {}
+
+
+@pytest.fixture
+def collector(fake_adapter, monkeypatch):
+    """TwitterApifyCollector whose shared session talks to an ApifyServer set via collector.server"""
+    monkeypatch.setattr(Config, 'APIFY_PAGE_SIZE', 3)
+    session = get_session()
+    collector = TwitterApifyCollector()
+    
+    def handle(request):
+        return collector.server(request)
+    
+    collector.adapter = fake_adapter(handle)
+    session.mount('https://', collector.adapter)
+    return collector
+
+
+def test_run_waits_with_long_polls(collector):
+    collector.server = ApifyServer([{'id': 1}], polls=2)
+    
+    assert collector.search_tweets('#ai') == [{'id': 1}]
+    
+    methods = [(request.method, urlsplit(request.url).path) for request in collector.adapter.requests]
+    assert methods == [
+        ('POST', '/v2/acts/apify~twitter-scraper/runs'),
+        ('GET', '/v2/actor-runs/run0'),
+        ('GET', '/v2/actor-runs/run0'),
+        ('GET', '/v2/datasets/run0/items'),
+    ]
+    for request in collector.adapter.requests[:3]:
+        assert parse_qs(urlsplit(request.url).query)['waitForFinish'] == [str(collector.WAIT_FOR_FINISH)]
+
+
+@pytest.mark.parametrize('count, pages', [(0, 1), (2, 1), (3, 2), (7, 3)])
+def test_dataset_is_downloaded_in_pages(collector, count, pages):
+    collector.server = ApifyServer([{'id': i} for i in range(count)], polls=0)
+    
+    assert collector.search_tweets('#ai') == [{'id': i} for i in range(count)]
+    
+    downloads = [request for request in collector.adapter.requests if '/datasets/' in request.url]
+    assert len(downloads) == pages
+    assert [parse_qs(urlsplit(r.url).query)['offset'] for r in downloads] == [[str(3 * i)] for i in range(pages)]
+
+
+def test_failed_run_returns_none(collector):
+    collector.server = ApifyServer([{'id': 1}], final_status='FAILED')
+    
+    assert collector.search_tweets('#ai') is None
+    assert not any('/datasets/' in request.url for request in collector.adapter.requests)
+
+
+def test_run_gives_up_at_the_deadline(collector, monkeypatch):
+    monkeypatch.setattr(Config, 'APIFY_RUN_TIMEOUT', 0)
+    collector.server = ApifyServer([{'id': 1}], polls=5)
+    
+    assert collector.search_tweets('#ai') is None
+    assert len(collector.adapter.requests) == 1
+
+
+def test_run_many_runs_concurrently_and_keeps_input_order(collector):
+    in_flight = {'now': 0, 'peak': 0}
+    server = ApifyServer(lambda run_input: [{'id': run_input['searchTerms'][0]}], polls=0)
+    
+    def slow_start(request):
+        if request.method != 'POST':
+            return server(request)
+        with server.lock:
+            in_flight['now'] += 1
+            in_flight['peak'] = max(in_flight['peak'], in_flight['now'])
+        time.sleep(0.05)
+        with server.lock:
+            in_flight['now'] -= 1
+        return server(request)
+    
+    collector.server = slow_start
+    queries = ['a', 'b', 'c', 'd', 'e']
+    
+    results = collector.run_many([collector._search_input(q) for q in queries], max_concurrency=3)
+    
+    assert results == [[{'id': q}] for q in queries]
+    assert in_flight['peak'] == 3
+
+
+def test_trending_topics_drop_tweets_seen_in_several_searches(collector):
+    collector.server = ApifyServer([{'id': 'shared'}, {'url': 'https://x.com/1'}, {'text': 'no id'}], polls=0)
+    
+    tweets = collector.get_trending_topics()
+    
+    assert tweets.count({'id': 'shared'}) == 1
+    assert tweets.count({'url': 'https://x.com/1'}) == 1
+    assert tweets.count({'text': 'no id'}) == 5
+
+
+def test_search_streams_one_page_at_a_time(collector):
+    collector.server = ApifyServer([{'id': i} for i in range(7)], polls=0)
+    
+    tweets = collector.iter_search_tweets('#ai')
+    first_page = [next(tweets) for _ in range(3)]
+    downloads = [request for request in collector.adapter.requests if '/datasets/' in request.url]
+    
+    assert first_page == [{'id': 0}, {'id': 1}, {'id': 2}]
+    assert len(downloads) == 1
+    assert list(tweets) == [{'id': i} for i in range(3, 7)]
+
+
+def test_trending_data_reads_a_generator_like_a_list(collector):
+    tweets = [
+        {'id': i, 'text': f'#AI tweet {i} about python', 'likeCount': i % 4, 'retweetCount': i % 3, 'replyCount': 1}
+        for i in range(30)
+    ]
+    
+    from_list = collector.extract_trending_data(tweets, top_n=5)
+    from_generator = collector.extract_trending_data(iter(tweets), top_n=5)
+    
+    assert from_generator == from_list
+    assert [t['likes'] + t['retweets'] for t in from_list['tweets']] == [5, 5, 4, 4, 4]
+    assert from_list['total_engagement'] == sum(i % 4 + i % 3 + 1 for i in range(30))
@@ -0,0 +1,74 @@
+import pytest
+
+from src.collectors.youtube_collector import YouTubeCollector
+
+
+def youtube_api(total=120, missing=()):
+    """search.list serving `total` results in pages, videos.list answering for every ID but `missing`"""
+    def handler(url, params):
+        if url.endswith('/search'):
+            start = int(params.get('pageToken') or 0)
+            end = min(start + params['maxResults'], total)
+            page = {'kind': 'youtube#searchListResponse',
+                    'items': [{'id': {'videoId': f'v{i % 100}'}} for i in range(start, end)]}
+            if end < total:
+                page['nextPageToken'] = str(end)
+            return page
+        return {'items': [{'id': video_id} for video_id in params['id'].split(',') if video_id not in missing]}
+    return handler
+
+
+@pytest.fixture
+def collector(fake_session):
+    collector = YouTubeCollector()
+    collector.session = fake_session(youtube_api())
+    return collector
+
+
+def search_calls(collector):
+    return [params for url, params in collector.session.calls if url.endswith('/search')]
+
+
+def test_search_follows_page_tokens_up_to_max_results(collector):
+    result = collector.search_videos('python', max_results=110)
+    
+    assert len(result['items']) == 110
+    assert 'nextPageToken' not in result
+    assert result['kind'] == 'youtube#searchListResponse'
+    assert [params['maxResults'] for params in search_calls(collector)] == [50, 50, 10]
+
+
+def test_search_without_results_fetches_no_page(collector):
+    assert collector.search_videos('python', max_results=0) == {'items': []}
+    assert search_calls(collector) == []
+
+
+def test_search_stops_at_the_last_page(collector):
+    assert len(collector.search_video_ids('python', max_results=500)) == 100
+    assert len(search_calls(collector)) == 3
+
+
+def test_video_ids_are_unique_and_in_rank_order(collector):
+    video_ids = collector.search_video_ids('python', max_results=120)
+    
+    assert video_ids == [f'v{i}' for i in range(100)]
+
+
+def test_statistics_are_fetched_in_batches_of_50(fake_session):
+    collector = YouTubeCollector()
+    collector.session = fake_session(youtube_api(missing={'v3'}))
+    
+    result = collector.search_videos_with_stats('python', max_results=100)
+    
+    videos_calls = [params for url, params in collector.session.calls if url.endswith('/videos')]
+    assert [len(params['id'].split(',')) for params in videos_calls] == [50, 50]
+    assert [item['id'] for item in result['items']] == [f'v{i}' for i in range(100) if i != 3]
+
+
+def test_niche_search_ors_keywords_and_quotes_phrases(collector):
+    collector.search_niche_videos(['ai', 'machine learning'], max_results=5, order='viewCount')
+    
+    params = search_calls(collector)[0]
+    assert params['q'] == 'ai | "machine learning"'
+    assert params['part'] == 'id'
+    assert params['order'] == 'viewCount'